@@ -1,35 +1,64 @@
-from .ray import (
-    Cluster,
-    ClusterConfiguration,
-    RayClusterStatus,
-    CodeFlareClusterStatus,
-    RayCluster,
-    get_cluster,
-    list_all_queued,
-    list_all_clusters,
-    AWManager,
-    AppWrapperStatus,
-    RayJobClient,
-)
-
-from .common.widgets import view_clusters
-
-from .common import (
-    Authentication,
-    KubeConfiguration,
-    TokenAuthentication,
-    KubeConfigFileAuthentication,
-)
-
-from .common.kueue import (
-    list_local_queues,
-)
-
-from .common.utils import generate_cert
-from .common.utils.demos import copy_demo_nbs
-
+from importlib import import_module
 from importlib.metadata import version, PackageNotFoundError
 
+# Public names are only imported on first access (PEP 562), so that `import codeflare_sdk`
+# does not load Ray, the Kubernetes client, pandas or ipywidgets until they are needed.
+_LAZY_IMPORTS = {
+    "Cluster": ".ray",
+    "ClusterConfiguration": ".ray",
+    "RayClusterStatus": ".ray",
+    "CodeFlareClusterStatus": ".ray",
+    "RayCluster": ".ray",
+    "get_cluster": ".ray",
+    "list_all_queued": ".ray",
+    "list_all_clusters": ".ray",
+    "iter_clusters": ".ray",
+    "AWManager": ".ray",
+    "BulkAWManager": ".ray",
+    "AppWrapperStatus": ".ray",
+    "RayJobClient": ".ray",
+    "AsyncRayJobClient": ".ray",
+    "JobWatcher": ".ray",
+    "ClusterFleet": ".ray",
+    "render_manifests": ".ray",
+    "AsyncCluster": ".ray",
+    "get_cluster_async": ".ray",
+    "list_all_clusters_async": ".ray",
+    "configure_async_executor": ".ray",
+    "start_informers": ".ray",
+    "stop_informers": ".ray",
+    "view_clusters": ".common.widgets",
+    "Authentication": ".common",
+    "KubeConfiguration": ".common",
+    "TokenAuthentication": ".common",
+    "KubeConfigFileAuthentication": ".common",
+    "list_local_queues": ".common.kueue",
+    "copy_demo_nbs": ".common.utils.demos",
+}
+
+# Submodules exposed as attributes of the package
+_LAZY_SUBMODULES = {
+    "generate_cert": ".common.utils.generate_cert",
+}
+
+__all__ = list(_LAZY_IMPORTS) + list(_LAZY_SUBMODULES)
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    elif name in _LAZY_SUBMODULES:
+        value = import_module(_LAZY_SUBMODULES[name], __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
 try:
     __version__ = version("codeflare-sdk")  # use metadata associated with built package
 
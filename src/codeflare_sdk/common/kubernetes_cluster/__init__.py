@@ -5,6 +5,19 @@ from .auth import (
     KubeConfigFileAuthentication,
     config_check,
     get_api_client,
+    configure_api_client_pool,
+)
+
+from .api_discovery import (
+    configure_api_discovery_cache,
+    invalidate_api_discovery_cache,
+    is_api_served,
+)
+
+from .retry import (
+    configure_api_retries,
+    get_api_retry_metrics,
+    reset_api_retry_metrics,
 )
 
 from .kube_api_helpers import _kube_api_error_handling
@@ -0,0 +1,118 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The api_discovery sub-module caches the API groups served by each Kubernetes API server,
+so that questions such as "is route.openshift.io/v1 served" are answered from a single
+discovery request instead of walking the `/apis` document on every call.
+"""
+
+import threading
+from time import monotonic
+from typing import FrozenSet, Optional
+
+from kubernetes import client
+
+from .auth import get_api_client
+
+ROUTE_API_VERSION = "route.openshift.io/v1"
+KUEUE_API_GROUP = "kueue.x-k8s.io"
+APPWRAPPER_API_GROUP = "workload.codeflare.dev"
+
+DEFAULT_DISCOVERY_TTL_SECONDS = 300
+
+_discovery_ttl_seconds = DEFAULT_DISCOVERY_TTL_SECONDS
+# API server host -> (expiry time, served API groups and group versions)
+_discovery_cache = {}
+_discovery_lock = threading.Lock()
+
+
+def configure_api_discovery_cache(ttl_seconds: float = DEFAULT_DISCOVERY_TTL_SECONDS):
+    """
+    Sets how long the served API groups of an API server are cached for.
+
+    Args:
+        ttl_seconds (float):
+            The number of seconds a discovery result is reused for. Defaults to 300.
+    """
+    global _discovery_ttl_seconds
+    _discovery_ttl_seconds = ttl_seconds
+    invalidate_api_discovery_cache()
+
+
+def invalidate_api_discovery_cache(host: Optional[str] = None):
+    """
+    Discards cached discovery results so that the next lookup queries the API server again.
+
+    Args:
+        host (Optional[str]):
+            The API server host to invalidate. Invalidates every API server when None.
+    """
+    with _discovery_lock:
+        if host is None:
+            _discovery_cache.clear()
+        else:
+            _discovery_cache.pop(host, None)
+
+
+def get_served_apis(api_client: Optional[client.ApiClient] = None) -> FrozenSet[str]:
+    """
+    Returns the API groups and group versions served by the API server, e.g.
+    `{"route.openshift.io", "route.openshift.io/v1", ...}`.
+
+    The result is cached per API server host for the configured TTL.
+
+    Args:
+        api_client (Optional[client.ApiClient]):
+            The API client to query. Defaults to `get_api_client()`.
+
+    Returns:
+        FrozenSet[str]:
+            The served API group names and group versions.
+    """
+    api_client = api_client or get_api_client()
+    host = api_client.configuration.host
+    with _discovery_lock:
+        cached = _discovery_cache.get(host)
+        if cached is not None and cached[0] > monotonic():
+            return cached[1]
+
+    served = set()
+    for api in client.ApisApi(api_client).get_api_versions().groups:
+        served.add(api.name)
+        for v in api.versions:
+            served.add(v.group_version)
+    served = frozenset(served)
+
+    with _discovery_lock:
+        _discovery_cache[host] = (monotonic() + _discovery_ttl_seconds, served)
+    return served
+
+
+def is_api_served(api: str, api_client: Optional[client.ApiClient] = None) -> bool:
+    """
+    Checks whether an API group (e.g. `kueue.x-k8s.io`) or group version
+    (e.g. `route.openshift.io/v1`) is served by the API server.
+
+    Args:
+        api (str):
+            The API group or group version to look for.
+        api_client (Optional[client.ApiClient]):
+            The API client to query. Defaults to `get_api_client()`.
+
+    Returns:
+        bool:
+            True if the API is served, False otherwise.
+    """
+    return api in get_served_apis(api_client)
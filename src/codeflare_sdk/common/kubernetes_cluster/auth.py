@@ -21,9 +21,14 @@ authenticate to their cluster or add their own custom concrete classes here.
 
 import abc
 from kubernetes import client, config
+import hashlib
 import os
+import socket
+import threading
 import urllib3
+from urllib3.connection import HTTPConnection
 from .kube_api_helpers import _kube_api_error_handling
+from .retry import install_retries
 
 from typing import Optional
 
@@ -34,6 +39,23 @@ config_path = None
 
 WORKBENCH_CA_CERT_PATH = "/etc/pki/tls/custom-certs/ca-bundle.crt"
 
+# Process-wide registry of pooled API clients, keyed by the connection identity
+# (kubeconfig path and context, API server host, TLS settings, client certificate,
+# bearer token digest), least recently used first.
+_api_client_registry = {}
+MAX_POOLED_API_CLIENTS = 8
+_api_client_registry_lock = threading.Lock()
+_api_client_pool_maxsize = None
+_api_client_keep_alive = True
+
+# Identity of the kubeconfig file or in-cluster token that config_check() last loaded,
+# and the kubeconfig context it loaded.
+_loaded_config_fingerprint = None
+_loaded_context = None
+_config_lock = threading.Lock()
+
+SERVICE_ACCOUNT_TOKEN_PATH = "/var/run/secrets/kubernetes.io/serviceaccount/token"
+
 
 class Authentication(metaclass=abc.ABCMeta):
     """
@@ -114,12 +136,18 @@ class TokenAuthentication(Authentication):
                 print("Insecure request warnings have been disabled")
                 configuration.verify_ssl = False
 
+            if _api_client_pool_maxsize is not None:
+                configuration.connection_pool_maxsize = _api_client_pool_maxsize
+
             api_client = client.ApiClient(configuration)
             if not self.skip_tls:
                 _client_with_cert(api_client, self.ca_cert_path)
+            _enable_keep_alive(api_client)
+            install_retries(api_client)
 
             client.AuthenticationApi(api_client).get_api_group()
             config_path = None
+            _reset_config_state()
             return "Logged into %s" % self.server
         except client.ApiException as e:
             _kube_api_error_handling(e)
@@ -132,6 +160,7 @@ class TokenAuthentication(Authentication):
         config_path = None
         global api_client
         api_client = None
+        _reset_config_state()
         return "Successfully logged out of %s" % self.server
 
 
@@ -155,6 +184,7 @@ class KubeConfigFileAuthentication(KubeConfiguration):
                 return "Please specify a config file path"
             config_path = self.kube_config_path
             api_client = None
+            _reset_config_state()
             config.load_kube_config(config_path)
             response = "Loaded user config file at path %s" % self.kube_config_path
         except config.ConfigException:  # pragma: no cover
@@ -172,6 +202,10 @@ def config_check() -> str:
     If the `config_path` global variable is set by an external module (e.g., `auth.py`),
     this path will be used directly.
 
+    The loaded configuration is cached, and is only reloaded when the kubeconfig file
+    (or the in-cluster service account token) changes on disk, or when the user logs
+    in or out through one of the `Authentication` classes.
+
     Returns:
         str:
             The loaded config path if successful.
@@ -182,18 +216,30 @@ def config_check() -> str:
     """
     global config_path
     global api_client
+    global _loaded_config_fingerprint
+    global _loaded_context
     home_directory = os.path.expanduser("~")
     if config_path == None and api_client == None:
         if os.path.isfile("%s/.kube/config" % home_directory):
-            try:
-                config.load_kube_config()
-            except Exception as e:  # pragma: no cover
-                _kube_api_error_handling(e)
+            fingerprint = ("kubeconfig", _kube_config_identity(home_directory))
+            with _config_lock:
+                if fingerprint != _loaded_config_fingerprint:
+                    try:
+                        config.load_kube_config()
+                        _loaded_context = _active_context()
+                        _loaded_config_fingerprint = fingerprint
+                    except Exception as e:  # pragma: no cover
+                        _kube_api_error_handling(e)
         elif "KUBERNETES_PORT" in os.environ:
-            try:
-                config.load_incluster_config()
-            except Exception as e:  # pragma: no cover
-                _kube_api_error_handling(e)
+            fingerprint = ("incluster", _file_identity(SERVICE_ACCOUNT_TOKEN_PATH))
+            with _config_lock:
+                if fingerprint != _loaded_config_fingerprint:
+                    try:
+                        config.load_incluster_config()
+                        _loaded_context = None
+                        _loaded_config_fingerprint = fingerprint
+                    except Exception as e:  # pragma: no cover
+                        _kube_api_error_handling(e)
         else:
             raise PermissionError(
                 "Action not permitted, have you put in correct/up-to-date auth credentials?"
@@ -203,6 +249,38 @@ def config_check() -> str:
         return config_path
 
 
+def _active_context() -> Optional[str]:
+    try:
+        _, active_context = config.list_kube_config_contexts()
+        return active_context["name"]
+    except Exception:
+        return None
+
+
+def _file_identity(path: str):
+    """Returns the (inode, mtime, size) of a file, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _kube_config_identity(home_directory: str):
+    kube_config_paths = os.environ.get(
+        "KUBECONFIG", "%s/.kube/config" % home_directory
+    ).split(os.pathsep)
+    return tuple((path, _file_identity(path)) for path in kube_config_paths)
+
+
+def _reset_config_state():
+    global _loaded_config_fingerprint
+    global _loaded_context
+    with _config_lock:
+        _loaded_config_fingerprint = None
+        _loaded_context = None
+
+
 def _client_with_cert(client: client.ApiClient, ca_cert_path: Optional[str] = None):
     client.configuration.verify_ssl = True
     cert_path = _gen_ca_cert_path(ca_cert_path)
@@ -226,12 +304,40 @@ def _gen_ca_cert_path(ca_cert_path: Optional[str]):
         return None
 
 
+def configure_api_client_pool(
+    pool_maxsize: Optional[int] = None, keep_alive: bool = True
+):
+    """
+    Configure the connection pool used by the shared Kubernetes API clients.
+
+    Any pooled clients created with the previous settings are closed and discarded, so
+    the new settings apply to every subsequent call.
+
+    Args:
+        pool_maxsize (Optional[int]):
+            The maximum number of connections kept open per API server. Defaults to
+            the Kubernetes client default when None.
+        keep_alive (bool):
+            Whether to enable TCP keep-alive on the pooled connections. Defaults to True.
+    """
+    global _api_client_pool_maxsize
+    global _api_client_keep_alive
+    _api_client_pool_maxsize = pool_maxsize
+    _api_client_keep_alive = keep_alive
+    _clear_api_client_registry()
+
+
 def get_api_client() -> client.ApiClient:
     """
     Retrieve the Kubernetes API client with the default configuration.
 
     This function returns the current API client instance if already loaded,
-    or creates a new API client with the default configuration.
+    or a shared, pooled API client for the loaded kubeconfig/in-cluster configuration.
+    Pooled clients are reused across calls and threads so that their connections
+    stay warm, and are keyed by the kubeconfig path and context, API server host,
+    TLS settings, client certificate and bearer token. The client of a rotated token
+    replaces, and closes, the client of the previous token, and at most 8 clients are
+    kept.
 
     Returns:
         client.ApiClient:
@@ -239,6 +345,68 @@ def get_api_client() -> client.ApiClient:
     """
     if api_client != None:
         return api_client
-    to_return = client.ApiClient()
-    _client_with_cert(to_return)
-    return to_return
+    configuration = client.Configuration.get_default_copy()
+    token = configuration.api_key.get("authorization")
+    # Only a digest of the token is kept in the key, so the registry doesn't hold every token
+    identity = (
+        config_path,
+        _loaded_context,
+        configuration.host,
+        _gen_ca_cert_path(None),
+        configuration.verify_ssl,
+        configuration.ssl_ca_cert,
+        configuration.cert_file,
+        configuration.key_file,
+    )
+    key = identity + (hashlib.sha256(token.encode()).hexdigest() if token else None,)
+    replaced = []
+    with _api_client_registry_lock:
+        pooled_client = _api_client_registry.pop(key, None)
+        if pooled_client is None:
+            if _api_client_pool_maxsize is not None:
+                configuration.connection_pool_maxsize = _api_client_pool_maxsize
+            pooled_client = client.ApiClient(configuration)
+            _client_with_cert(pooled_client)
+            _enable_keep_alive(pooled_client)
+            install_retries(pooled_client)
+            # The clients of previous tokens for the same server won't be used again
+            for other in [k for k in _api_client_registry if k[:-1] == identity]:
+                replaced.append(_api_client_registry.pop(other))
+        _api_client_registry[key] = pooled_client
+        while len(_api_client_registry) > MAX_POOLED_API_CLIENTS:
+            oldest = next(iter(_api_client_registry))
+            replaced.append(_api_client_registry.pop(oldest))
+    for replaced_client in replaced:
+        _close_api_client(replaced_client)
+    return pooled_client
+
+
+def _enable_keep_alive(api_client: client.ApiClient):
+    if not _api_client_keep_alive:
+        return
+    try:
+        socket_options = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        ]
+        pool_manager = api_client.rest_client.pool_manager
+        pool_manager.connection_pool_kw["socket_options"] = socket_options
+    except (AttributeError, TypeError):  # pragma: no cover
+        # Mocked or custom REST clients may not expose a urllib3 pool manager
+        pass
+
+
+def _close_api_client(api_client: client.ApiClient):
+    api_client.close()
+    try:
+        # Closes the pooled connections, which close() leaves open
+        api_client.rest_client.pool_manager.clear()
+    except AttributeError:  # pragma: no cover
+        pass
+
+
+def _clear_api_client_registry():
+    with _api_client_registry_lock:
+        pooled_clients = list(_api_client_registry.values())
+        _api_client_registry.clear()
+    for pooled_client in pooled_clients:
+        _close_api_client(pooled_client)
@@ -0,0 +1,205 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The informer sub-module contains the definition of the Informer object, which keeps an
+in-memory copy of a list of Kubernetes objects up to date in a background thread by listing
+them once and then watching for changes from the listed resourceVersion.
+"""
+
+import json
+import threading
+from time import monotonic
+from typing import Callable, Dict, List, Optional
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+INFORMER_WATCH_TIMEOUT_SECONDS = 300
+# How much longer than the watch timeout a watch request may go without receiving anything
+INFORMER_REQUEST_TIMEOUT_MARGIN_SECONDS = 10
+INFORMER_INITIAL_BACKOFF_SECONDS = 1
+INFORMER_MAX_BACKOFF_SECONDS = 30
+
+
+class Informer:
+    """
+    Keeps the objects returned by a Kubernetes list function in memory, keyed by name.
+
+    Objects are stored as the plain dicts sent by the API server, whether they are custom
+    objects or built-in resources.
+
+    Args:
+        list_func (Callable):
+            A Kubernetes list function with all arguments but the watch arguments bound, e.g.
+            `functools.partial(api.list_namespaced_custom_object, group=..., version=...,
+            namespace=..., plural=...)`.
+        name (str):
+            A name for the informer, used for its thread.
+        watch_timeout_seconds (float):
+            How long each watch request lasts before it is renewed. The store's staleness is
+            measured from the last event received or watch renewed, so this bounds the
+            staleness of a store whose objects don't change. Defaults to 300.
+    """
+
+    def __init__(
+        self,
+        list_func: Callable,
+        name: str = "informer",
+        watch_timeout_seconds: float = INFORMER_WATCH_TIMEOUT_SECONDS,
+    ):
+        self.name = name
+        self.error: Optional[Exception] = None
+        self.watch_timeout_seconds = watch_timeout_seconds
+        self._list_func = list_func
+        self._store: Dict[str, dict] = {}
+        self._resource_version = None
+        self._last_sync = None
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        # Set once the store is synced, or the informer stopped before it could be
+        self._settled = threading.Event()
+        self._stopped = threading.Event()
+        self._watch = None
+        self._thread = None
+
+    def start(self):
+        """
+        Starts listing and watching in a daemon thread.
+        """
+        self._thread = threading.Thread(
+            target=self._run, name=f"codeflare-sdk-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread. The stored objects are kept but no longer updated.
+        """
+        self._stopped.set()
+        self._settled.set()
+        current_watch = self._watch
+        if current_watch is not None:
+            current_watch.stop()
+
+    def wait_for_sync(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the initial list has been stored, returning False if `timeout` seconds
+        pass first. Returns False at once if the informer has stopped, e.g. because listing is
+        forbidden, in which case `error` holds the reason.
+        """
+        self._settled.wait(timeout)
+        return self._synced.is_set()
+
+    def staleness(self) -> Optional[float]:
+        """
+        Returns how many seconds the store may be behind the API server, i.e. the time since
+        the objects were listed, the last watch event or bookmark was received, or a watch
+        ended cleanly. Returns None if the objects have never been listed.
+        """
+        with self._lock:
+            if self._last_sync is None:
+                return None
+            return monotonic() - self._last_sync
+
+    def is_fresh(self, max_staleness: float) -> bool:
+        """
+        Checks whether the store is running and at most `max_staleness` seconds behind.
+        """
+        staleness = self.staleness()
+        return (
+            not self._stopped.is_set()
+            and staleness is not None
+            and staleness <= max_staleness
+        )
+
+    def get(self, name: str) -> Optional[dict]:
+        """
+        Returns the stored object with the given name, or None if there is none.
+        """
+        with self._lock:
+            return self._store.get(name)
+
+    def list(self) -> List[dict]:
+        """
+        Returns all the stored objects.
+        """
+        with self._lock:
+            return list(self._store.values())
+
+    def _run(self):
+        backoff = INFORMER_INITIAL_BACKOFF_SECONDS
+        while not self._stopped.is_set():
+            try:
+                if self._resource_version is None:
+                    self._list()
+                self._watch_changes()
+                backoff = INFORMER_INITIAL_BACKOFF_SECONDS
+                continue
+            except ApiException as e:
+                self.error = e
+                if e.status == 410:
+                    # The resourceVersion is too old to watch from, list everything again
+                    self._resource_version = None
+                    continue
+                if e.status in [401, 403, 404, 405]:
+                    # Not allowed or not served; readers fall back to the API server
+                    self._stopped.set()
+                    self._settled.set()
+                    return
+            except Exception as e:
+                self.error = e
+            self._stopped.wait(backoff)
+            backoff = min(backoff * 2, INFORMER_MAX_BACKOFF_SECONDS)
+
+    def _list(self):
+        # Read the raw response so that built-in resources are stored as dicts, like events
+        response = json.loads(self._list_func(_preload_content=False).data)
+        store = {item["metadata"]["name"]: item for item in response["items"]}
+        with self._lock:
+            self._store = store
+            self._resource_version = response["metadata"]["resourceVersion"]
+            self._last_sync = monotonic()
+        self._synced.set()
+        self._settled.set()
+
+    def _watch_changes(self):
+        self._watch = watch.Watch()
+        for event in self._watch.stream(
+            self._list_func,
+            resource_version=self._resource_version,
+            allow_watch_bookmarks=True,
+            timeout_seconds=int(self.watch_timeout_seconds),
+            # A connection that silently died is given up on instead of waited on forever
+            _request_timeout=self.watch_timeout_seconds
+            + INFORMER_REQUEST_TIMEOUT_MARGIN_SECONDS,
+        ):
+            if self._stopped.is_set():
+                break
+            self._apply_event(event)
+        with self._lock:
+            # The watch ended cleanly, so the store was current until now
+            self._last_sync = monotonic()
+
+    def _apply_event(self, event: dict):
+        obj = event["raw_object"]
+        metadata = obj.get("metadata", {})
+        with self._lock:
+            if event["type"] in ["ADDED", "MODIFIED"]:
+                self._store[metadata["name"]] = obj
+            elif event["type"] == "DELETED":
+                self._store.pop(metadata["name"], None)
+            if metadata.get("resourceVersion"):
+                self._resource_version = metadata["resourceVersion"]
+            self._last_sync = monotonic()
@@ -0,0 +1,247 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The retry sub-module makes every request of the SDK's Kubernetes API clients resilient to
+an overloaded API server: requests are rate limited client-side with a token bucket (QPS
+and burst, like client-go), throttled (429) responses are retried after the `Retry-After`
+delay, and idempotent requests are retried on server errors and dropped connections with
+exponential backoff and jitter. Watches and other streamed responses are only rate limited,
+their callers already reconnect on their own terms.
+"""
+
+import email.utils
+import functools
+import random
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from time import monotonic, sleep
+from typing import Optional
+
+import urllib3
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_INITIAL_BACKOFF_SECONDS = 0.5
+DEFAULT_MAX_BACKOFF_SECONDS = 30
+DEFAULT_QPS = 50
+DEFAULT_BURST = 100
+
+# Requests that can be sent again without changing their outcome
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRYABLE_STATUSES = {500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket allowing `burst` calls at once and `qps` calls per second
+    on average. A `qps` of None disables the limit.
+    """
+
+    def __init__(self, qps: Optional[float], burst: int = 1):
+        self.qps = qps
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes a token, blocking until one is available. Returns the number of seconds waited.
+        """
+        if not self.qps:
+            return 0.0
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.qps)
+            self._last = now
+            # Tokens can go negative, so concurrent callers queue up behind each other
+            self._tokens -= 1
+            wait = -self._tokens / self.qps if self._tokens < 0 else 0.0
+        if wait > 0:
+            sleep(wait)
+        return wait
+
+
+class _RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int,
+        initial_backoff_seconds: float,
+        max_backoff_seconds: float,
+        qps: Optional[float],
+        burst: int,
+    ):
+        self.max_retries = max_retries
+        self.initial_backoff_seconds = initial_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.rate_limiter = TokenBucket(qps, burst)
+
+
+_policy = _RetryPolicy(
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_INITIAL_BACKOFF_SECONDS,
+    DEFAULT_MAX_BACKOFF_SECONDS,
+    DEFAULT_QPS,
+    DEFAULT_BURST,
+)
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def configure_api_retries(
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    initial_backoff_seconds: float = DEFAULT_INITIAL_BACKOFF_SECONDS,
+    max_backoff_seconds: float = DEFAULT_MAX_BACKOFF_SECONDS,
+    qps: Optional[float] = DEFAULT_QPS,
+    burst: int = DEFAULT_BURST,
+):
+    """
+    Configures the retries and rate limit applied to every Kubernetes API request of the SDK.
+    The new settings apply immediately, including to API clients that already exist.
+
+    Args:
+        max_retries (int):
+            The maximum number of times a request is retried. Defaults to 5; 0 disables retries.
+        initial_backoff_seconds (float):
+            The upper bound of the first, randomised backoff. It doubles on each retry. Defaults to 0.5.
+        max_backoff_seconds (float):
+            The maximum delay between two attempts, including `Retry-After` delays. Defaults to 30.
+        qps (Optional[float]):
+            The average number of requests per second allowed across the process. Defaults to 50; None disables the limit.
+        burst (int):
+            The number of requests allowed at once before `qps` applies. Defaults to 100.
+    """
+    global _policy
+    _policy = _RetryPolicy(
+        max_retries, initial_backoff_seconds, max_backoff_seconds, qps, burst
+    )
+
+
+def get_api_retry_metrics() -> dict:
+    """
+    Returns counters of the Kubernetes API requests made since the process started or the
+    metrics were last reset.
+
+    Returns:
+        dict:
+            `requests` (attempts sent, including retries), `retries` (attempts that were
+            retried), `retries_<reason>` per reason (e.g. `retries_429`, `retries_503`,
+            `retries_connection`), `failures` (requests that failed after all retries) and
+            `throttled_seconds` (time spent waiting for the client-side rate limiter).
+    """
+    with _metrics_lock:
+        metrics = {"requests": 0, "retries": 0, "failures": 0, "throttled_seconds": 0.0}
+        metrics.update(_metrics)
+        return metrics
+
+
+def reset_api_retry_metrics():
+    """
+    Sets every retry metric back to zero.
+    """
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def install_retries(api_client: client.ApiClient):
+    """
+    Routes every request of an API client through the rate limiter and retry policy.
+    Installing twice on the same client has no further effect.
+    """
+    rest_client = api_client.rest_client
+    request = rest_client.request
+    if isinstance(request, functools.partial) and request.func is _request_with_retries:
+        return
+    # The GET/POST/... helpers of the REST client all go through self.request
+    rest_client.request = functools.partial(_request_with_retries, request)
+
+
+def _request_with_retries(request, method, url, *args, **kwargs):
+    policy = _policy
+    if _is_streaming(kwargs):
+        waited = policy.rate_limiter.acquire()
+        _count(requests=1, throttled_seconds=waited)
+        try:
+            return request(method, url, *args, **kwargs)
+        except (ApiException, urllib3.exceptions.HTTPError, ConnectionError):
+            _count(failures=1)
+            raise
+    attempt = 0
+    while True:
+        waited = policy.rate_limiter.acquire()
+        _count(requests=1, throttled_seconds=waited)
+        try:
+            return request(method, url, *args, **kwargs)
+        except ApiException as e:
+            reason = str(e.status)
+            retryable = e.status == 429 or (
+                e.status in RETRYABLE_STATUSES and method in IDEMPOTENT_METHODS
+            )
+            error = e
+        except (urllib3.exceptions.HTTPError, ConnectionError) as e:
+            reason = "connection"
+            retryable = method in IDEMPOTENT_METHODS
+            error = e
+        if not retryable or attempt >= policy.max_retries:
+            _count(failures=1)
+            raise error
+        delay = _backoff(policy, attempt)
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = min(retry_after, policy.max_backoff_seconds)
+        _count(retries=1, **{f"retries_{reason}": 1})
+        sleep(delay)
+        attempt += 1
+
+
+def _is_streaming(kwargs: dict) -> bool:
+    # Watches are read as a stream, and retrying one would replay its events out of order
+    if kwargs.get("_preload_content", True) is False:
+        return True
+    query_params = kwargs.get("query_params") or []
+    if isinstance(query_params, dict):
+        query_params = query_params.items()
+    return any(key == "watch" and value for key, value in query_params)
+
+
+def _backoff(policy: _RetryPolicy, attempt: int) -> float:
+    # "Full jitter", so that many clients throttled at once don't retry in lockstep
+    ceiling = min(
+        policy.max_backoff_seconds, policy.initial_backoff_seconds * 2**attempt
+    )
+    return random.uniform(0, ceiling)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(error, "headers", None) or {}
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+def _count(**counts):
+    with _metrics_lock:
+        _metrics.update(counts)
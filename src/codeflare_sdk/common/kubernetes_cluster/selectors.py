@@ -0,0 +1,126 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The selectors sub-module evaluates Kubernetes label and field selectors against objects
+held in memory, so that objects served from an informer are filtered the same way the
+API server would filter them.
+"""
+
+import re
+from typing import Callable, List, Optional
+
+_KEY = r"[A-Za-z0-9][-A-Za-z0-9_./]*"
+_VALUE = r"[-A-Za-z0-9_.]*"
+_EXISTS = re.compile(rf"^(!?)\s*({_KEY})$")
+_EQUALITY = re.compile(rf"^({_KEY})\s*(==|=|!=)\s*({_VALUE})$")
+_SET = re.compile(rf"^({_KEY})\s+(in|notin)\s+\(([^()]*)\)$")
+
+# The fields every custom resource can be selected by
+_SELECTABLE_FIELDS = {"metadata.name", "metadata.namespace"}
+
+
+def _split_requirements(selector: str) -> List[str]:
+    # Commas separate requirements, except inside the value list of `in`/`notin`
+    requirements, depth, current = [], 0, ""
+    for char in selector:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            requirements.append(current.strip())
+            current = ""
+        else:
+            current += char
+    requirements.append(current.strip())
+    return [r for r in requirements if r]
+
+
+def label_selector_matcher(selector: str) -> Optional[Callable[[dict], bool]]:
+    """
+    Builds a function that checks whether an object's labels match a label selector,
+    e.g. `app=ray,tier in (head, worker),!experimental`.
+
+    Args:
+        selector (str):
+            The label selector, in the syntax accepted by the API server.
+
+    Returns:
+        Optional[Callable[[dict], bool]]:
+            A function taking an object dict, or None if the selector cannot be evaluated locally.
+    """
+    checks = []
+    for requirement in _split_requirements(selector):
+        match = _EQUALITY.match(requirement)
+        if match:
+            key, operator, value = match.groups()
+            negate = operator == "!="
+            checks.append(
+                lambda labels, k=key, v=value, n=negate: (labels.get(k) == v) != n
+            )
+            continue
+        match = _SET.match(requirement)
+        if match:
+            key, operator, values = match.groups()
+            values = {v.strip() for v in values.split(",")}
+            if operator == "in":
+                checks.append(lambda labels, k=key, vs=values: labels.get(k) in vs)
+            else:
+                checks.append(lambda labels, k=key, vs=values: labels.get(k) not in vs)
+            continue
+        match = _EXISTS.match(requirement)
+        if match:
+            negate, key = match.groups()
+            checks.append(lambda labels, k=key, n=bool(negate): (k in labels) != n)
+            continue
+        return None
+
+    def matches(obj: dict) -> bool:
+        labels = obj.get("metadata", {}).get("labels") or {}
+        return all(check(labels) for check in checks)
+
+    return matches
+
+
+def field_selector_matcher(selector: str) -> Optional[Callable[[dict], bool]]:
+    """
+    Builds a function that checks whether an object matches a field selector, e.g.
+    `metadata.name=my-cluster`. Only the fields every custom resource supports are evaluated.
+
+    Args:
+        selector (str):
+            The field selector, in the syntax accepted by the API server.
+
+    Returns:
+        Optional[Callable[[dict], bool]]:
+            A function taking an object dict, or None if the selector cannot be evaluated locally.
+    """
+    checks = []
+    for requirement in _split_requirements(selector):
+        match = _EQUALITY.match(requirement)
+        if match is None or match.group(1) not in _SELECTABLE_FIELDS:
+            return None
+        field, operator, value = match.groups()
+        key = field.split(".")[1]
+        negate = operator == "!="
+        checks.append(
+            lambda metadata, k=key, v=value, n=negate: (metadata.get(k) == v) != n
+        )
+
+    def matches(obj: dict) -> bool:
+        metadata = obj.get("metadata", {})
+        return all(check(metadata) for check in checks)
+
+    return matches
@@ -0,0 +1,76 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from codeflare_sdk.common.kubernetes_cluster.api_discovery import (
+    configure_api_discovery_cache,
+    get_served_apis,
+    invalidate_api_discovery_cache,
+    is_api_served,
+)
+from unittest.mock import MagicMock
+
+
+def mock_api_client(host):
+    api_client = MagicMock()
+    api_client.configuration.host = host
+    return api_client
+
+
+def mock_api_versions(mocker, *group_versions):
+    groups = []
+    for group_version in group_versions:
+        group = MagicMock(versions=[MagicMock(group_version=group_version)])
+        group.name = group_version.split("/")[0]
+        groups.append(group)
+    mock_api = MagicMock()
+    mock_api.get_api_versions.return_value.groups = groups
+    mocker.patch("kubernetes.client.ApisApi", return_value=mock_api)
+    return mock_api
+
+
+def test_discovery_is_cached_per_api_server(mocker):
+    mock_api = mock_api_versions(
+        mocker, "route.openshift.io/v1", "kueue.x-k8s.io/v1beta1"
+    )
+    server_a = mock_api_client("https://server-a:6443")
+    server_b = mock_api_client("https://server-b:6443")
+
+    assert is_api_served("route.openshift.io/v1", server_a)
+    assert is_api_served("kueue.x-k8s.io", server_a)
+    assert not is_api_served("workload.codeflare.dev", server_a)
+    assert mock_api.get_api_versions.call_count == 1
+
+    assert is_api_served("route.openshift.io/v1", server_b)
+    assert mock_api.get_api_versions.call_count == 2
+
+    invalidate_api_discovery_cache("https://server-a:6443")
+    get_served_apis(server_a)
+    get_served_apis(server_b)
+    assert mock_api.get_api_versions.call_count == 3
+
+    invalidate_api_discovery_cache()
+    get_served_apis(server_b)
+    assert mock_api.get_api_versions.call_count == 4
+
+
+def test_discovery_ttl(mocker):
+    mock_api = mock_api_versions(mocker, "route.openshift.io/v1")
+    server = mock_api_client("https://server:6443")
+    configure_api_discovery_cache(ttl_seconds=0)
+    try:
+        get_served_apis(server)
+        get_served_apis(server)
+        assert mock_api.get_api_versions.call_count == 2
+    finally:
+        configure_api_discovery_cache()
@@ -17,9 +17,14 @@ from codeflare_sdk.common.kubernetes_cluster import (
     KubeConfigFileAuthentication,
     TokenAuthentication,
     config_check,
+    get_api_client,
+    configure_api_client_pool,
 )
+from codeflare_sdk.common.kubernetes_cluster import auth
 from kubernetes import client, config
+import copy
 import os
+import socket
 from pathlib import Path
 import pytest
 
@@ -139,6 +144,58 @@ def test_config_check_with_config_path_and_no_api_client(mocker):
     assert result == "/mock/config/path"
 
 
+def test_config_check_is_cached_until_kubeconfig_changes(mocker, tmp_path):
+    kube_dir = tmp_path / ".kube"
+    kube_dir.mkdir()
+    kube_config_file = kube_dir / "config"
+    kube_config_file.write_text("apiVersion: v1")
+    mocker.patch("os.path.expanduser", return_value=str(tmp_path))
+    mocker.patch.dict(os.environ, clear=True)
+    mocker.patch("codeflare_sdk.common.kubernetes_cluster.auth.config_path", None)
+    mocker.patch("codeflare_sdk.common.kubernetes_cluster.auth.api_client", None)
+    mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.auth._loaded_config_fingerprint", None
+    )
+    load_kube_config = mocker.patch("kubernetes.config.load_kube_config")
+
+    config_check()
+    config_check()
+    assert load_kube_config.call_count == 1
+
+    kube_config_file.write_text("apiVersion: v1\nkind: Config")
+    config_check()
+    assert load_kube_config.call_count == 2
+
+    TokenAuthentication(token="token", server="server").logout()
+    config_check()
+    assert load_kube_config.call_count == 3
+
+
+def test_config_check_reloads_on_token_rotation(mocker, tmp_path):
+    token_file = tmp_path / "token"
+    token_file.write_text("token-a")
+    mocker.patch("os.path.expanduser", return_value=str(tmp_path))
+    mocker.patch.dict(os.environ, {"KUBERNETES_PORT": "number"}, clear=True)
+    mocker.patch("codeflare_sdk.common.kubernetes_cluster.auth.config_path", None)
+    mocker.patch("codeflare_sdk.common.kubernetes_cluster.auth.api_client", None)
+    mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.auth._loaded_config_fingerprint", None
+    )
+    mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.auth.SERVICE_ACCOUNT_TOKEN_PATH",
+        str(token_file),
+    )
+    load_incluster_config = mocker.patch("kubernetes.config.load_incluster_config")
+
+    config_check()
+    config_check()
+    assert load_incluster_config.call_count == 1
+
+    token_file.write_text("token-rotated")
+    config_check()
+    assert load_incluster_config.call_count == 2
+
+
 def test_load_kube_config(mocker):
     mocker.patch.object(config, "load_kube_config")
     kube_config_auth = KubeConfigFileAuthentication(
@@ -156,6 +213,115 @@ def test_load_kube_config(mocker):
     assert response == "Please specify a config file path"
 
 
+def test_get_api_client_pooling(mocker):
+    mocker.patch("codeflare_sdk.common.kubernetes_cluster.auth.api_client", None)
+    mocker.patch("codeflare_sdk.common.kubernetes_cluster.auth.config_path", None)
+    mocker.patch.dict(
+        "codeflare_sdk.common.kubernetes_cluster.auth._api_client_registry", clear=True
+    )
+    configuration = client.Configuration()
+    configuration.host = "https://pooled-server:6443"
+    configuration.api_key["authorization"] = "token-a"
+    mocker.patch.object(
+        client.Configuration,
+        "get_default_copy",
+        side_effect=lambda: copy.deepcopy(configuration),
+    )
+
+    close = mocker.spy(client.ApiClient, "close")
+    first = get_api_client()
+    assert get_api_client() is first
+    keep_alive = (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    assert keep_alive in first.rest_client.pool_manager.connection_pool_kw.get(
+        "socket_options"
+    )
+
+    # A rotated token is a different connection identity
+    configuration.api_key["authorization"] = "token-b"
+    second = get_api_client()
+    assert second is not first
+    assert get_api_client() is second
+    # It replaces the client of the previous token, which is closed
+    close.assert_called_once_with(first)
+    assert all("token" not in str(key) for key in auth._api_client_registry)
+
+    # Reconfiguring the pool closes and discards the previously pooled clients
+    configure_api_client_pool(pool_maxsize=2, keep_alive=False)
+    close.assert_called_with(second)
+    try:
+        third = get_api_client()
+        assert third is not second
+        assert third.configuration.connection_pool_maxsize == 2
+        assert "socket_options" not in third.rest_client.pool_manager.connection_pool_kw
+    finally:
+        configure_api_client_pool()
+
+
+def test_get_api_client_pool_keys_client_certificates(mocker):
+    mocker.patch("codeflare_sdk.common.kubernetes_cluster.auth.api_client", None)
+    mocker.patch("codeflare_sdk.common.kubernetes_cluster.auth.config_path", None)
+    mocker.patch.dict(
+        "codeflare_sdk.common.kubernetes_cluster.auth._api_client_registry", clear=True
+    )
+    mocker.patch.object(auth, "_loaded_context", "context-a")
+    configuration = client.Configuration()
+    configuration.host = "https://shared-server:6443"
+    configuration.cert_file = "/tmp/user-a.crt"
+    configuration.key_file = "/tmp/user-a.key"
+    mocker.patch.object(
+        client.Configuration,
+        "get_default_copy",
+        side_effect=lambda: copy.deepcopy(configuration),
+    )
+    close = mocker.spy(client.ApiClient, "close")
+
+    first = get_api_client()
+    assert get_api_client() is first
+
+    # Another context of the same server authenticates with another client certificate
+    mocker.patch.object(auth, "_loaded_context", "context-b")
+    configuration.cert_file = "/tmp/user-b.crt"
+    configuration.key_file = "/tmp/user-b.key"
+    second = get_api_client()
+    assert second is not first
+    assert second.configuration.cert_file == "/tmp/user-b.crt"
+
+    # Switching back reuses the client of the first context, which was left open
+    mocker.patch.object(auth, "_loaded_context", "context-a")
+    configuration.cert_file = "/tmp/user-a.crt"
+    configuration.key_file = "/tmp/user-a.key"
+    assert get_api_client() is first
+    close.assert_not_called()
+
+
+def test_get_api_client_pool_is_bounded(mocker):
+    mocker.patch("codeflare_sdk.common.kubernetes_cluster.auth.api_client", None)
+    mocker.patch("codeflare_sdk.common.kubernetes_cluster.auth.config_path", None)
+    mocker.patch.dict(
+        "codeflare_sdk.common.kubernetes_cluster.auth._api_client_registry", clear=True
+    )
+    mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.auth.MAX_POOLED_API_CLIENTS", 2
+    )
+    close = mocker.spy(client.ApiClient, "close")
+    configuration = client.Configuration()
+    mocker.patch.object(
+        client.Configuration,
+        "get_default_copy",
+        side_effect=lambda: copy.deepcopy(configuration),
+    )
+
+    clients = {}
+    for host in ["https://a:6443", "https://b:6443", "https://a:6443"]:
+        configuration.host = host
+        clients[host] = get_api_client()
+    configuration.host = "https://c:6443"
+    get_api_client()
+    # The least recently used client is closed once the pool is full
+    close.assert_called_once_with(clients["https://b:6443"])
+    assert len(auth._api_client_registry) == 2
+
+
 def test_auth_coverage():
     abstract = Authentication()
     abstract.login()
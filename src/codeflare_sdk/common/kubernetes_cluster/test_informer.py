@@ -0,0 +1,166 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+import time
+
+import urllib3
+
+from kubernetes.client.rest import ApiException
+
+from codeflare_sdk.common.kubernetes_cluster.informer import Informer
+
+
+def list_response(names, resource_version):
+    body = {
+        "items": [{"metadata": {"name": name}} for name in names],
+        "metadata": {"resourceVersion": resource_version},
+    }
+    response = type("Response", (), {})()
+    response.data = json.dumps(body).encode()
+    return response
+
+
+def event(event_type, name, resource_version):
+    return {
+        "type": event_type,
+        "raw_object": {"metadata": {"name": name, "resourceVersion": resource_version}},
+    }
+
+
+def test_informer_list_then_watch(mocker):
+    list_func = mocker.Mock(
+        side_effect=[list_response(["a", "b"], "1"), list_response(["a", "b"], "5")]
+    )
+    informer = Informer(list_func)
+    streams = []
+
+    def stream(func, **kwargs):
+        streams.append(kwargs["resource_version"])
+        if len(streams) == 1:
+            # The listed resourceVersion is gone, the informer has to list again
+            raise ApiException(status=410)
+        if len(streams) == 2:
+            return iter(
+                [
+                    event("MODIFIED", "a", "6"),
+                    event("DELETED", "b", "7"),
+                    event("ADDED", "c", "8"),
+                    {
+                        "type": "BOOKMARK",
+                        "raw_object": {"metadata": {"resourceVersion": "9"}},
+                    },
+                ]
+            )
+        informer.stop()
+        return iter([])
+
+    mock_watch = mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.informer.watch.Watch"
+    )
+    mock_watch.return_value.stream.side_effect = stream
+
+    assert informer.staleness() is None
+    informer._run()
+
+    assert streams == ["1", "5", "9"]
+    assert list_func.call_count == 2
+    assert sorted(o["metadata"]["name"] for o in informer.list()) == ["a", "c"]
+    assert informer.get("a")["metadata"]["resourceVersion"] == "6"
+    assert informer.get("b") is None
+    assert informer.staleness() < 5
+    # A stopped informer is never used, however recent its store is
+    assert not informer.is_fresh(30)
+
+
+def test_informer_stops_when_forbidden(mocker):
+    list_func = mocker.Mock(return_value=list_response(["a"], "1"))
+    mock_watch = mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.informer.watch.Watch"
+    )
+    mock_watch.return_value.stream.side_effect = ApiException(status=403)
+    informer = Informer(list_func)
+    informer._run()
+    assert informer.error.status == 403
+    assert not informer.is_fresh(30)
+
+
+def test_informer_thread(mocker):
+    list_func = mocker.Mock(return_value=list_response(["a"], "1"))
+    watching = threading.Event()
+    informer = Informer(list_func, name="test")
+
+    def stream(func, **kwargs):
+        watching.set()
+        informer._stopped.wait(5)
+        return iter([])
+
+    mock_watch = mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.informer.watch.Watch"
+    )
+    mock_watch.return_value.stream.side_effect = stream
+
+    informer.start()
+    assert informer.wait_for_sync(5)
+    assert watching.wait(5)
+    assert informer.staleness() < 5
+    assert informer.is_fresh(5)
+    informer.stop()
+    informer._thread.join(5)
+    assert not informer._thread.is_alive()
+    mock_watch.return_value.stop.assert_called()
+
+
+def test_informer_sync_fails_fast_when_forbidden(mocker):
+    list_func = mocker.Mock(side_effect=ApiException(status=403))
+    informer = Informer(list_func)
+    informer.start()
+    start = time.monotonic()
+    assert not informer.wait_for_sync(5)
+    assert time.monotonic() - start < 1
+    assert informer.error.status == 403
+    informer._thread.join(5)
+    assert not informer._thread.is_alive()
+
+
+def test_informer_staleness_follows_events(mocker):
+    list_func = mocker.Mock(return_value=list_response(["a"], "1"))
+    informer = Informer(list_func, watch_timeout_seconds=15)
+    clock = mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.informer.monotonic", return_value=100
+    )
+    staleness = []
+
+    def stream(func, **kwargs):
+        assert kwargs["timeout_seconds"] == 15
+        assert kwargs["_request_timeout"] == 25
+        # An open watch that receives nothing gets staler
+        clock.return_value = 120
+        staleness.append(informer.staleness())
+        yield event("MODIFIED", "a", "2")
+        staleness.append(informer.staleness())
+        clock.return_value = 130
+        informer.stop()
+        raise urllib3.exceptions.ReadTimeoutError(None, None, "timed out")
+
+    mock_watch = mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.informer.watch.Watch"
+    )
+    mock_watch.return_value.stream.side_effect = stream
+    informer._run()
+
+    assert staleness == [20, 0]
+    # The connection timed out, the store is as old as the last event
+    assert informer.staleness() == 10
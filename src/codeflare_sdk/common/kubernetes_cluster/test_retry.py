@@ -0,0 +1,163 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from codeflare_sdk.common.kubernetes_cluster.retry import (
+    TokenBucket,
+    configure_api_retries,
+    get_api_retry_metrics,
+    install_retries,
+    reset_api_retry_metrics,
+)
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+from unittest.mock import MagicMock
+import pytest
+import urllib3
+
+
+@pytest.fixture
+def retrying_client(mocker):
+    configure_api_retries(qps=None)
+    reset_api_retry_metrics()
+    sleep = mocker.patch("codeflare_sdk.common.kubernetes_cluster.retry.sleep")
+    mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.retry.random.uniform",
+        side_effect=lambda low, high: high,
+    )
+    api_client = client.ApiClient()
+    request = MagicMock()
+    api_client.rest_client.request = request
+    install_retries(api_client)
+    install_retries(api_client)
+    yield api_client.rest_client, request, sleep
+    configure_api_retries()
+    reset_api_retry_metrics()
+
+
+def api_exception(status, retry_after=None):
+    e = ApiException(status=status, reason="error")
+    if retry_after is not None:
+        e.headers = {"Retry-After": retry_after}
+    return e
+
+
+def test_throttled_requests_honour_retry_after(retrying_client):
+    rest_client, request, sleep = retrying_client
+    request.side_effect = [api_exception(429, "3"), api_exception(429), "created"]
+
+    assert rest_client.POST("https://api/apis/x", body={}) == "created"
+    assert request.call_count == 3
+    assert [c.args[0] for c in sleep.call_args_list] == [3.0, 1.0]
+    assert get_api_retry_metrics() == {
+        "requests": 3,
+        "retries": 2,
+        "retries_429": 2,
+        "failures": 0,
+        "throttled_seconds": 0.0,
+    }
+
+
+def test_server_errors_are_only_retried_for_idempotent_requests(retrying_client):
+    rest_client, request, sleep = retrying_client
+    request.side_effect = [
+        api_exception(503),
+        urllib3.exceptions.ProtocolError("Connection reset by peer"),
+        "listed",
+    ]
+    assert rest_client.GET("https://api/apis/x") == "listed"
+    assert [c.args[0] for c in sleep.call_args_list] == [0.5, 1.0]
+
+    request.side_effect = [api_exception(503)]
+    with pytest.raises(ApiException):
+        rest_client.POST("https://api/apis/x", body={})
+    request.side_effect = [api_exception(404)]
+    with pytest.raises(ApiException):
+        rest_client.GET("https://api/apis/x")
+
+    metrics = get_api_retry_metrics()
+    assert metrics["retries_503"] == 1
+    assert metrics["retries_connection"] == 1
+    assert metrics["failures"] == 2
+
+
+def test_watches_are_not_retried(retrying_client):
+    rest_client, request, sleep = retrying_client
+    request.side_effect = [
+        urllib3.exceptions.ProtocolError("Connection reset by peer"),
+        api_exception(503),
+    ]
+    with pytest.raises(urllib3.exceptions.ProtocolError):
+        rest_client.GET(
+            "https://api/apis/x",
+            query_params=[("watch", True)],
+            _preload_content=False,
+        )
+    with pytest.raises(ApiException):
+        rest_client.GET("https://api/apis/x", _preload_content=False)
+    assert request.call_count == 2
+    sleep.assert_not_called()
+    assert get_api_retry_metrics() == {
+        "requests": 2,
+        "retries": 0,
+        "failures": 2,
+        "throttled_seconds": 0.0,
+    }
+
+    # Watches are still rate limited
+    configure_api_retries(qps=1, burst=1)
+    request.side_effect = None
+    request.return_value = "stream"
+    rest_client.GET("https://api/apis/x", query_params=[("watch", True)])
+    rest_client.GET("https://api/apis/x", query_params=[("watch", True)])
+    assert get_api_retry_metrics()["throttled_seconds"] > 0
+
+
+def test_retries_give_up_after_max_retries(retrying_client):
+    rest_client, request, sleep = retrying_client
+    configure_api_retries(max_retries=2, max_backoff_seconds=0.75, qps=None)
+    request.side_effect = api_exception(500)
+    with pytest.raises(ApiException):
+        rest_client.GET("https://api/apis/x")
+    assert request.call_count == 3
+    assert [c.args[0] for c in sleep.call_args_list] == [0.5, 0.75]
+
+    # Unparseable Retry-After values fall back to the backoff, and HTTP dates are converted
+    # to a delay, capped at the maximum backoff
+    retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(hours=1), True)
+    request.side_effect = [
+        api_exception(429, "soon"),
+        api_exception(429, retry_at),
+        "ok",
+    ]
+    rest_client.GET("https://api/apis/x")
+    assert [c.args[0] for c in sleep.call_args_list[2:]] == [0.5, 0.75]
+
+
+def test_token_bucket(mocker):
+    now = mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.retry.monotonic", return_value=100.0
+    )
+    sleep = mocker.patch("codeflare_sdk.common.kubernetes_cluster.retry.sleep")
+    bucket = TokenBucket(qps=2, burst=2)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0.5
+    assert bucket.acquire() == 1.0
+    sleep.assert_has_calls([mocker.call(0.5), mocker.call(1.0)])
+
+    now.return_value = 110.0
+    assert bucket.acquire() == 0
+    assert TokenBucket(qps=None).acquire() == 0
@@ -0,0 +1,49 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from codeflare_sdk.common.kubernetes_cluster.selectors import (
+    field_selector_matcher,
+    label_selector_matcher,
+)
+
+
+def obj(name, labels=None):
+    return {"metadata": {"name": name, "namespace": "ns", "labels": labels}}
+
+
+def test_label_selector_matcher():
+    matches = label_selector_matcher(
+        "app=ray, tier in (head, worker),team!=b,!experimental,owner"
+    )
+    assert matches(obj("a", {"app": "ray", "tier": "head", "owner": "me"}))
+    assert not matches(obj("b", {"app": "ray", "tier": "head"}))
+    assert not matches(obj("c", {"app": "ray", "tier": "other", "owner": "me"}))
+    assert not matches(
+        obj("d", {"app": "ray", "tier": "head", "owner": "me", "team": "b"})
+    )
+    assert not matches(
+        obj("e", {"app": "ray", "tier": "head", "owner": "me", "experimental": ""})
+    )
+    assert label_selector_matcher("tier notin (head)")(obj("f"))
+    assert not label_selector_matcher("app==ray")(obj("g"))
+    # Selectors the API server would reject are left to the API server
+    assert label_selector_matcher("app=ray,tier > 3") is None
+
+
+def test_field_selector_matcher():
+    matches = field_selector_matcher("metadata.name=a,metadata.namespace==ns")
+    assert matches(obj("a"))
+    assert not matches(obj("b"))
+    assert field_selector_matcher("metadata.name!=a")(obj("b"))
+    assert field_selector_matcher("status.state=ready") is None
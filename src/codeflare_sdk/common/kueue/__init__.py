@@ -3,4 +3,8 @@ from .kueue import (
     local_queue_exists,
     add_queue_label,
     list_local_queues,
+    LocalQueueIndex,
+    get_local_queue_index,
+    configure_local_queue_cache,
+    invalidate_local_queue_cache,
 )
@@ -12,18 +12,166 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional, List
+import threading
+from dataclasses import dataclass
+from time import monotonic
+from typing import Dict, Optional, List
 from codeflare_sdk.common import _kube_api_error_handling
 from codeflare_sdk.common.kubernetes_cluster.auth import config_check, get_api_client
+from codeflare_sdk.common.kubernetes_cluster.api_discovery import KUEUE_API_GROUP
 from kubernetes import client
 from kubernetes.client.exceptions import ApiException
 
+KUEUE_API_VERSION = "v1beta1"
+DEFAULT_QUEUE_ANNOTATION = "kueue.x-k8s.io/default-queue"
+QUEUE_NAME_LABEL = "kueue.x-k8s.io/queue-name"
+
+DEFAULT_LOCAL_QUEUE_TTL_SECONDS = 30
+LOCAL_QUEUE_FETCH_LOCKS = 16
+
+_local_queue_ttl_seconds = DEFAULT_LOCAL_QUEUE_TTL_SECONDS
+# (API server host, namespace) -> (expiry time, LocalQueueIndex)
+_local_queue_cache = {}
+# Held while listing, so concurrent builds share one list. Namespaces share a fixed set of
+# locks by hash, so that looking up many namespaces doesn't grow the set
+_local_queue_fetch_locks = [threading.Lock() for _ in range(LOCAL_QUEUE_FETCH_LOCKS)]
+_local_queue_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class LocalQueueIndex:
+    """
+    For storing the local queues of a namespace, indexed by name.
+
+    Attributes:
+        namespace (str):
+            The namespace the local queues were listed from.
+        queues (Dict[str, dict]):
+            The local queue objects, keyed by name.
+        default_queue (Optional[str]):
+            The name of the local queue annotated as the default queue, if any.
+    """
+
+    namespace: str
+    queues: Dict[str, dict]
+    default_queue: Optional[str] = None
+
+    def flavors(self, local_queue_name: str) -> Optional[List[str]]:
+        """
+        Returns the flavors available to a local queue, or None if the local queue API
+        does not report them.
+        """
+        status = self.queues[local_queue_name].get("status") or {}
+        if "flavors" not in status:
+            return None
+        return [f["name"] for f in status["flavors"]]
+
+
+def configure_local_queue_cache(ttl_seconds: float = DEFAULT_LOCAL_QUEUE_TTL_SECONDS):
+    """
+    Sets how long the local queues of a namespace are cached for.
+
+    Args:
+        ttl_seconds (float):
+            The number of seconds a local queue list is reused for. Defaults to 30.
+    """
+    global _local_queue_ttl_seconds
+    _local_queue_ttl_seconds = ttl_seconds
+    invalidate_local_queue_cache()
+
+
+def invalidate_local_queue_cache(namespace: Optional[str] = None):
+    """
+    Discards cached local queues so that the next lookup lists them again.
+
+    Args:
+        namespace (Optional[str]):
+            The namespace to invalidate. Invalidates every namespace when None.
+    """
+    with _local_queue_lock:
+        if namespace is None:
+            _local_queue_cache.clear()
+        else:
+            for key in [k for k in _local_queue_cache if k[1] == namespace]:
+                del _local_queue_cache[key]
+
+
+def get_local_queue_index(namespace: str, refresh: bool = False) -> LocalQueueIndex:
+    """
+    Returns the local queues of a namespace, listing them at most once per TTL.
+
+    If informers were started for the namespace (see `start_informers`), the local queues
+    are read from memory instead, and are then up to date with every local queue change
+    rather than cached for the TTL.
+
+    Args:
+        namespace (str):
+            The Kubernetes namespace where the local queues are located.
+        refresh (bool):
+            Whether to list the local queues again even if a cached result exists.
+
+    Returns:
+        LocalQueueIndex:
+            The local queues of the namespace.
+
+    Raises:
+        ApiException:
+            If the local queues could not be listed.
+    """
+    # Imported here, as the informers are part of the cluster sub-module
+    from codeflare_sdk.ray.cluster.informers import get_fresh_informer
+
+    informer = None if refresh else get_fresh_informer(namespace, "localqueues")
+    if informer is not None:
+        return _index_local_queues(namespace, informer.list())
+
+    config_check()
+    api_client = get_api_client()
+    key = (api_client.configuration.host, namespace)
+    fetch_lock = _local_queue_fetch_locks[hash(key) % len(_local_queue_fetch_locks)]
+
+    with fetch_lock:
+        if not refresh:
+            with _local_queue_lock:
+                cached = _local_queue_cache.get(key)
+            if cached is not None and cached[0] > monotonic():
+                return cached[1]
+
+        local_queues = client.CustomObjectsApi(
+            api_client
+        ).list_namespaced_custom_object(
+            group=KUEUE_API_GROUP,
+            version=KUEUE_API_VERSION,
+            namespace=namespace,
+            plural="localqueues",
+        )
+        index = _index_local_queues(namespace, local_queues["items"])
+
+        with _local_queue_lock:
+            _local_queue_cache[key] = (monotonic() + _local_queue_ttl_seconds, index)
+        return index
+
+
+def _index_local_queues(namespace: str, local_queues: List[dict]) -> LocalQueueIndex:
+    queues = {}
+    default_queue = None
+    for lq in local_queues:
+        name = lq["metadata"]["name"]
+        queues[name] = lq
+        annotations = lq["metadata"].get("annotations") or {}
+        if (
+            default_queue is None
+            and annotations.get(DEFAULT_QUEUE_ANNOTATION, "").lower() == "true"
+        ):
+            default_queue = name
+    return LocalQueueIndex(namespace, queues, default_queue)
+
 
 def get_default_kueue_name(namespace: str) -> Optional[str]:
     """
     Retrieves the default Kueue name from the provided namespace.
 
-    This function attempts to fetch the local queues in the given namespace and checks if any of them is annotated
+    This function looks up the local queues in the given namespace and checks if any of them is annotated
     as the default queue. If found, the name of the default queue is returned.
 
     The default queue is marked with the annotation "kueue.x-k8s.io/default-queue" set to "true."
@@ -37,27 +185,12 @@ def get_default_kueue_name(namespace: str) -> Optional[str]:
             The name of the default queue if it exists, otherwise None.
     """
     try:
-        config_check()
-        api_instance = client.CustomObjectsApi(get_api_client())
-        local_queues = api_instance.list_namespaced_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            namespace=namespace,
-            plural="localqueues",
-        )
+        return get_local_queue_index(namespace).default_queue
     except ApiException as e:  # pragma: no cover
         if e.status == 404 or e.status == 403:
             return
         else:
             return _kube_api_error_handling(e)
-    for lq in local_queues["items"]:
-        if (
-            "annotations" in lq["metadata"]
-            and "kueue.x-k8s.io/default-queue" in lq["metadata"]["annotations"]
-            and lq["metadata"]["annotations"]["kueue.x-k8s.io/default-queue"].lower()
-            == "true"
-        ):
-            return lq["metadata"]["name"]
 
 
 def list_local_queues(
@@ -86,21 +219,15 @@ def list_local_queues(
     if namespace is None:  # pragma: no cover
         namespace = get_current_namespace()
     try:
-        config_check()
-        api_instance = client.CustomObjectsApi(get_api_client())
-        local_queues = api_instance.list_namespaced_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            namespace=namespace,
-            plural="localqueues",
-        )
+        index = get_local_queue_index(namespace)
     except ApiException as e:  # pragma: no cover
         return _kube_api_error_handling(e)
     to_return = []
-    for lq in local_queues["items"]:
-        item = {"name": lq["metadata"]["name"]}
-        if "flavors" in lq["status"]:
-            item["flavors"] = [f["name"] for f in lq["status"]["flavors"]]
+    for name in index.queues:
+        item = {"name": name}
+        lq_flavors = index.flavors(name)
+        if lq_flavors is not None:
+            item["flavors"] = lq_flavors
             if flavors is not None and not set(flavors).issubset(set(item["flavors"])):
                 continue
         elif flavors is not None:
@@ -113,7 +240,9 @@ def local_queue_exists(namespace: str, local_queue_name: str) -> bool:
     """
     Checks if a local queue with the provided name exists in the given namespace.
 
-    This function queries the local queues in the specified namespace and verifies if any queue matches the given name.
+    This function looks up the local queues in the specified namespace and verifies if any queue matches the given
+    name. A name missing from the cached local queues is checked again against a fresh list, so that newly created
+    local queues are found.
 
     Args:
         namespace (str):
@@ -126,21 +255,11 @@ def local_queue_exists(namespace: str, local_queue_name: str) -> bool:
             True if the local queue exists, False otherwise.
     """
     try:
-        config_check()
-        api_instance = client.CustomObjectsApi(get_api_client())
-        local_queues = api_instance.list_namespaced_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            namespace=namespace,
-            plural="localqueues",
-        )
+        if local_queue_name in get_local_queue_index(namespace).queues:
+            return True
+        return local_queue_name in get_local_queue_index(namespace, refresh=True).queues
     except Exception as e:  # pragma: no cover
         return _kube_api_error_handling(e)
-    # check if local queue with the name provided in cluster config exists
-    for lq in local_queues["items"]:
-        if lq["metadata"]["name"] == local_queue_name:
-            return True
-    return False
 
 
 def add_queue_label(item: dict, namespace: str, local_queue: Optional[str]):
@@ -171,4 +290,4 @@ def add_queue_label(item: dict, namespace: str, local_queue: Optional[str]):
         )
     if not "labels" in item["metadata"]:
         item["metadata"]["labels"] = {}
-    item["metadata"]["labels"].update({"kueue.x-k8s.io/queue-name": lq_name})
+    item["metadata"]["labels"].update({QUEUE_NAME_LABEL: lq_name})
@@ -23,7 +23,13 @@ import yaml
 import os
 import filecmp
 from pathlib import Path
-from .kueue import list_local_queues, local_queue_exists, add_queue_label
+from .kueue import (
+    list_local_queues,
+    local_queue_exists,
+    add_queue_label,
+    get_local_queue_index,
+    invalidate_local_queue_cache,
+)
 
 parent = Path(__file__).resolve().parents[4]  # project directory
 aw_dir = os.path.expanduser("~/.codeflare/resources/")
@@ -171,6 +177,7 @@ def test_list_local_queues(mocker):
             ]
         },
     )
+    invalidate_local_queue_cache("ns")
     lqs = list_local_queues("ns", flavors=["default"])
     assert lqs == []
 
@@ -227,7 +234,9 @@ def test_local_queue_exists_not_found(mocker):
 
     # Assertions
     assert result is False
-    mock_api_instance.list_namespaced_custom_object.assert_called_once_with(
+    # A miss is checked against a fresh list before giving up
+    assert mock_api_instance.list_namespaced_custom_object.call_count == 2
+    mock_api_instance.list_namespaced_custom_object.assert_called_with(
         group="kueue.x-k8s.io",
         version="v1beta1",
         namespace=namespace,
@@ -292,6 +301,58 @@ def test_add_queue_label_with_invalid_local_queue(mocker):
         add_queue_label(item, namespace, local_queue)
 
 
+def test_local_queue_index_is_cached(mocker):
+    mocker.patch("kubernetes.client.ApisApi.get_api_versions")
+    mocker.patch(
+        "kubernetes.client.CustomObjectsApi.get_cluster_custom_object",
+        return_value={"spec": {"domain": "apps.cluster.awsroute.org"}},
+    )
+    list_lqs = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
+        return_value=get_local_queue("kueue.x-k8s.io", "v1beta1", "ns", "localqueues"),
+    )
+
+    index = get_local_queue_index("ns")
+    assert index.default_queue == "local-queue-default"
+    assert sorted(index.queues) == ["local-queue-default", "team-a-queue"]
+    assert index.flavors("team-a-queue") is None
+
+    # Building a cluster (default queue lookup and existence check) reuses the same list
+    config = create_cluster_config()
+    config.appwrapper = False
+    config.local_queue = None
+    cluster = Cluster(config)
+    assert (
+        cluster.resource_yaml["metadata"]["labels"]["kueue.x-k8s.io/queue-name"]
+        == "local-queue-default"
+    )
+    assert list_lqs.call_count == 1
+
+    invalidate_local_queue_cache("ns")
+    assert get_local_queue_index("ns") is not index
+    assert list_lqs.call_count == 2
+
+
+def test_local_queue_exists_refreshes_on_miss(mocker):
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mock_api_instance = mocker.Mock()
+    mocker.patch("kubernetes.client.CustomObjectsApi", return_value=mock_api_instance)
+    mock_api_instance.list_namespaced_custom_object.side_effect = [
+        {"items": [{"metadata": {"name": "existing-queue"}}]},
+        {
+            "items": [
+                {"metadata": {"name": "existing-queue"}},
+                {"metadata": {"name": "new-queue"}},
+            ]
+        },
+    ]
+
+    assert local_queue_exists("test-namespace", "existing-queue") is True
+    # A queue created after the first list is found by listing again
+    assert local_queue_exists("test-namespace", "new-queue") is True
+    assert mock_api_instance.list_namespaced_custom_object.call_count == 2
+
+
 # Make sure to always keep this function last
 def test_cleanup():
     os.remove(f"{aw_dir}unit-test-cluster-kueue.yaml")
@@ -0,0 +1,95 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from codeflare_sdk.common.utils.yaml_io import (
+    clear_yaml_cache,
+    dump_yaml,
+    load_yaml,
+    load_yaml_all,
+    write_yaml,
+    write_yaml_files,
+)
+import os
+import pytest
+import yaml
+
+document = {"kind": "RayCluster", "metadata": {"name": "a"}, "spec": {"n": [1, 2]}}
+
+
+def test_dump_yaml():
+    assert dump_yaml(document) == yaml.dump(document, default_flow_style=False)
+    bundle = dump_yaml([document, {"kind": "AppWrapper"}])
+    assert list(yaml.safe_load_all(bundle)) == [document, {"kind": "AppWrapper"}]
+
+
+def test_write_yaml(tmp_path):
+    path = str(tmp_path / "nested" / "a.yaml")
+    assert write_yaml(path, document) == path
+    with open(path) as f:
+        assert yaml.safe_load(f) == document
+    # Only the final file is left behind
+    assert os.listdir(tmp_path / "nested") == ["a.yaml"]
+
+
+def test_write_yaml_keeps_previous_file_on_failure(mocker, tmp_path):
+    path = str(tmp_path / "a.yaml")
+    write_yaml(path, document)
+    mocker.patch("os.replace", side_effect=OSError("disk full"))
+    with pytest.raises(OSError):
+        write_yaml(path, {"kind": "AppWrapper"})
+    with open(path) as f:
+        assert yaml.safe_load(f) == document
+    assert os.listdir(tmp_path) == ["a.yaml"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_write_yaml_files(mocker, tmp_path, max_workers):
+    mocker.patch("codeflare_sdk.common.utils.yaml_io.PARALLEL_WRITE_THRESHOLD", 2)
+    files = {
+        str(tmp_path / f"{i}.yaml"): {"metadata": {"name": str(i)}} for i in range(5)
+    }
+    assert write_yaml_files(files, max_workers=max_workers) == list(files)
+    for path, expected in files.items():
+        with open(path) as f:
+            assert yaml.safe_load(f) == expected
+
+
+def test_load_yaml_caches_until_the_file_changes(mocker, tmp_path):
+    clear_yaml_cache()
+    path = str(tmp_path / "aw.yaml")
+    write_yaml(path, [document, {"kind": "AppWrapper"}])
+    load_all = mocker.spy(yaml, "load_all")
+
+    assert load_yaml(path) == document
+    assert load_yaml_all(path) == [document, {"kind": "AppWrapper"}]
+    assert load_all.call_count == 1
+
+    # Callers get their own copies
+    load_yaml(path)["spec"]["n"].append(3)
+    assert load_yaml(path) == document
+    assert load_all.call_count == 1
+
+    write_yaml(path, {"kind": "RayCluster"})
+    assert load_yaml(path) == {"kind": "RayCluster"}
+    assert load_all.call_count == 2
+
+    clear_yaml_cache()
+    load_yaml(path)
+    assert load_all.call_count == 3
+
+
+def test_load_yaml_empty_file(tmp_path):
+    path = tmp_path / "empty.yaml"
+    path.write_text("")
+    assert load_yaml(str(path)) is None
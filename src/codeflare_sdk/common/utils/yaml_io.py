@@ -0,0 +1,196 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The yaml_io sub-module reads and writes the YAML files of the SDK, using the libyaml based
+parser and emitter when PyYAML was built with them. Parsed files are cached until they change.
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper, SafeLoader
+
+# Below this many files, starting worker processes costs more than it saves
+PARALLEL_WRITE_THRESHOLD = 32
+# The number of parsed files kept in memory
+PARSE_CACHE_SIZE = 128
+
+# absolute path -> ((inode, mtime, size), documents)
+_parse_cache: "OrderedDict[str, Tuple[tuple, List[Any]]]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def load_yaml(path: str) -> Any:
+    """
+    Parses the first document of a YAML file, like `yaml.safe_load`.
+
+    Args:
+        path (str):
+            The file to parse.
+
+    Returns:
+        Any:
+            The parsed document, or None for an empty file. Each call returns a new copy.
+    """
+    documents = load_yaml_all(path)
+    return documents[0] if documents else None
+
+
+def load_yaml_all(path: str) -> List[Any]:
+    """
+    Parses every document of a YAML file, like `yaml.safe_load_all`.
+
+    Files are only parsed again once they change on disk, so repeatedly loading the same
+    manifest is cheap.
+
+    Args:
+        path (str):
+            The file to parse.
+
+    Returns:
+        List[Any]:
+            The parsed documents. Each call returns new copies.
+    """
+    key = os.path.abspath(path)
+    with open(key) as f:
+        stat = os.fstat(f.fileno())
+        # A rename or rewrite changes the inode or modification time
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with _parse_cache_lock:
+            cached = _parse_cache.get(key)
+            if cached is not None and cached[0] == version:
+                _parse_cache.move_to_end(key)
+                return _copy_document(cached[1])
+        documents = list(yaml.load_all(f, Loader=SafeLoader))
+
+    with _parse_cache_lock:
+        _parse_cache[key] = (version, documents)
+        _parse_cache.move_to_end(key)
+        while len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return _copy_document(documents)
+
+
+def clear_yaml_cache():
+    """
+    Forgets every parsed file.
+    """
+    with _parse_cache_lock:
+        _parse_cache.clear()
+
+
+def _copy_document(document: Any) -> Any:
+    # Parsed YAML only nests dicts and lists, everything else is an immutable scalar
+    if isinstance(document, dict):
+        return {key: _copy_document(value) for key, value in document.items()}
+    if isinstance(document, list):
+        return [_copy_document(value) for value in document]
+    if isinstance(document, set):
+        return set(document)
+    return document
+
+
+def dump_yaml(documents: Union[dict, List[dict]]) -> str:
+    """
+    Serializes a document, or a list of documents as a multi-document stream, to YAML.
+
+    Args:
+        documents (Union[dict, List[dict]]):
+            A single document, or a list of documents separated by `---` in the output.
+
+    Returns:
+        str:
+            The YAML text, formatted like `yaml.dump(..., default_flow_style=False)`.
+    """
+    if isinstance(documents, dict):
+        documents = [documents]
+    return yaml.dump_all(documents, Dumper=SafeDumper, default_flow_style=False)
+
+
+def write_yaml(path: str, documents: Union[dict, List[dict]]) -> str:
+    """
+    Writes a document, or a list of documents as a multi-document bundle, to a YAML file.
+
+    The file is written under a temporary name in the same directory and then renamed, so
+    readers see either the previous or the new content, never a partial file.
+
+    Args:
+        path (str):
+            The file to write. Missing parent directories are created.
+        documents (Union[dict, List[dict]]):
+            A single document, or a list of documents.
+
+    Returns:
+        str:
+            The path of the written file.
+    """
+    content = dump_yaml(documents)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(
+        directory, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp"
+    )
+    # Opened like open(path, "w") would, so the file gets the usual umask-based mode
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w") as outfile:
+            outfile.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return path
+
+
+def _write_yaml_item(item):
+    return write_yaml(*item)
+
+
+def write_yaml_files(
+    files: Dict[str, Union[dict, List[dict]]], max_workers: Optional[int] = None
+) -> List[str]:
+    """
+    Writes many YAML files, each with `write_yaml()`. Large batches are serialized and
+    written from a pool of processes.
+
+    Args:
+        files (Dict[str, Union[dict, List[dict]]]):
+            The documents to write, keyed by file path.
+        max_workers (Optional[int]):
+            The maximum number of processes. Defaults to the number of CPUs; 1 writes from the current process.
+
+    Returns:
+        List[str]:
+            The paths of the written files, in the order of `files`.
+    """
+    items = list(files.items())
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(items) < PARALLEL_WRITE_THRESHOLD:
+        return [write_yaml(path, documents) for path, documents in items]
+
+    chunksize = max(1, len(items) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_write_yaml_item, items, chunksize=chunksize))
@@ -0,0 +1,30 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from codeflare_sdk.common.kubernetes_cluster.api_discovery import (
+    invalidate_api_discovery_cache,
+)
+from codeflare_sdk.common.kueue.kueue import invalidate_local_queue_cache
+from codeflare_sdk.ray.cluster.informers import stop_informers
+
+
+@pytest.fixture(autouse=True)
+def reset_sdk_caches():
+    # Unit tests mock the Kubernetes API per test, so cached API responses must not leak between tests
+    invalidate_api_discovery_cache()
+    invalidate_local_queue_cache()
+    yield
+    stop_informers()
@@ -1,16 +1,45 @@
-from .appwrapper import AppWrapper, AppWrapperStatus, AWManager
+from importlib import import_module
 
-from .client import (
-    RayJobClient,
-)
+# Imported on first access (PEP 562), so that using the cluster API does not load Ray's job
+# submission client and everything it depends on.
+_LAZY_IMPORTS = {
+    "AppWrapper": ".appwrapper",
+    "AppWrapperStatus": ".appwrapper",
+    "AWManager": ".appwrapper",
+    "BulkAWManager": ".appwrapper",
+    "AWResult": ".appwrapper",
+    "RayJobClient": ".client",
+    "AsyncRayJobClient": ".client",
+    "JobWatcher": ".client",
+    "Cluster": ".cluster",
+    "ClusterConfiguration": ".cluster",
+    "get_cluster": ".cluster",
+    "list_all_queued": ".cluster",
+    "list_all_clusters": ".cluster",
+    "iter_clusters": ".cluster",
+    "RayClusterStatus": ".cluster",
+    "CodeFlareClusterStatus": ".cluster",
+    "RayCluster": ".cluster",
+    "ClusterFleet": ".cluster",
+    "render_manifests": ".cluster",
+    "AsyncCluster": ".cluster",
+    "get_cluster_async": ".cluster",
+    "list_all_clusters_async": ".cluster",
+    "configure_async_executor": ".cluster",
+    "start_informers": ".cluster",
+    "stop_informers": ".cluster",
+}
 
-from .cluster import (
-    Cluster,
-    ClusterConfiguration,
-    get_cluster,
-    list_all_queued,
-    list_all_clusters,
-    RayClusterStatus,
-    CodeFlareClusterStatus,
-    RayCluster,
-)
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
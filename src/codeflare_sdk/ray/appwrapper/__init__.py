@@ -1,4 +1,4 @@
-from .awload import AWManager
+from .awload import AWManager, BulkAWManager, AWResult
 
 from .status import (
     AppWrapperStatus,
@@ -14,20 +14,27 @@
 
 """
 The awload sub-module contains the definition of the AWManager object, which handles
-submission and deletion of existing AppWrappers from a user's file system.
+submission and deletion of existing AppWrappers from a user's file system, and of the
+BulkAWManager object, which does the same for many AppWrappers at once.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from os.path import isfile
+from time import monotonic, sleep
+from typing import List, Optional, Tuple
 import errno
 import os
-import yaml
 
 from kubernetes import client
+from kubernetes.client.rest import ApiException
 from ...common import _kube_api_error_handling
+from ...common.utils.yaml_io import load_yaml, load_yaml_all
 from ...common.kubernetes_cluster.auth import (
     config_check,
     get_api_client,
 )
+from ...common.kubernetes_cluster.retry import TokenBucket
 
 
 class AWManager:
@@ -45,8 +52,7 @@ class AWManager:
             raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), filename)
         self.filename = filename
         try:
-            with open(self.filename) as f:
-                self.awyaml = yaml.load(f, Loader=yaml.FullLoader)
+            self.awyaml = load_yaml(self.filename)
             assert self.awyaml["kind"] == "AppWrapper"
             self.name = self.awyaml["metadata"]["name"]
             self.namespace = self.awyaml["metadata"]["namespace"]
@@ -100,3 +106,255 @@ class AWManager:
 
         self.submitted = False
         print(f"AppWrapper {self.name} removed!")
+
+
+DEFAULT_MAX_WORKERS = 8
+DELETION_INITIAL_BACKOFF_SECONDS = 1
+DELETION_MAX_BACKOFF_SECONDS = 10
+YAML_EXTENSIONS = (".yaml", ".yml")
+
+
+@dataclass
+class AWResult:
+    """
+    For storing the outcome of a bulk operation on a single AppWrapper.
+    """
+
+    name: str
+    namespace: str
+    source: str
+    succeeded: bool
+    error: Optional[Exception] = None
+
+
+class BulkAWManager:
+    """
+    An object for submitting and removing many existing AppWrapper yamls at once.
+
+    All documents are loaded and validated when the manager is created, so that a batch
+    with a malformed AppWrapper is rejected before anything is submitted. `submit()` and
+    `remove()` then act on every AppWrapper with a bounded pool of workers, returning one
+    AWResult per AppWrapper. Throttled requests are retried by the SDK's API clients, see
+    `configure_api_retries()`.
+
+    Args:
+        path (str):
+            A directory of AppWrapper yamls, or a single (possibly multi-document) yaml file.
+        namespace (Optional[str]):
+            The namespace for AppWrappers that don't set one.
+        max_workers (int):
+            The maximum number of concurrent requests. Defaults to 8.
+        qps (Optional[float]):
+            The maximum number of requests per second for this batch, on top of the SDK-wide limit. If None, only the SDK-wide limit applies.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        qps: Optional[float] = None,
+    ) -> None:
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(path, f)
+                for f in os.listdir(path)
+                if f.endswith(YAML_EXTENSIONS)
+            )
+        elif isfile(path):
+            files = [path]
+        else:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+
+        self.max_workers = max_workers
+        self._rate_limiter = TokenBucket(qps)
+        # (source, AppWrapper) pairs, where the source is "<file>" or "<file>#<document index>"
+        self.appwrappers: List[Tuple[str, dict]] = []
+        errors = []
+        seen = set()
+        for filename in files:
+            try:
+                documents = [d for d in load_yaml_all(filename) if d is not None]
+            except Exception as e:
+                errors.append(f"{filename}: {e}")
+                continue
+            for index, aw in enumerate(documents):
+                source = filename if len(documents) == 1 else f"{filename}#{index}"
+                error = _validate_appwrapper(aw, namespace)
+                if error is None:
+                    key = (aw["metadata"]["namespace"], aw["metadata"]["name"])
+                    if key in seen:
+                        error = f"duplicate AppWrapper {key[0]}/{key[1]}"
+                    seen.add(key)
+                if error is not None:
+                    errors.append(f"{source}: {error}")
+                else:
+                    self.appwrappers.append((source, aw))
+        if errors:
+            raise ValueError(
+                "Not correctly formatted AppWrapper yamls:\n" + "\n".join(errors)
+            )
+        self.submitted = set()
+
+    def submit(self) -> List[AWResult]:
+        """
+        Creates every AppWrapper custom resource.
+
+        Returns:
+            List[AWResult]:
+                The outcome for each AppWrapper, in load order.
+        """
+        config_check()
+        api_instance = client.CustomObjectsApi(get_api_client())
+
+        def submit_one(aw: dict):
+            self._call(
+                api_instance.create_namespaced_custom_object,
+                group="workload.codeflare.dev",
+                version="v1beta2",
+                namespace=aw["metadata"]["namespace"],
+                plural="appwrappers",
+                body=aw,
+            )
+
+        results = self._run_for_each(self.appwrappers, submit_one)
+        for result in results:
+            if result.succeeded:
+                self.submitted.add((result.namespace, result.name))
+        print(f"{_count(results)} AppWrappers submitted!")
+        return results
+
+    def remove(
+        self, wait: bool = False, timeout: Optional[int] = None
+    ) -> List[AWResult]:
+        """
+        Deletes every AppWrapper submitted by this manager.
+
+        Args:
+            wait (bool):
+                Whether to wait until the AppWrappers are gone from the API server. Defaults to False.
+            timeout (Optional[int]):
+                The maximum time to wait for the deletions in seconds. If None, waits indefinitely.
+
+        Returns:
+            List[AWResult]:
+                The outcome for each submitted AppWrapper, in load order.
+        """
+        config_check()
+        api_instance = client.CustomObjectsApi(get_api_client())
+
+        def remove_one(aw: dict):
+            try:
+                self._call(
+                    api_instance.delete_namespaced_custom_object,
+                    group="workload.codeflare.dev",
+                    version="v1beta2",
+                    namespace=aw["metadata"]["namespace"],
+                    plural="appwrappers",
+                    name=aw["metadata"]["name"],
+                )
+            except ApiException as e:
+                if e.status != 404:
+                    raise
+
+        appwrappers = [
+            (source, aw)
+            for source, aw in self.appwrappers
+            if (aw["metadata"]["namespace"], aw["metadata"]["name"]) in self.submitted
+        ]
+        results = self._run_for_each(appwrappers, remove_one)
+        if wait:
+            self._wait_for_deletion(api_instance, results, timeout)
+        for result in results:
+            if result.succeeded:
+                self.submitted.discard((result.namespace, result.name))
+        print(f"{_count(results)} AppWrappers removed!")
+        return results
+
+    def _call(self, func, **kwargs):
+        self._rate_limiter.acquire()
+        return func(**kwargs)
+
+    def _run_for_each(self, appwrappers: List[Tuple[str, dict]], operation):
+        def run(item: Tuple[str, dict]) -> AWResult:
+            source, aw = item
+            result = AWResult(
+                name=aw["metadata"]["name"],
+                namespace=aw["metadata"]["namespace"],
+                source=source,
+                succeeded=False,
+            )
+            try:
+                operation(aw)
+                result.succeeded = True
+            except Exception as e:
+                result.error = e
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(run, appwrappers))
+
+    def _wait_for_deletion(
+        self,
+        api_instance: client.CustomObjectsApi,
+        results: List[AWResult],
+        timeout: Optional[int],
+    ):
+        # Each round gets the pending AppWrappers by name, so that a round costs one request per
+        # remaining AppWrapper however many other AppWrappers the namespaces hold
+        start = monotonic()
+        delay = DELETION_INITIAL_BACKOFF_SECONDS
+        pending = [r for r in results if r.succeeded]
+
+        def exists(result: AWResult) -> bool:
+            try:
+                self._call(
+                    api_instance.get_namespaced_custom_object,
+                    group="workload.codeflare.dev",
+                    version="v1beta2",
+                    namespace=result.namespace,
+                    plural="appwrappers",
+                    name=result.name,
+                )
+            except Exception as e:
+                if not isinstance(e, ApiException) or e.status != 404:
+                    result.succeeded, result.error = False, e
+                return False
+            return True
+
+        while pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                still_there = list(pool.map(exists, pending))
+            pending = [r for r, there in zip(pending, still_there) if there]
+            if not pending:
+                return
+            elapsed = monotonic() - start
+            if timeout is not None and elapsed >= timeout:
+                for r in pending:
+                    r.succeeded = False
+                    r.error = TimeoutError(
+                        f"AppWrapper {r.namespace}/{r.name} still exists after {timeout}s"
+                    )
+                return
+            if timeout is not None:
+                delay = min(delay, timeout - elapsed)
+            sleep(delay)
+            delay = min(delay * 2, DELETION_MAX_BACKOFF_SECONDS)
+
+
+def _validate_appwrapper(aw, namespace: Optional[str]) -> Optional[str]:
+    # Returns why the document is not a valid AppWrapper, or None if it is
+    if not isinstance(aw, dict) or aw.get("kind") != "AppWrapper":
+        return "not an AppWrapper"
+    metadata = aw.get("metadata")
+    if not isinstance(metadata, dict) or not metadata.get("name"):
+        return "metadata.name is missing"
+    if not metadata.get("namespace"):
+        if namespace is None:
+            return "metadata.namespace is missing"
+        metadata["namespace"] = namespace
+    return None
+
+
+def _count(results: List[AWResult]) -> str:
+    return f"{sum(r.succeeded for r in results)}/{len(results)}"
@@ -15,7 +15,10 @@ from codeflare_sdk.common.utils.unit_test_support import (
     arg_check_aw_apply_effect,
     arg_check_aw_del_effect,
 )
-from codeflare_sdk.ray.appwrapper import AWManager
+from codeflare_sdk.ray.appwrapper import AWManager, BulkAWManager
+from codeflare_sdk.common.utils.yaml_io import write_yaml
+from kubernetes.client.rest import ApiException
+import pytest
 from codeflare_sdk.ray.cluster import Cluster, ClusterConfiguration
 import os
 from pathlib import Path
@@ -83,6 +86,107 @@ def test_AWManager_submit_remove(mocker, capsys):
     assert testaw.submitted == False
 
 
+def aw_doc(name, namespace="ns"):
+    metadata = {"name": name}
+    if namespace:
+        metadata["namespace"] = namespace
+    return {
+        "apiVersion": "workload.codeflare.dev/v1beta2",
+        "kind": "AppWrapper",
+        "metadata": metadata,
+    }
+
+
+def create_bulk_dir(tmp_path):
+    write_yaml(str(tmp_path / "a.yaml"), aw_doc("aw-a"))
+    write_yaml(str(tmp_path / "b.yml"), [aw_doc("aw-b"), aw_doc("aw-c", None)])
+    (tmp_path / "notes.txt").write_text("not yaml")
+    return str(tmp_path)
+
+
+def test_BulkAWManager_load(tmp_path):
+    manager = BulkAWManager(create_bulk_dir(tmp_path), namespace="default")
+    assert [
+        (s.rsplit("/", 1)[1], aw["metadata"]["namespace"])
+        for s, aw in manager.appwrappers
+    ] == [
+        ("a.yaml", "ns"),
+        ("b.yml#0", "ns"),
+        ("b.yml#1", "default"),
+    ]
+
+    with pytest.raises(FileNotFoundError):
+        BulkAWManager(str(tmp_path / "missing"))
+    # Every invalid document is reported before anything is submitted
+    write_yaml(str(tmp_path / "c.yaml"), [aw_doc("aw-a"), {"kind": "RayCluster"}])
+    with pytest.raises(ValueError) as e:
+        BulkAWManager(str(tmp_path))
+    assert "b.yml#1: metadata.namespace is missing" in str(e.value)
+    assert "c.yaml#0: duplicate AppWrapper ns/aw-a" in str(e.value)
+    assert "c.yaml#1: not an AppWrapper" in str(e.value)
+
+
+def test_BulkAWManager_submit_remove(mocker, tmp_path):
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mocker.patch("codeflare_sdk.ray.appwrapper.awload.sleep")
+    create = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.create_namespaced_custom_object",
+        side_effect=[
+            None,
+            ApiException(status=409, reason="Conflict"),
+            None,
+        ],
+    )
+    manager = BulkAWManager(create_bulk_dir(tmp_path), namespace="ns", max_workers=1)
+
+    results = manager.submit()
+    assert create.call_count == 3
+    assert [(r.name, r.succeeded) for r in results] == [
+        ("aw-a", True),
+        ("aw-b", False),
+        ("aw-c", True),
+    ]
+    assert results[1].error.status == 409
+    assert manager.submitted == {("ns", "aw-a"), ("ns", "aw-c")}
+
+    delete = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.delete_namespaced_custom_object",
+        side_effect=[None, ApiException(status=404, reason="Not Found")],
+    )
+    get_aw = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.get_namespaced_custom_object",
+        side_effect=[
+            {"metadata": {"name": "aw-a"}},
+            ApiException(status=404, reason="Not Found"),
+            ApiException(status=404, reason="Not Found"),
+        ],
+    )
+    results = manager.remove(wait=True)
+    assert delete.call_count == 2
+    # Only the AppWrappers that are still being deleted are fetched again
+    assert [c.kwargs["name"] for c in get_aw.call_args_list] == ["aw-a", "aw-c", "aw-a"]
+    assert [(r.name, r.succeeded) for r in results] == [("aw-a", True), ("aw-c", True)]
+    assert manager.submitted == set()
+
+
+def test_BulkAWManager_remove_wait_timeout(mocker, tmp_path):
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mocker.patch("codeflare_sdk.ray.appwrapper.awload.sleep")
+    mocker.patch("kubernetes.client.CustomObjectsApi.create_namespaced_custom_object")
+    mocker.patch("kubernetes.client.CustomObjectsApi.delete_namespaced_custom_object")
+    mocker.patch(
+        "kubernetes.client.CustomObjectsApi.get_namespaced_custom_object",
+        return_value={"metadata": {"name": "aw-a"}},
+    )
+    write_yaml(str(tmp_path / "a.yaml"), aw_doc("aw-a"))
+    manager = BulkAWManager(str(tmp_path / "a.yaml"), qps=1000)
+    manager.submit()
+    (result,) = manager.remove(wait=True, timeout=0)
+    assert not result.succeeded
+    assert isinstance(result.error, TimeoutError)
+    assert manager.submitted == {("ns", "aw-a")}
+
+
 # Make sure to always keep this function last
 def test_cleanup():
     os.remove(f"{aw_dir}test.yaml")
@@ -20,6 +20,7 @@ from codeflare_sdk.ray.cluster.cluster import (
 from codeflare_sdk.ray.appwrapper import AppWrapper, AppWrapperStatus
 from codeflare_sdk.ray.cluster.status import CodeFlareClusterStatus
 from codeflare_sdk.common.utils.unit_test_support import get_local_queue
+from kubernetes.client.rest import ApiException
 import os
 
 aw_dir = os.path.expanduser("~/.codeflare/resources/")
@@ -81,23 +82,31 @@ def test_cluster_status(mocker):
     assert ready == False
 
 
-def aw_status_fields(group, version, namespace, plural, *args):
+def aw_status_fields(group, version, namespace, plural, name, *args):
     assert group == "workload.codeflare.dev"
     assert version == "v1beta2"
     assert namespace == "test-ns"
     assert plural == "appwrappers"
     assert args == tuple()
-    return {"items": []}
+    if name == "test-aw":
+        raise ApiException(status=404, reason="Not Found")
+    return {"metadata": {"name": name}, "status": {"phase": "Running"}}
 
 
 def test_aw_status(mocker):
     mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
     mocker.patch(
-        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
+        "kubernetes.client.CustomObjectsApi.get_namespaced_custom_object",
         side_effect=aw_status_fields,
     )
+    list_aws = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object"
+    )
     aw = _app_wrapper_status("test-aw", "test-ns")
     assert aw == None
+    aw = _app_wrapper_status("running-aw", "test-ns")
+    assert aw == AppWrapper("running-aw", AppWrapperStatus.RUNNING)
+    list_aws.assert_not_called()
 
 
 # Make sure to always keep this function last
@@ -1 +1,9 @@
 from .ray_jobs import RayJobClient
+
+from .async_ray_jobs import AsyncRayJobClient, JobResult, LogLine
+
+from .job_watcher import JobWatcher
+
+from .log_spool import configure_log_spool, clear_log_spool
+
+from .package_cache import upload_runtime_env_packages, clear_package_cache
@@ -0,0 +1,526 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The async_ray_jobs sub-module contains the definition of the AsyncRayJobClient object, an
+asyncio counterpart of the RayJobClient that talks to the Ray dashboard's job REST API over
+a single keep-alive aiohttp session, so that many jobs can be submitted, checked and
+followed concurrently.
+"""
+
+import asyncio
+import os
+import ssl
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+import aiohttp
+from ray.dashboard.modules.job.pydantic_models import JobDetails
+from ray.job_submission import JobStatus, JobSubmissionClient
+from ray.runtime_env import RuntimeEnv
+
+from .package_cache import upload_runtime_env_packages
+
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_MAX_QUEUED_LINES = 1000
+DEFAULT_MAX_RECONNECTS = 5
+DEFAULT_LOG_HEARTBEAT_SECONDS = 30
+DEFAULT_LOG_RECEIVE_TIMEOUT_SECONDS = 120
+
+
+@dataclass
+class JobResult:
+    """
+    For storing the outcome of a bulk operation on a single job.
+    """
+
+    job_id: Optional[str]
+    succeeded: bool
+    value: Any = None
+    error: Optional[Exception] = None
+
+
+@dataclass
+class LogLine:
+    """
+    For storing a line of a job's logs, as streamed by `tail_jobs_logs()`.
+
+    `offset` is the number of bytes of the job's logs up to the end of this line. Passing it
+    back to `tail_jobs_logs()` resumes the job's logs after this line.
+    """
+
+    job_id: str
+    line: str
+    offset: int
+
+
+class AsyncRayJobClient:
+    """
+    An asyncio client for the Ray dashboard's job submission API, used for submitting,
+    checking and stopping many jobs concurrently from an event loop.
+
+    All requests from an event loop share one aiohttp session, opened on first use, whose
+    connections are kept alive between requests. A new session is opened when the client is
+    used from another event loop, e.g. by a later `asyncio.run()`. Close it with
+    `await client.close()` or by using the client as an async context manager.
+
+    Args:
+        address (str):
+            The HTTP address of the dashboard server on the head node, e.g. `Cluster.cluster_dashboard_uri()`.
+        cookies (Optional[Dict[str, Any]]):
+            HTTP cookies to send with requests to the job server.
+        metadata (Optional[Dict[str, Any]]):
+            Global metadata to store with all jobs, merged with job-specific
+            metadata during job submission.
+        headers (Optional[Dict[str, Any]]):
+            HTTP headers to send with requests to the job server, can be used for
+            authentication.
+        verify (Optional[Union[str, bool]]):
+            If True, verifies the server's TLS certificate. Can also be the path of a file or
+            a directory of trusted certificates. Default is True.
+        max_concurrency (int):
+            The maximum number of requests in flight at once. Defaults to 32.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        cookies: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, Any]] = None,
+        verify: Optional[Union[str, bool]] = True,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        self.address = address.rstrip("/")
+        self.cookies = cookies
+        self.metadata = metadata or {}
+        self.headers = headers
+        self.verify = verify
+        self.max_concurrency = max_concurrency
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # The event loop the session and semaphore belong to
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._upload_client: Optional[JobSubmissionClient] = None
+
+    async def __aenter__(self) -> "AsyncRayJobClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the HTTP session and its connections.
+        """
+        if self._session is not None and self._loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        self._semaphore = None
+        self._loop = None
+
+    async def submit_job(
+        self,
+        entrypoint: str,
+        runtime_env: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        submission_id: Optional[str] = None,
+        entrypoint_num_cpus: Optional[Union[int, float]] = None,
+        entrypoint_num_gpus: Optional[Union[int, float]] = None,
+        entrypoint_memory: Optional[int] = None,
+        entrypoint_resources: Optional[Dict[str, float]] = None,
+    ) -> str:
+        """
+        Submits a job to the Ray cluster with specified resources and returns the job ID.
+
+        Local `working_dir` and `py_modules` entries of the runtime environment are uploaded
+        to the cluster first, and cached, as with the RayJobClient.
+
+        Args:
+            entrypoint (str):
+                The command to execute for this job.
+            runtime_env (Optional[Dict[str, Any]]):
+                The runtime environment for this job.
+            metadata (Optional[Dict[str, str]]):
+                Metadata associated with the job, merged with global metadata.
+            submission_id (Optional[str]):
+                Unique ID for the job submission.
+            entrypoint_num_cpus (Optional[Union[int, float]]):
+                The quantity of CPU cores to reserve for the execution of the entrypoint command.
+            entrypoint_num_gpus (Optional[Union[int, float]]):
+                The quantity of GPUs to reserve for the execution of the entrypoint command.
+            entrypoint_memory (Optional[int]):
+                The quantity of memory to reserve for the execution of the entrypoint command.
+            entrypoint_resources (Optional[Dict[str, float]]):
+                The quantity of custom resources to reserve for the execution of the entrypoint command.
+
+        Returns:
+            str:
+                The unique identifier for the submitted job.
+        """
+        runtime_env = dict(runtime_env or {})
+        if "working_dir" in runtime_env or "py_modules" in runtime_env:
+            runtime_env = await asyncio.get_running_loop().run_in_executor(
+                None, self._upload_packages, runtime_env
+            )
+        # Parses local pip/conda requirements files, like the RayJobClient does
+        runtime_env = RuntimeEnv(**runtime_env).to_dict()
+
+        body = {
+            "entrypoint": entrypoint,
+            "submission_id": submission_id,
+            "runtime_env": runtime_env,
+            "metadata": {**(metadata or {}), **self.metadata},
+            "entrypoint_num_cpus": entrypoint_num_cpus,
+            "entrypoint_num_gpus": entrypoint_num_gpus,
+            "entrypoint_memory": entrypoint_memory,
+            "entrypoint_resources": entrypoint_resources,
+        }
+        # Optional fields are left out so that older Ray clusters accept the request
+        body = {key: value for key, value in body.items() if value is not None}
+        response = await self._request("POST", "/api/jobs/", json=body)
+        return response["submission_id"]
+
+    async def get_job_info(self, job_id: str) -> JobDetails:
+        """
+        Fetches information about a job by job ID.
+
+        Args:
+            job_id (str):
+                The unique identifier of the job.
+
+        Returns:
+            JobDetails:
+                Information about the job's status, progress, and other details.
+        """
+        return JobDetails(**await self._request("GET", f"/api/jobs/{job_id}"))
+
+    async def get_job_status(self, job_id: str) -> JobStatus:
+        """
+        Fetches the current status of a job by job ID.
+
+        Args:
+            job_id (str):
+                The unique identifier of the job.
+
+        Returns:
+            JobStatus:
+                The job's status.
+        """
+        return (await self.get_job_info(job_id)).status
+
+    async def get_job_logs(self, job_id: str) -> str:
+        """
+        Retrieves the logs for a specific job by job ID.
+
+        Args:
+            job_id (str):
+                The unique identifier of the job.
+
+        Returns:
+            str:
+                Logs output from the job.
+        """
+        return (await self._request("GET", f"/api/jobs/{job_id}/logs"))["logs"]
+
+    async def list_jobs(self) -> List[JobDetails]:
+        """
+        Lists all current jobs in the Ray cluster.
+
+        Returns:
+            List[JobDetails]:
+                A list of job details for each current job in the cluster.
+        """
+        return [JobDetails(**job) for job in await self._request("GET", "/api/jobs/")]
+
+    async def stop_job(self, job_id: str) -> Tuple[bool, str]:
+        """
+        Stops a running job by job ID.
+
+        Args:
+            job_id (str):
+                The unique identifier of the job to stop.
+
+        Returns:
+            tuple(bool, str):
+                A tuple with the stop status and a message.
+        """
+        response = await self._request("POST", f"/api/jobs/{job_id}/stop")
+        if response["stopped"]:
+            return True, f"Successfully stopped Job {job_id}"
+        return False, f"Failed to stop Job, {job_id} could have already completed."
+
+    async def delete_job(self, job_id: str) -> Tuple[bool, str]:
+        """
+        Deletes a job by job ID.
+
+        Args:
+            job_id (str):
+                The unique identifier of the job to delete.
+
+        Returns:
+            tuple(bool, str):
+                A tuple with deletion status and a message.
+        """
+        response = await self._request("DELETE", f"/api/jobs/{job_id}")
+        if response["deleted"]:
+            return True, f"Successfully deleted Job {job_id}"
+        return False, f"Failed to delete Job {job_id}"
+
+    async def submit_jobs(self, batch: List[Dict[str, Any]]) -> List[JobResult]:
+        """
+        Submits many jobs concurrently, at most `max_concurrency` at a time.
+
+        Args:
+            batch (List[Dict[str, Any]]):
+                The keyword arguments of `submit_job()` for each job.
+
+        Returns:
+            List[JobResult]:
+                The outcome for each job, in batch order. `job_id` is the submission ID of
+                submitted jobs, and the requested one (if any) of jobs that failed.
+        """
+
+        async def submit(job: Dict[str, Any]) -> JobResult:
+            try:
+                return JobResult(job_id=await self.submit_job(**job), succeeded=True)
+            except Exception as e:
+                return JobResult(
+                    job_id=job.get("submission_id"), succeeded=False, error=e
+                )
+
+        return await asyncio.gather(*(submit(job) for job in batch))
+
+    async def get_job_statuses(self, job_ids: List[str]) -> List[JobResult]:
+        """
+        Fetches the status of many jobs concurrently, at most `max_concurrency` at a time.
+
+        Args:
+            job_ids (List[str]):
+                The unique identifiers of the jobs.
+
+        Returns:
+            List[JobResult]:
+                The outcome for each job, in the order of `job_ids`, with the JobStatus as `value`.
+        """
+
+        async def get_status(job_id: str) -> JobResult:
+            try:
+                status = await self.get_job_status(job_id)
+                return JobResult(job_id=job_id, succeeded=True, value=status)
+            except Exception as e:
+                return JobResult(job_id=job_id, succeeded=False, error=e)
+
+        return await asyncio.gather(*(get_status(job_id) for job_id in job_ids))
+
+    async def tail_jobs_logs(
+        self,
+        job_ids: List[str],
+        offsets: Optional[Dict[str, int]] = None,
+        max_queued_lines: int = DEFAULT_MAX_QUEUED_LINES,
+        max_reconnects: int = DEFAULT_MAX_RECONNECTS,
+        heartbeat: Optional[float] = DEFAULT_LOG_HEARTBEAT_SECONDS,
+        receive_timeout: Optional[float] = DEFAULT_LOG_RECEIVE_TIMEOUT_SECONDS,
+    ) -> AsyncIterator[LogLine]:
+        """
+        Follows the logs of many jobs at once, each over its own websocket, until all of them
+        have finished.
+
+        Lines are yielded as they arrive, tagged with their job. When the consumer falls
+        behind, at most `max_queued_lines` lines are buffered before reading from the
+        dashboard pauses. A dropped connection is opened again, and the lines of the job that
+        were already yielded are skipped.
+
+        Args:
+            job_ids (List[str]):
+                The unique identifiers of the jobs.
+            offsets (Optional[Dict[str, int]]):
+                The byte offset to resume each job's logs from, usually the `offset` of the
+                last LogLine received for it. Jobs that aren't in it start from the beginning.
+            max_queued_lines (int):
+                The maximum number of lines buffered for the consumer. Defaults to 1000.
+            max_reconnects (int):
+                The maximum number of consecutive times a job's connection can't be opened
+                again after failing. Defaults to 5.
+            heartbeat (Optional[float]):
+                How often each connection is pinged, in seconds. A connection whose ping isn't
+                answered is opened again. Defaults to 30.
+            receive_timeout (Optional[float]):
+                How long a connection may go without receiving anything, pongs included, before
+                it is opened again, in seconds. Defaults to 120.
+
+        Returns:
+            AsyncIterator[LogLine]:
+                The complete lines of every job, in the order they arrive. The last line of a
+                job is yielded when the job finishes, whether or not it ends with a newline.
+
+        Raises:
+            RuntimeError:
+                If a job's logs can't be followed, e.g. because the job doesn't exist.
+        """
+        offsets = offsets or {}
+        queue: asyncio.Queue = asyncio.Queue(max_queued_lines)
+        # Log websockets stay open for the lifetime of their job, so they get their own
+        # connection pool instead of holding up the requests of other calls
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=0, ssl=_ssl_context(self.verify)),
+            cookies=self.cookies,
+            headers=self.headers,
+        )
+
+        async def follow(job_id: str):
+            try:
+                await self._follow_job_logs(
+                    session,
+                    job_id,
+                    offsets.get(job_id, 0),
+                    queue,
+                    max_reconnects,
+                    heartbeat,
+                    receive_timeout,
+                )
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(None)
+
+        tasks = [asyncio.create_task(follow(job_id)) for job_id in job_ids]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await queue.get()
+                if item is None:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await session.close()
+
+    async def _follow_job_logs(
+        self,
+        session: aiohttp.ClientSession,
+        job_id: str,
+        offset: int,
+        queue: asyncio.Queue,
+        max_reconnects: int,
+        heartbeat: Optional[float],
+        receive_timeout: Optional[float],
+    ):
+        url = f"{self.address}/api/jobs/{job_id}/logs/tail"
+        if hasattr(aiohttp, "ClientWSTimeout"):
+            timeout = {"timeout": aiohttp.ClientWSTimeout(ws_receive=receive_timeout)}
+        else:  # pragma: no cover
+            # aiohttp before 3.11
+            timeout = {"receive_timeout": receive_timeout}
+        failures = 0
+        while True:
+            # The dashboard always streams a job's logs from the start
+            position = 0
+            partial = ""
+            try:
+                async with session.ws_connect(
+                    url, heartbeat=heartbeat, **timeout
+                ) as ws:
+                    # Only failures in a row count, not those of earlier connections
+                    failures = 0
+                    async for message in ws:
+                        if message.type != aiohttp.WSMsgType.TEXT:
+                            continue
+                        chunk = message.data.encode()
+                        start = position
+                        position += len(chunk)
+                        if position <= offset:
+                            continue
+                        if start < offset:
+                            chunk = chunk[offset - start :]
+                        lines = (partial + chunk.decode()).split("\n")
+                        partial = lines.pop()
+                        # The offset only moves past complete lines, so that a line cut
+                        # off by a dropped connection is received again in full
+                        for line in lines:
+                            offset += len(line.encode()) + 1
+                            await queue.put(LogLine(job_id, line, offset))
+                    if ws.close_code == aiohttp.WSCloseCode.OK:
+                        if partial:
+                            offset += len(partial.encode())
+                            await queue.put(LogLine(job_id, partial, offset))
+                        return
+            except aiohttp.WSServerHandshakeError as e:
+                raise RuntimeError(
+                    f"Failed to follow the logs of Job {job_id}, status code {e.status}."
+                ) from e
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            failures += 1
+            if failures > max_reconnects:
+                raise RuntimeError(
+                    f"Lost the connection to the logs of Job {job_id} after {failures} attempts."
+                )
+            await asyncio.sleep(min(2**failures * 0.1, 5))
+
+    async def _request(self, method: str, endpoint: str, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # Sessions and semaphores can only be used from the event loop they were
+            # created in. The session of a previous loop is dropped with that loop
+            self._loop = loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_concurrency, ssl=_ssl_context(self.verify)
+                ),
+                cookies=self.cookies,
+                headers=self.headers,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            async with self._session.request(
+                method, self.address + endpoint, **kwargs
+            ) as response:
+                if response.status != 200:
+                    raise RuntimeError(
+                        f"Request failed with status code {response.status}: {await response.text()}."
+                    )
+                return await response.json()
+
+    def _upload_packages(self, runtime_env: Dict[str, Any]) -> Dict[str, Any]:
+        # Packaging and uploading is left to Ray's synchronous client, run off the event loop
+        if self._upload_client is None:
+            self._upload_client = JobSubmissionClient(
+                address=self.address,
+                cookies=self.cookies,
+                headers=self.headers,
+                verify=self.verify,
+            )
+        runtime_env = upload_runtime_env_packages(self._upload_client, runtime_env)
+        self._upload_client._upload_working_dir_if_needed(runtime_env)
+        self._upload_client._upload_py_modules_if_needed(runtime_env)
+        return runtime_env
+
+
+def _ssl_context(verify: Optional[Union[str, bool]]):
+    # Mirrors how Ray's JobSubmissionClient reads `verify`
+    if verify is False:
+        return False
+    if isinstance(verify, str):
+        if os.path.isdir(verify):
+            return ssl.create_default_context(capath=verify)
+        if os.path.isfile(verify):
+            return ssl.create_default_context(cafile=verify)
+        raise FileNotFoundError(f"Path to CA certificates: '{verify}', does not exist.")
+    return None
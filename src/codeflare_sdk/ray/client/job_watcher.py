@@ -0,0 +1,254 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The job_watcher sub-module contains the definition of the JobWatcher object, which follows the
+status of many Ray jobs from a single background polling loop, making one `list_jobs` request
+per poll however many jobs are watched.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from time import monotonic
+from typing import Callable, Dict, List, Optional
+
+from ray.dashboard.modules.job.pydantic_models import JobDetails
+from ray.job_submission import JobStatus
+
+DEFAULT_POLL_INTERVAL_SECONDS = 1
+DEFAULT_MAX_POLL_INTERVAL_SECONDS = 30
+DEFAULT_MAX_CONSECUTIVE_ERRORS = 5
+DEFAULT_MISSING_JOB_GRACE_PERIOD_SECONDS = 60
+
+
+class JobWatcher:
+    """
+    Watches the status of a set of jobs, calling callbacks on each status change and resolving
+    a future per job once it has finished.
+
+    Jobs are polled together with a single `list_jobs()` call. The poll interval starts at
+    `poll_interval` and doubles up to `max_poll_interval` while no watched job changes status,
+    and falls back to `poll_interval` on every change. Nothing is polled while no job is
+    watched. Callbacks are called from the watcher's daemon thread.
+
+    Args:
+        client:
+            A client with a `list_jobs()` method returning JobDetails, e.g. a RayJobClient or
+            `Cluster.job_client`.
+        poll_interval (float):
+            The shortest time between two polls, in seconds. Defaults to 1.
+        max_poll_interval (float):
+            The longest time between two polls, in seconds. Defaults to 30.
+        max_consecutive_errors (int):
+            The number of failed polls in a row after which the futures of all watched jobs
+            fail with the last error. Defaults to 5.
+        missing_job_grace_period (float):
+            How long a watched job may go without being listed, e.g. because it is still being
+            submitted, before its future fails, in seconds. Defaults to 60.
+    """
+
+    def __init__(
+        self,
+        client,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL_SECONDS,
+        max_consecutive_errors: int = DEFAULT_MAX_CONSECUTIVE_ERRORS,
+        missing_job_grace_period: float = DEFAULT_MISSING_JOB_GRACE_PERIOD_SECONDS,
+    ):
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.max_consecutive_errors = max_consecutive_errors
+        self.missing_job_grace_period = missing_job_grace_period
+        self.error: Optional[Exception] = None
+        self._client = client
+        # job ID -> (last status seen, or None before the job is first listed, future,
+        # time the job was watched)
+        self._jobs: Dict[str, List] = {}
+        self._callbacks: List[Callable] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __enter__(self) -> "JobWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """
+        Starts polling in a daemon thread. Does nothing if the watcher is already running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="codeflare-sdk-job-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread. The futures of the watched jobs are left pending.
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def on_transition(
+        self, callback: Callable[[str, Optional[JobStatus], JobDetails], None]
+    ):
+        """
+        Registers a function called with `(job_id, previous_status, details)` whenever a
+        watched job changes status. `previous_status` is None when the job is first seen.
+        Exceptions raised by callbacks are stored in `error` and otherwise ignored.
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def watch(self, job_id: str) -> Future:
+        """
+        Adds a job to the watched jobs, by submission or job ID.
+
+        Args:
+            job_id (str):
+                The unique identifier of the job.
+
+        Returns:
+            Future:
+                Resolved with the job's JobDetails once the job has finished, or failed if the
+                job disappears, is not listed within the grace period, or the job server
+                can't be reached. Watching a job twice returns the same future.
+        """
+        with self._lock:
+            if job_id not in self._jobs:
+                self._jobs[job_id] = [None, Future(), monotonic()]
+            future = self._jobs[job_id][1]
+        # Poll right away, instead of waiting out an idle backoff
+        self._wakeup.set()
+        return future
+
+    def unwatch(self, job_id: str):
+        """
+        Removes a job from the watched jobs, cancelling its future.
+        """
+        with self._lock:
+            watched = self._jobs.pop(job_id, None)
+        if watched is not None:
+            watched[1].cancel()
+
+    async def wait(self, job_id: str) -> JobDetails:
+        """
+        Watches a job and waits, without blocking the event loop, until it has finished.
+
+        Args:
+            job_id (str):
+                The unique identifier of the job.
+
+        Returns:
+            JobDetails:
+                The details of the finished job.
+        """
+        return await asyncio.wrap_future(self.watch(job_id))
+
+    def _run(self):
+        interval = self.poll_interval
+        errors = 0
+        while not self._stopped.is_set():
+            with self._lock:
+                watching = bool(self._jobs)
+            if not watching:
+                # Idle until a job is watched
+                self._wakeup.wait()
+                self._wakeup.clear()
+                interval = self.poll_interval
+                continue
+
+            try:
+                changed = self._poll()
+                errors = 0
+            except Exception as e:
+                self.error = e
+                errors += 1
+                changed = False
+                if errors >= self.max_consecutive_errors:
+                    self._fail_all(e)
+                    errors = 0
+            if changed:
+                interval = self.poll_interval
+            if self._wakeup.wait(interval):
+                # A job was just watched
+                self._wakeup.clear()
+                interval = self.poll_interval
+            elif not changed:
+                interval = min(interval * 2, self.max_poll_interval)
+
+    def _poll(self) -> bool:
+        jobs = {}
+        for details in self._client.list_jobs():
+            # Jobs may be watched by submission ID or by job ID
+            for key in (details.submission_id, details.job_id):
+                if key is not None:
+                    jobs[key] = details
+
+        transitions = []
+        now = monotonic()
+        with self._lock:
+            for job_id, watched in list(self._jobs.items()):
+                previous, future, watched_at = watched
+                details = jobs.get(job_id)
+                if details is None:
+                    # Jobs that were never listed may not have been submitted yet
+                    if previous is not None:
+                        error = RuntimeError(f"Job {job_id} no longer exists.")
+                    elif now - watched_at > self.missing_job_grace_period:
+                        error = RuntimeError(
+                            f"Job {job_id} was not found within "
+                            f"{self.missing_job_grace_period}s."
+                        )
+                    else:
+                        continue
+                    del self._jobs[job_id]
+                    if not future.done():
+                        future.set_exception(error)
+                    continue
+                if details.status != previous:
+                    watched[0] = details.status
+                    transitions.append((job_id, previous, details, future))
+                if details.status.is_terminal():
+                    del self._jobs[job_id]
+            callbacks = list(self._callbacks)
+
+        for job_id, previous, details, future in transitions:
+            for callback in callbacks:
+                try:
+                    callback(job_id, previous, details)
+                except Exception as e:
+                    self.error = e
+            # Futures are resolved after the callbacks, which see every transition first
+            if details.status.is_terminal() and not future.done():
+                future.set_result(details)
+        return bool(transitions)
+
+    def _fail_all(self, error: Exception):
+        with self._lock:
+            watched, self._jobs = self._jobs, {}
+        for _, future, _ in watched.values():
+            if not future.done():
+                future.set_exception(error)
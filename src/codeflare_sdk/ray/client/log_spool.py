@@ -0,0 +1,204 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The log_spool sub-module keeps a copy of each job's logs on disk, so that job logs can be read
+incrementally from a byte cursor, and the logs of finished jobs are only downloaded once.
+"""
+
+import contextlib
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+from ray.job_submission import JobSubmissionClient
+
+DEFAULT_SPOOL_DIRECTORY = os.path.expanduser("~/.codeflare/logs/")
+# Written in each per-cluster directory of the spool, which are the only ones ever cleared
+SPOOL_MARKER_FILE = ".codeflare-log-spool"
+
+_JOB_ID_PATTERN = re.compile(r"^[A-Za-z0-9_\-][A-Za-z0-9_.\-]*$")
+
+_lock = threading.Lock()
+_directory = DEFAULT_SPOOL_DIRECTORY
+_compress = False
+# One lock per spooled job, so concurrent reads of a job download its logs once
+_job_locks: Dict[str, threading.Lock] = {}
+# spool file -> number of uncompressed bytes in it
+_sizes: Dict[str, int] = {}
+# client -> job ID -> (spool file, compressed) of the client's finished jobs, which are
+# read from the spool without any request
+_finished_jobs = weakref.WeakKeyDictionary()
+
+
+def configure_log_spool(
+    directory: Optional[str] = None,
+    compress: bool = False,
+):
+    """
+    Configures where and how the logs read with a cursor are spooled.
+
+    Args:
+        directory (Optional[str]):
+            The directory of the spool. Defaults to `~/.codeflare/logs/`.
+        compress (bool):
+            If True, the spool files are gzip compressed. Defaults to False.
+    """
+    global _directory, _compress
+    with _lock:
+        _directory = directory or DEFAULT_SPOOL_DIRECTORY
+        _compress = compress
+
+
+def clear_log_spool():
+    """
+    Deletes every spooled log. Only the per-cluster directories created by the spool are
+    deleted, anything else in the spool directory is left alone.
+    """
+    with _lock:
+        if os.path.isdir(_directory):
+            for entry in os.scandir(_directory):
+                if entry.is_dir(follow_symlinks=False) and os.path.exists(
+                    os.path.join(entry.path, SPOOL_MARKER_FILE)
+                ):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+        _sizes.clear()
+        _finished_jobs.clear()
+
+
+def read_job_logs(
+    client: JobSubmissionClient, job_id: str, since: int = 0
+) -> Tuple[str, int]:
+    """
+    Reads the logs of a job from a byte cursor onwards.
+
+    The logs are appended to the job's spool file as they are read. Once the job has finished,
+    its logs are read from the spool instead of being downloaded again, and later reads with
+    the same client make no request at all. Spool files are keyed by the job's start time as
+    well as its ID, so that a job of a re-created cluster with the same address and job ID is
+    not mistaken for a spooled one.
+
+    Args:
+        client (JobSubmissionClient):
+            The Ray client of the job's cluster.
+        job_id (str):
+            The unique identifier of the job.
+        since (int):
+            The cursor returned by the previous read, or 0 to read from the beginning.
+
+    Returns:
+        Tuple[str, int]:
+            The logs written since the cursor, and the cursor to pass to the next read.
+
+    Raises:
+        ValueError:
+            If the job ID can't be used as a file name.
+    """
+    if not _JOB_ID_PATTERN.match(job_id):
+        raise ValueError(f"Job ID {job_id!r} can't be spooled.")
+    with _lock:
+        finished_job = _finished_jobs.get(client, {}).get(job_id)
+    if finished_job is not None and os.path.exists(finished_job[0] + ".done"):
+        return _read_spool(*finished_job, since)
+
+    # The status is read first, so that the logs of a finished job are complete
+    info = client.get_job_info(job_id)
+    with _lock:
+        directory, compress = _directory, _compress
+    cluster_directory = os.path.join(
+        directory, hashlib.sha1(client.get_address().encode()).hexdigest()[:16]
+    )
+    path = os.path.join(
+        cluster_directory,
+        f"{job_id}-{info.start_time or 0}" + (".log.gz" if compress else ".log"),
+    )
+    with _lock:
+        job_lock = _job_locks.setdefault(path, threading.Lock())
+
+    with job_lock:
+        if not os.path.exists(path + ".done"):
+            finished = info.status.is_terminal()
+            logs = client.get_job_logs(job_id).encode()
+            if not os.path.isdir(cluster_directory):
+                os.makedirs(cluster_directory, exist_ok=True)
+                open(os.path.join(cluster_directory, SPOOL_MARKER_FILE), "w").close()
+            _append(path, logs, compress)
+            if finished:
+                open(path + ".done", "w").close()
+                _remember_finished(client, job_id, path, compress)
+            return logs[since:].decode(), len(logs)
+
+    _remember_finished(client, job_id, path, compress)
+    return _read_spool(path, compress, since)
+
+
+def _remember_finished(
+    client: JobSubmissionClient, job_id: str, path: str, compress: bool
+):
+    with _lock:
+        try:
+            _finished_jobs.setdefault(client, {})[job_id] = (path, compress)
+        except TypeError:  # pragma: no cover
+            # Clients that can't be weakly referenced are asked for the job every time
+            pass
+
+
+def _read_spool(path: str, compress: bool, since: int) -> Tuple[str, int]:
+    with _open(path, compress, "rb") as spool:
+        spool.seek(since)
+        logs = spool.read()
+    return logs.decode(), since + len(logs)
+
+
+def _open(path: str, compress: bool, mode: str):
+    return gzip.open(path, mode) if compress else open(path, mode)
+
+
+def _append(path: str, logs: bytes, compress: bool):
+    # The dashboard always returns the whole log, so only its new end is written
+    size = _spool_size(path, compress)
+    if len(logs) < size:
+        # The log was rotated or replaced, so the spool starts over
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+        size = 0
+    if len(logs) > size or not os.path.exists(path):
+        # Each append to a gzip file adds a member, and members are read back as one stream
+        with _open(path, compress, "ab") as spool:
+            spool.write(logs[size:])
+    with _lock:
+        _sizes[path] = len(logs)
+
+
+def _spool_size(path: str, compress: bool) -> int:
+    if not os.path.exists(path):
+        # Never spooled, or deleted since
+        return 0
+    with _lock:
+        size = _sizes.get(path)
+    if size is not None:
+        return size
+    if not compress:
+        return os.path.getsize(path)
+    # Spooled by an earlier session, the size of a gzip file is only known by reading it
+    size = 0
+    with gzip.open(path, "rb") as spool:
+        for chunk in iter(lambda: spool.read(1 << 20), b""):
+            size += len(chunk)
+    return size
@@ -0,0 +1,210 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The package_cache sub-module keeps the working_dir and py_modules packages of runtime
+environments for the rest of the session, so that directories which did not change are
+neither hashed, zipped nor uploaded again when jobs are submitted to one or more Ray clusters.
+"""
+
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
+
+from ray._private.runtime_env.packaging import (
+    _dir_travel,
+    _get_excludes,
+    create_package,
+    get_uri_for_directory,
+)
+from ray.dashboard.modules.job.common import uri_to_http_components
+from ray.job_submission import JobSubmissionClient
+
+# How long a cluster's answer that it has a package is trusted. Clusters delete packages once
+# no job uses them, and a recreated cluster can have the same address, so it is kept short
+PACKAGE_EXISTS_TTL_SECONDS = 10
+
+_lock = threading.Lock()
+# One lock per directory, so concurrent submissions of the same directory package it once
+_directory_locks: Dict[tuple, threading.Lock] = {}
+# (directory, excludes) -> (fingerprint of the tree, package URI)
+_uris: Dict[tuple, Tuple[str, str]] = {}
+# (package URI, include_parent_dir) -> zip file
+_packages: Dict[tuple, str] = {}
+# (dashboard address, package URI) -> when the cluster was last known to have the package
+_uploaded: Dict[Tuple[str, str], float] = {}
+_package_dir: Optional[str] = None
+
+
+def upload_runtime_env_packages(
+    client: JobSubmissionClient, runtime_env: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Replaces the local directories of a runtime environment's `working_dir` and `py_modules`
+    with the URIs of their packages, uploading the packages that the cluster doesn't have yet.
+
+    A directory is only hashed again once a file in it (outside of `excludes`) changes, and
+    each package is zipped once per session, however many jobs and clusters it is submitted
+    to. The cluster is asked whether it has the package before each submission, or at most
+    every `PACKAGE_EXISTS_TTL_SECONDS` when many jobs are submitted at once, and the package
+    is only uploaded when it doesn't.
+
+    Args:
+        client (JobSubmissionClient):
+            The Ray client of the cluster to upload to.
+        runtime_env (Optional[Dict[str, Any]]):
+            The runtime environment of a job.
+
+    Returns:
+        Optional[Dict[str, Any]]:
+            A copy of the runtime environment. Remote URIs, zip and wheel files and imported
+            modules are left as they are, for Ray to handle.
+    """
+    if not runtime_env:
+        return runtime_env
+    runtime_env = dict(runtime_env)
+    excludes = runtime_env.get("excludes")
+    if _is_directory(runtime_env.get("working_dir")):
+        runtime_env["working_dir"] = _upload_directory(
+            client, runtime_env["working_dir"], excludes, include_parent_dir=False
+        )
+    if isinstance(runtime_env.get("py_modules"), list):
+        runtime_env["py_modules"] = [
+            _upload_directory(client, module, excludes, include_parent_dir=True)
+            if _is_directory(module)
+            else module
+            for module in runtime_env["py_modules"]
+        ]
+    return runtime_env
+
+
+def clear_package_cache():
+    """
+    Forgets every hashed directory and uploaded package, and deletes the cached zip files.
+    """
+    global _package_dir
+    with _lock:
+        _uris.clear()
+        _packages.clear()
+        _uploaded.clear()
+        if _package_dir is not None:
+            shutil.rmtree(_package_dir, ignore_errors=True)
+        _package_dir = None
+
+
+def _is_directory(value: Any) -> bool:
+    return isinstance(value, (str, Path)) and os.path.isdir(value)
+
+
+def _upload_directory(
+    client: JobSubmissionClient,
+    directory: str,
+    excludes: Optional[List[str]],
+    include_parent_dir: bool,
+) -> str:
+    directory = os.path.abspath(directory)
+    key = (directory, tuple(excludes or ()))
+    with _lock:
+        directory_lock = _directory_locks.setdefault(key, threading.Lock())
+    with directory_lock:
+        uri = _package_uri(key, excludes)
+        uploaded_key = (client.get_address(), uri)
+        with _lock:
+            confirmed = _uploaded.get(uploaded_key)
+        recent = (
+            confirmed is not None
+            and monotonic() - confirmed < PACKAGE_EXISTS_TTL_SECONDS
+        )
+        if not recent and not client._package_exists(uri):
+            package = _package_file(key, uri, excludes, include_parent_dir)
+            # is_file makes Ray send the cached zip as is, and keep it afterwards
+            client._upload_package(uri, package, is_file=True)
+        with _lock:
+            _uploaded[uploaded_key] = monotonic()
+    return uri
+
+
+def _package_uri(key: tuple, excludes: Optional[List[str]]) -> str:
+    directory = key[0]
+    fingerprint = _fingerprint(directory, excludes)
+    with _lock:
+        cached = _uris.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    uri = get_uri_for_directory(directory, excludes=excludes)
+    with _lock:
+        _uris[key] = (fingerprint, uri)
+    return uri
+
+
+def _fingerprint(directory: str, excludes: Optional[List[str]]) -> str:
+    # Stats every file Ray would package, which is much cheaper than reading them
+    root = Path(directory)
+    entries = []
+
+    def handler(path: Path):
+        try:
+            stat = path.stat()
+        except OSError:
+            entries.append((str(path.relative_to(root)), None, None))
+        else:
+            entries.append(
+                (str(path.relative_to(root)), stat.st_mtime_ns, stat.st_size)
+            )
+
+    _dir_travel(root, [_get_excludes(root, excludes or [])], handler)
+    return hashlib.sha1(repr(sorted(entries)).encode()).hexdigest()
+
+
+def _package_file(
+    key: tuple, uri: str, excludes: Optional[List[str]], include_parent_dir: bool
+) -> str:
+    global _package_dir
+    with _lock:
+        package = _packages.get((uri, include_parent_dir))
+        if _package_dir is None:
+            _package_dir = tempfile.mkdtemp(prefix="codeflare-packages-")
+            atexit.register(shutil.rmtree, _package_dir, ignore_errors=True)
+        package_dir = _package_dir
+    if package is not None and os.path.exists(package):
+        return package
+
+    _, package_name = uri_to_http_components(uri)
+    if include_parent_dir:
+        package_name = "parent" + package_name
+    package = os.path.join(package_dir, package_name)
+    # Directories with the same content share a package, so it is zipped under a unique name
+    temp_path = f"{package}.{uuid.uuid4().hex}.tmp"
+    try:
+        create_package(
+            key[0],
+            Path(temp_path),
+            include_parent_dir=include_parent_dir,
+            excludes=excludes,
+        )
+        os.replace(temp_path, package)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    with _lock:
+        _packages[(uri, include_parent_dir)] = package
+    return package
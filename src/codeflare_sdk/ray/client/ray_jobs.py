@@ -19,7 +19,16 @@ The SDK acts as a wrapper for the Ray Job Submission Client.
 
 from ray.job_submission import JobSubmissionClient
 from ray.dashboard.modules.job.pydantic_models import JobDetails
-from typing import Iterator, Optional, Dict, Any, Union, List
+from typing import AsyncIterator, Iterator, Optional, Dict, Any, Union, List, Tuple
+
+from .async_ray_jobs import (
+    AsyncRayJobClient,
+    LogLine,
+    DEFAULT_MAX_QUEUED_LINES,
+    DEFAULT_MAX_RECONNECTS,
+)
+from .log_spool import read_job_logs
+from .package_cache import upload_runtime_env_packages
 
 
 class RayJobClient:
@@ -81,6 +90,9 @@ class RayJobClient:
         """
         Submits a job to the Ray cluster with specified resources and returns the job ID.
 
+        Local `working_dir` and `py_modules` directories are only packaged and uploaded
+        again once their content changes, see `upload_runtime_env_packages()`.
+
         Args:
             entrypoint (str):
                 The command to execute for this job.
@@ -112,7 +124,7 @@ class RayJobClient:
         return self.rayJobClient.submit_job(
             entrypoint=entrypoint,
             job_id=job_id,
-            runtime_env=runtime_env,
+            runtime_env=upload_runtime_env_packages(self.rayJobClient, runtime_env),
             metadata=metadata,
             submission_id=submission_id,
             entrypoint_num_cpus=entrypoint_num_cpus,
@@ -166,18 +178,26 @@ class RayJobClient:
         """
         return self.rayJobClient.get_job_info(job_id=job_id)
 
-    def get_job_logs(self, job_id: str) -> str:
+    def get_job_logs(
+        self, job_id: str, since: Optional[int] = None
+    ) -> Union[str, Tuple[str, int]]:
         """
         Retrieves the logs for a specific job by job ID.
 
         Args:
             job_id (str):
                 The unique identifier of the job.
+            since (Optional[int]):
+                A cursor returned by a previous call, or 0 for the first call. If set, only the
+                logs written since the cursor are returned, along with the next cursor, and the
+                logs are spooled on disk (see `configure_log_spool()`).
 
         Returns:
-            str:
-                Logs output from the job.
+            Union[str, Tuple[str, int]]:
+                Logs output from the job, or a tuple of the new logs and the next cursor if `since` is set.
         """
+        if since is not None:
+            return read_job_logs(self.rayJobClient, job_id, since)
         return self.rayJobClient.get_job_logs(job_id=job_id)
 
     def get_job_status(self, job_id: str) -> str:
@@ -236,3 +256,40 @@ class RayJobClient:
                 An iterator that yields log entries in real-time.
         """
         return self.rayJobClient.tail_job_logs(job_id=job_id)
+
+    def tail_jobs_logs(
+        self,
+        job_ids: List[str],
+        offsets: Optional[Dict[str, int]] = None,
+        max_queued_lines: int = DEFAULT_MAX_QUEUED_LINES,
+        max_reconnects: int = DEFAULT_MAX_RECONNECTS,
+    ) -> AsyncIterator[LogLine]:
+        """
+        Continuously streams the logs of many jobs at once, see `AsyncRayJobClient.tail_jobs_logs()`.
+
+        Args:
+            job_ids (List[str]):
+                The unique identifiers of the jobs.
+            offsets (Optional[Dict[str, int]]):
+                The byte offset to resume each job's logs from.
+            max_queued_lines (int):
+                The maximum number of lines buffered for the consumer. Defaults to 1000.
+            max_reconnects (int):
+                The maximum number of consecutive times a job's connection is opened again. Defaults to 5.
+
+        Returns:
+            AsyncIterator[LogLine]:
+                An async iterator that yields the log lines of every job, tagged with their job ID and offset.
+        """
+        client = AsyncRayJobClient(
+            self.rayJobClient.get_address(),
+            cookies=self.rayJobClient._cookies,
+            headers=self.rayJobClient._headers,
+            verify=self.rayJobClient._verify,
+        )
+        return client.tail_jobs_logs(
+            job_ids,
+            offsets=offsets,
+            max_queued_lines=max_queued_lines,
+            max_reconnects=max_reconnects,
+        )
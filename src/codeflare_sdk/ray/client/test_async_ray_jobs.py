@@ -0,0 +1,340 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from codeflare_sdk.ray.client.async_ray_jobs import (
+    AsyncRayJobClient,
+    LogLine,
+    _ssl_context,
+)
+from aiohttp import web
+import aiohttp
+from aiohttp.test_utils import TestServer
+from ray.job_submission import JobStatus, JobSubmissionClient
+import asyncio
+import pytest
+
+_real_sleep = asyncio.sleep
+
+
+async def fast_sleep(delay, *args, **kwargs):
+    await _real_sleep(0)
+
+
+def fake_dashboard():
+    # A minimal job server, recording the requests it receives
+    jobs = {}
+    state = {
+        "in_flight": 0,
+        "max_in_flight": 0,
+        "requests": [],
+        # job ID -> the messages of its log stream, and the number of them after which
+        # each of the first connections is dropped
+        "log_messages": {},
+        "drop_after": {},
+        "log_connections": [],
+    }
+
+    async def submit(request):
+        body = await request.json()
+        state["requests"].append(body)
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        if body["entrypoint"] == "fail":
+            return web.Response(status=500, text="boom")
+        submission_id = body.get("submission_id") or f"raysubmit_{len(jobs)}"
+        jobs[submission_id] = {
+            "type": "SUBMISSION",
+            "submission_id": submission_id,
+            "entrypoint": body["entrypoint"],
+            "status": "RUNNING",
+        }
+        return web.json_response({"job_id": None, "submission_id": submission_id})
+
+    def job_or_404(handler):
+        async def wrapper(request):
+            job_id = request.match_info["job_id"]
+            if job_id not in jobs:
+                return web.Response(status=404, text=f"Job {job_id} does not exist")
+            return await handler(job_id)
+
+        return wrapper
+
+    async def info(job_id):
+        return web.json_response(jobs[job_id])
+
+    async def logs(job_id):
+        return web.json_response({"logs": f"hello from {job_id}\n"})
+
+    async def tail_logs(request):
+        job_id = request.match_info["job_id"]
+        if job_id not in state["log_messages"]:
+            return web.Response(status=404, text=f"Job {job_id} does not exist")
+        state["log_connections"].append(job_id)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        drops = state["drop_after"].get(job_id)
+        drop_after = drops.pop(0) if drops else None
+        for i, message in enumerate(state["log_messages"][job_id]):
+            if i == drop_after:
+                request.transport.close()
+                return ws
+            await ws.send_str(message)
+            await asyncio.sleep(0)
+        return ws
+
+    async def stop(job_id):
+        stopped = jobs[job_id]["status"] == "RUNNING"
+        jobs[job_id]["status"] = "STOPPED"
+        return web.json_response({"stopped": stopped})
+
+    async def delete(job_id):
+        return web.json_response({"deleted": jobs.pop(job_id) is not None})
+
+    async def list_jobs(request):
+        return web.json_response(list(jobs.values()))
+
+    app = web.Application()
+    app.router.add_post("/api/jobs/", submit)
+    app.router.add_get("/api/jobs/", list_jobs)
+    app.router.add_get("/api/jobs/{job_id}", job_or_404(info))
+    app.router.add_get("/api/jobs/{job_id}/logs", job_or_404(logs))
+    app.router.add_get("/api/jobs/{job_id}/logs/tail", tail_logs)
+    app.router.add_post("/api/jobs/{job_id}/stop", job_or_404(stop))
+    app.router.add_delete("/api/jobs/{job_id}", job_or_404(delete))
+    return app, state
+
+
+def run_with_dashboard(scenario, **client_kwargs):
+    async def run():
+        app, state = fake_dashboard()
+        async with TestServer(app) as server:
+            address = str(server.make_url("/"))
+            async with AsyncRayJobClient(address, **client_kwargs) as client:
+                await scenario(client, state)
+
+    asyncio.run(run())
+
+
+def test_async_rjc_across_event_loops():
+    client = AsyncRayJobClient("http://unused")
+
+    async def run():
+        app, _ = fake_dashboard()
+        async with TestServer(app) as server:
+            client.address = str(server.make_url("")).rstrip("/")
+            return await client.submit_job(entrypoint="python train.py")
+
+    # Each asyncio.run() has its own event loop, so the client opens a new session for it
+    assert asyncio.run(run()) == "raysubmit_0"
+    assert asyncio.run(run()) == "raysubmit_0"
+    asyncio.run(client.close())
+
+
+def test_async_rjc_ssl_context(mocker, tmp_path):
+    create_default_context = mocker.patch("ssl.create_default_context")
+    ca_file = tmp_path / "ca.crt"
+    ca_file.write_text("")
+
+    # Like Ray's client, `verify` may be a file or a directory of certificates
+    assert _ssl_context(str(ca_file)) is create_default_context.return_value
+    create_default_context.assert_called_with(cafile=str(ca_file))
+    _ssl_context(str(tmp_path))
+    create_default_context.assert_called_with(capath=str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        _ssl_context(str(tmp_path / "missing"))
+    assert _ssl_context(False) is False
+    assert _ssl_context(True) is None
+
+
+def test_async_rjc_submit_jobs():
+    async def scenario(client, state):
+        batch = [{"entrypoint": f"python train.py --lr {i}"} for i in range(10)]
+        batch.append({"entrypoint": "fail", "submission_id": "bad-job"})
+        batch.append({"entrypoint": "echo", "submission_id": "my-job"})
+        results = await client.submit_jobs(batch)
+
+        assert state["max_in_flight"] == 4
+        assert [r.succeeded for r in results] == [True] * 10 + [False, True]
+        assert results[10].job_id == "bad-job"
+        assert "status code 500: boom" in str(results[10].error)
+        assert results[11].job_id == "my-job"
+        # Global metadata is merged into each job, and unset fields are left out
+        assert state["requests"][0] == {
+            "entrypoint": "python train.py --lr 0",
+            "runtime_env": {},
+            "metadata": {"team": "ml"},
+        }
+
+        statuses = await client.get_job_statuses(["my-job", "missing"])
+        assert statuses[0].value == JobStatus.RUNNING
+        assert not statuses[1].succeeded
+        assert "status code 404" in str(statuses[1].error)
+
+    run_with_dashboard(scenario, max_concurrency=4, metadata={"team": "ml"})
+
+
+def test_async_rjc_job_operations():
+    async def scenario(client, state):
+        job_id = await client.submit_job(
+            "echo hello", submission_id="job-1", entrypoint_num_cpus=1
+        )
+        assert job_id == "job-1"
+        assert state["requests"][0]["entrypoint_num_cpus"] == 1
+        assert (await client.get_job_info(job_id)).entrypoint == "echo hello"
+        assert await client.get_job_logs(job_id) == "hello from job-1\n"
+        assert [j.submission_id for j in await client.list_jobs()] == ["job-1"]
+        assert await client.stop_job(job_id) == (
+            True,
+            "Successfully stopped Job job-1",
+        )
+        assert await client.stop_job(job_id) == (
+            False,
+            "Failed to stop Job, job-1 could have already completed.",
+        )
+        assert await client.delete_job(job_id) == (
+            True,
+            "Successfully deleted Job job-1",
+        )
+
+    run_with_dashboard(scenario)
+
+
+def test_async_rjc_uploads_runtime_env_packages(mocker):
+    mocker.patch.object(JobSubmissionClient, "__init__", return_value=None)
+
+    def upload_working_dir(runtime_env):
+        runtime_env["working_dir"] = "gcs://_ray_pkg_abc.zip"
+
+    upload_working_dir = mocker.patch.object(
+        JobSubmissionClient,
+        "_upload_working_dir_if_needed",
+        side_effect=upload_working_dir,
+    )
+    upload_py_modules = mocker.patch.object(
+        JobSubmissionClient, "_upload_py_modules_if_needed"
+    )
+
+    async def scenario(client, state):
+        runtime_env = {"working_dir": "./project", "env_vars": {"A": "1"}}
+        await client.submit_job("python train.py", runtime_env=runtime_env)
+        await client.submit_job("python train.py", runtime_env={"env_vars": {}})
+        assert upload_working_dir.call_count == 1
+        assert upload_py_modules.call_count == 1
+        assert state["requests"][0]["runtime_env"] == {
+            "working_dir": "gcs://_ray_pkg_abc.zip",
+            "env_vars": {"A": "1"},
+        }
+        # The caller's runtime_env is not modified
+        assert runtime_env["working_dir"] == "./project"
+
+    run_with_dashboard(scenario)
+
+
+def test_async_rjc_tail_jobs_logs():
+    async def scenario(client, state):
+        state["log_messages"] = {
+            "job-a": ["a1\na", "2\n", "a3"],
+            "job-b": ["b1\nb2\n"],
+        }
+        lines = [line async for line in client.tail_jobs_logs(["job-a", "job-b"])]
+
+        assert sorted((l.job_id, l.line, l.offset) for l in lines) == [
+            ("job-a", "a1", 3),
+            ("job-a", "a2", 6),
+            # The last line is yielded once the job finishes
+            ("job-a", "a3", 8),
+            ("job-b", "b1", 3),
+            ("job-b", "b2", 6),
+        ]
+        # Lines of a job keep their order
+        assert [l.line for l in lines if l.job_id == "job-a"] == ["a1", "a2", "a3"]
+
+        # Resuming from an offset only yields the lines after it
+        resumed = client.tail_jobs_logs(["job-a", "job-b"], offsets={"job-a": 3})
+        assert [(l.job_id, l.line) async for l in resumed if l.job_id == "job-a"] == [
+            ("job-a", "a2"),
+            ("job-a", "a3"),
+        ]
+
+    run_with_dashboard(scenario)
+
+
+def test_async_rjc_tail_jobs_logs_reconnects(mocker):
+    mocker.patch("asyncio.sleep", side_effect=fast_sleep)
+
+    async def scenario(client, state):
+        state["log_messages"] = {"job-a": ["a1\na", "2\na3\n", "a4\n"]}
+        # The connection drops in the middle of a2
+        state["drop_after"] = {"job-a": [1]}
+        lines = [(l.line, l.offset) async for l in client.tail_jobs_logs(["job-a"])]
+
+        assert lines == [("a1", 3), ("a2", 6), ("a3", 9), ("a4", 12)]
+        assert state["log_connections"] == ["job-a", "job-a"]
+
+        state["log_messages"] = {"job-b": ["b1\n"]}
+        state["drop_after"] = {"job-b": [0]}
+        state["log_connections"] = []
+        tail = client.tail_jobs_logs(["job-b"], max_reconnects=0)
+        with pytest.raises(RuntimeError, match="Lost the connection"):
+            [l async for l in tail]
+
+        with pytest.raises(RuntimeError, match="status code 404"):
+            [l async for l in client.tail_jobs_logs(["job-a", "missing"])]
+
+    run_with_dashboard(scenario)
+
+
+def test_async_rjc_tail_jobs_logs_resets_failures(mocker):
+    mocker.patch("asyncio.sleep", side_effect=fast_sleep)
+    ws_connect = mocker.spy(aiohttp.ClientSession, "ws_connect")
+
+    async def scenario(client, state):
+        state["log_messages"] = {"job-a": ["a1\n", "a2\n", "a3\n", "a4\n"]}
+        # Every connection drops, but each one is opened again successfully
+        state["drop_after"] = {"job-a": [1, 2, 3]}
+        lines = [
+            l.line
+            async for l in client.tail_jobs_logs(
+                ["job-a"], max_reconnects=1, heartbeat=5, receive_timeout=20
+            )
+        ]
+
+        assert lines == ["a1", "a2", "a3", "a4"]
+        assert len(state["log_connections"]) == 4
+        assert ws_connect.call_args.kwargs["heartbeat"] == 5
+        assert ws_connect.call_args.kwargs["timeout"].ws_receive == 20
+
+    run_with_dashboard(scenario)
+
+
+def test_async_rjc_tail_jobs_logs_backpressure(mocker):
+    log_line = mocker.patch(
+        "codeflare_sdk.ray.client.async_ray_jobs.LogLine", side_effect=LogLine
+    )
+
+    async def scenario(client, state):
+        state["log_messages"] = {"job-a": [f"line {i}\n" for i in range(50)]}
+        tail = client.tail_jobs_logs(["job-a"], max_queued_lines=2)
+        first = await tail.__anext__()
+        # While the consumer is busy, no more lines are read than the queue holds
+        await asyncio.sleep(0.1)
+        assert log_line.call_count <= 4
+        second = await tail.__anext__()
+        await tail.aclose()
+
+        assert (first.line, second.line) == ("line 0", "line 1")
+
+    run_with_dashboard(scenario)
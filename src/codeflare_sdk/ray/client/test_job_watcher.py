@@ -0,0 +1,235 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from codeflare_sdk.ray.client.job_watcher import JobWatcher
+from ray.dashboard.modules.job.pydantic_models import JobDetails
+from ray.job_submission import JobStatus
+import asyncio
+import pytest
+import threading
+import time
+
+
+class FakeJobClient:
+    # Serves list_jobs() from a dict of submission ID -> status
+    def __init__(self, statuses=None):
+        self.statuses = dict(statuses or {})
+        self.calls = 0
+        self.error = None
+        self.polled = threading.Event()
+
+    def list_jobs(self):
+        self.calls += 1
+        self.polled.set()
+        if self.error is not None:
+            raise self.error
+        return [
+            JobDetails(
+                type="SUBMISSION",
+                submission_id=submission_id,
+                job_id=f"{submission_id}-driver",
+                entrypoint="python train.py",
+                status=status,
+            )
+            for submission_id, status in self.statuses.items()
+        ]
+
+
+def wait_until(condition):
+    for _ in range(500):
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+def poll_once(watcher):
+    # Wakes the watcher up and waits until it has processed one poll
+    polled = threading.Event()
+    poll = type(watcher)._poll
+
+    def tracked_poll():
+        try:
+            return poll(watcher)
+        finally:
+            polled.set()
+
+    watcher._poll = tracked_poll
+    watcher._wakeup.set()
+    assert polled.wait(5)
+
+
+def test_job_watcher_transitions():
+    client = FakeJobClient({"job-a": JobStatus.PENDING, "job-b": JobStatus.RUNNING})
+    transitions = []
+    with JobWatcher(client, poll_interval=0.01, max_poll_interval=0.05) as watcher:
+        watcher.on_transition(
+            lambda job_id, previous, details: transitions.append(
+                (job_id, previous, details.status)
+            )
+        )
+        future_a = watcher.watch("job-a")
+        # Jobs can also be watched by job ID
+        future_b = watcher.watch("job-b-driver")
+        assert watcher.watch("job-a") is future_a
+        wait_until(lambda: len(transitions) == 2)
+
+        client.statuses["job-a"] = JobStatus.RUNNING
+        client.statuses["job-b"] = JobStatus.FAILED
+        assert future_b.result(timeout=5).status == JobStatus.FAILED
+        wait_until(lambda: len(transitions) == 4)
+        client.statuses["job-a"] = JobStatus.SUCCEEDED
+        assert future_a.result(timeout=5).submission_id == "job-a"
+
+    assert [t for t in transitions if t[0] == "job-a"] == [
+        ("job-a", None, JobStatus.PENDING),
+        ("job-a", JobStatus.PENDING, JobStatus.RUNNING),
+        ("job-a", JobStatus.RUNNING, JobStatus.SUCCEEDED),
+    ]
+    assert transitions[-1][0] == "job-a"
+    assert ("job-b-driver", JobStatus.RUNNING, JobStatus.FAILED) in transitions
+
+
+def test_job_watcher_idles_without_jobs():
+    client = FakeJobClient({"job-a": JobStatus.SUCCEEDED})
+    with JobWatcher(client, poll_interval=0.01) as watcher:
+        assert not client.polled.wait(0.1)
+        assert watcher.watch("job-a").result(timeout=5).status == JobStatus.SUCCEEDED
+        client.polled.clear()
+        # Finished jobs are no longer watched, so polling stops
+        assert not client.polled.wait(0.1)
+    assert client.calls == 1
+
+
+def test_job_watcher_wait():
+    client = FakeJobClient({"job-a": JobStatus.RUNNING})
+
+    async def wait_for_job(watcher):
+        task = asyncio.ensure_future(watcher.wait("job-a"))
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        client.statuses["job-a"] = JobStatus.STOPPED
+        return await asyncio.wait_for(task, 5)
+
+    with JobWatcher(client, poll_interval=0.01) as watcher:
+        details = asyncio.run(wait_for_job(watcher))
+    assert details.status == JobStatus.STOPPED
+
+
+def test_job_watcher_missing_jobs_and_errors():
+    client = FakeJobClient({"job-a": JobStatus.RUNNING})
+    watcher = JobWatcher(client, poll_interval=60, max_consecutive_errors=2)
+    watcher.start()
+    try:
+        future_a = watcher.watch("job-a")
+        future_b = watcher.watch("job-b")
+        poll_once(watcher)
+        poll_once(watcher)
+        # job-b was never listed, it may not have been submitted yet
+        assert not future_b.done()
+
+        # job-a was deleted
+        del client.statuses["job-a"]
+        poll_once(watcher)
+        with pytest.raises(RuntimeError, match="Job job-a no longer exists"):
+            future_a.result(timeout=5)
+
+        watcher.on_transition(lambda *args: 1 / 0)
+        client.statuses["job-b"] = JobStatus.PENDING
+        poll_once(watcher)
+        # A failing callback doesn't stop the watcher
+        client.statuses["job-b"] = JobStatus.RUNNING
+        poll_once(watcher)
+        assert isinstance(watcher.error, ZeroDivisionError)
+
+        client.error = ConnectionError("dashboard unreachable")
+        poll_once(watcher)
+        assert not future_b.done()
+        poll_once(watcher)
+        with pytest.raises(ConnectionError):
+            future_b.result(timeout=5)
+        assert watcher.error is client.error
+
+        future_c = watcher.watch("job-c")
+        watcher.unwatch("job-c")
+        assert future_c.cancelled()
+    finally:
+        watcher.stop()
+
+
+def test_job_watcher_backoff():
+    client = FakeJobClient({"job-a": JobStatus.RUNNING})
+    watcher = JobWatcher(client, poll_interval=1, max_poll_interval=4)
+    waits = []
+
+    class RecordingEvent:
+        def wait(self, timeout=None):
+            waits.append(timeout)
+            if len(waits) == 5:
+                client.statuses["job-a"] = JobStatus.FAILED
+            if len(waits) == 6:
+                watcher._stopped.set()
+            return False
+
+        def set(self):
+            pass
+
+        def clear(self):
+            pass
+
+    watcher._wakeup = RecordingEvent()
+    watcher.watch("job-a")
+    watcher.watch("job-b")
+    watcher._run()
+
+    # The interval doubles while nothing changes, and is reset by a change
+    assert waits == [1, 1, 2, 4, 4, 1]
+    # One request per poll, however many jobs are watched
+    assert client.calls == 6
+
+
+def test_job_watcher_never_listed_job(mocker):
+    client = FakeJobClient()
+    now = mocker.patch(
+        "codeflare_sdk.ray.client.job_watcher.monotonic", return_value=100
+    )
+    watcher = JobWatcher(client, poll_interval=60, missing_job_grace_period=30)
+    watcher.start()
+    try:
+        future = watcher.watch("job-a")
+        poll_once(watcher)
+        now.return_value = 130
+        poll_once(watcher)
+        assert not future.done()
+
+        # The job is still not listed after the grace period
+        now.return_value = 131
+        poll_once(watcher)
+        with pytest.raises(RuntimeError, match="Job job-a was not found within 30s"):
+            future.result(timeout=5)
+    finally:
+        watcher.stop()
+
+
+def test_job_watcher_start_twice():
+    watcher = JobWatcher(FakeJobClient())
+    watcher.start()
+    thread = watcher._thread
+    try:
+        # Starting a running watcher doesn't start a second polling thread
+        watcher.start()
+        assert watcher._thread is thread
+    finally:
+        watcher.stop()
+    assert not thread.is_alive()
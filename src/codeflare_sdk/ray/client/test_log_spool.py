@@ -0,0 +1,219 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from codeflare_sdk.ray.client import log_spool
+from codeflare_sdk.ray.client.log_spool import (
+    configure_log_spool,
+    clear_log_spool,
+    read_job_logs,
+)
+from codeflare_sdk.ray.client.ray_jobs import RayJobClient
+from ray.dashboard.modules.job.pydantic_models import JobDetails
+from ray.job_submission import JobStatus, JobSubmissionClient
+import gzip
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def spool_directory(tmp_path):
+    configure_log_spool(str(tmp_path))
+    yield tmp_path
+    clear_log_spool()
+    configure_log_spool()
+
+
+@pytest.fixture
+def job_requests(mocker):
+    # The job requests of every JobSubmissionClient
+    mocker.patch.object(JobSubmissionClient, "__init__", return_value=None)
+    get_job_info = mocker.patch.object(
+        JobSubmissionClient,
+        "get_job_info",
+        autospec=True,
+        return_value=job_details(JobStatus.RUNNING),
+    )
+    get_job_logs = mocker.patch.object(
+        JobSubmissionClient, "get_job_logs", autospec=True
+    )
+    return get_job_info, get_job_logs
+
+
+def job_details(status, start_time=1000):
+    return JobDetails(
+        type="SUBMISSION",
+        submission_id="job-a",
+        entrypoint="python train.py",
+        status=status,
+        start_time=start_time,
+    )
+
+
+def ray_client(address="http://cluster-a"):
+    client = JobSubmissionClient(address)
+    client._address = address
+    return client
+
+
+def test_read_job_logs_incrementally(job_requests):
+    get_job_info, get_job_logs = job_requests
+    client = ray_client()
+    get_job_logs.return_value = "step 1\n"
+    assert read_job_logs(client, "job-a") == ("step 1\n", 7)
+
+    get_job_logs.return_value = "step 1\nstep 2\n"
+    logs, cursor = read_job_logs(client, "job-a", since=7)
+    assert (logs, cursor) == ("step 2\n", 14)
+    # Nothing new
+    assert read_job_logs(client, "job-a", since=cursor) == ("", 14)
+
+    get_job_info.return_value = job_details(JobStatus.SUCCEEDED)
+    get_job_logs.return_value = "step 1\nstep 2\ndone ✓\n"
+    assert read_job_logs(client, "job-a", since=cursor) == ("done ✓\n", 23)
+    assert get_job_logs.call_count == 4
+
+    # The job has finished, so its logs are now read from the spool without any request
+    get_job_info.reset_mock()
+    assert read_job_logs(client, "job-a") == ("step 1\nstep 2\ndone ✓\n", 23)
+    assert read_job_logs(client, "job-a", since=14) == ("done ✓\n", 23)
+    assert get_job_logs.call_count == 4
+    get_job_logs.assert_called_with(client, "job-a")
+    get_job_info.assert_not_called()
+
+    # Another client of the cluster checks the job once
+    assert read_job_logs(ray_client(), "job-a", since=14) == ("done ✓\n", 23)
+    assert get_job_info.call_count == 1
+    assert get_job_logs.call_count == 4
+
+
+def test_read_job_logs_per_cluster(job_requests, spool_directory):
+    _, get_job_logs = job_requests
+    get_job_logs.side_effect = lambda client, job_id: f"from {client._address[-1]}\n"
+
+    assert read_job_logs(ray_client("http://cluster-a"), "job-a") == ("from a\n", 7)
+    assert read_job_logs(ray_client("http://cluster-b"), "job-a") == ("from b\n", 7)
+    assert len(list(spool_directory.iterdir())) == 2
+
+
+def test_read_job_logs_recreated_cluster(job_requests, spool_directory):
+    get_job_info, get_job_logs = job_requests
+    client = ray_client()
+    get_job_info.return_value = job_details(JobStatus.SUCCEEDED)
+    get_job_logs.return_value = "first run\n"
+    read_job_logs(client, "job-a")
+
+    # A cluster re-created at the same address runs a new job with the same ID
+    get_job_info.return_value = job_details(JobStatus.SUCCEEDED, start_time=2000)
+    get_job_logs.return_value = "second run\n"
+    assert read_job_logs(ray_client(), "job-a") == ("second run\n", 11)
+    assert len(list(spool_directory.glob("*/job-a-*.log"))) == 2
+
+
+def test_read_job_logs_invalid_job_id(job_requests):
+    get_job_info, _ = job_requests
+    for job_id in ["../job-a", "a/b", ".hidden", ""]:
+        with pytest.raises(ValueError, match="can't be spooled"):
+            read_job_logs(ray_client(), job_id)
+    get_job_info.assert_not_called()
+
+
+def test_read_job_logs_compressed(job_requests, spool_directory):
+    get_job_info, get_job_logs = job_requests
+    configure_log_spool(str(spool_directory), compress=True)
+    client = ray_client()
+    get_job_logs.return_value = "a" * 1000 + "\n"
+    read_job_logs(client, "job-a")
+
+    # Sizes are known again from the spool, e.g. in a new session
+    log_spool._sizes.clear()
+    get_job_info.return_value = job_details(JobStatus.FAILED)
+    get_job_logs.return_value = "a" * 1000 + "\nerror\n"
+    assert read_job_logs(client, "job-a", since=1001) == ("error\n", 1007)
+
+    [spool] = spool_directory.glob("*/job-a-1000.log.gz")
+    with gzip.open(spool, "rt") as f:
+        assert f.read() == "a" * 1000 + "\nerror\n"
+    assert spool.stat().st_size < 1000
+    assert read_job_logs(client, "job-a", since=1001) == ("error\n", 1007)
+    assert get_job_logs.call_count == 2
+
+
+def test_read_job_logs_replaced_log(job_requests, spool_directory):
+    get_job_info, get_job_logs = job_requests
+    client = ray_client()
+    get_job_logs.return_value = "old log\n"
+    read_job_logs(client, "job-a")
+
+    get_job_info.return_value = job_details(JobStatus.STOPPED)
+    get_job_logs.return_value = "new\n"
+    assert read_job_logs(client, "job-a") == ("new\n", 4)
+    [spool] = spool_directory.glob("*/job-a-1000.log")
+    assert spool.read_text() == "new\n"
+
+
+def test_read_job_logs_deleted_spool(job_requests, spool_directory):
+    get_job_info, get_job_logs = job_requests
+    client = ray_client()
+    get_job_logs.return_value = "step 1\nstep 2\n"
+    read_job_logs(client, "job-a")
+
+    # The spool file is deleted outside of the SDK, e.g. by a cleanup job
+    [spool] = spool_directory.glob("*/job-a-1000.log")
+    spool.unlink()
+    get_job_logs.return_value = "step 1\n"
+    assert read_job_logs(client, "job-a") == ("step 1\n", 7)
+    assert spool.read_text() == "step 1\n"
+
+    spool.unlink()
+    get_job_logs.return_value = "step 1\nstep 2\nstep 3\n"
+    assert read_job_logs(client, "job-a", since=7) == ("step 2\nstep 3\n", 21)
+    assert spool.read_text() == "step 1\nstep 2\nstep 3\n"
+
+
+def test_read_job_logs_empty_finished_job(job_requests):
+    get_job_info, get_job_logs = job_requests
+    client = ray_client()
+    get_job_info.return_value = job_details(JobStatus.SUCCEEDED)
+    get_job_logs.return_value = ""
+    assert read_job_logs(client, "job-a") == ("", 0)
+    assert read_job_logs(client, "job-a") == ("", 0)
+    assert get_job_logs.call_count == 1
+
+
+def test_clear_log_spool_keeps_other_files(job_requests, spool_directory):
+    _, get_job_logs = job_requests
+    get_job_logs.return_value = "step 1\n"
+    read_job_logs(ray_client(), "job-a")
+    (spool_directory / "notes").mkdir()
+    (spool_directory / "notes" / "todo.txt").write_text("keep me\n")
+    (spool_directory / "results.csv").write_text("a,b\n")
+
+    clear_log_spool()
+    # Only the directories created by the spool are deleted
+    assert sorted(p.name for p in spool_directory.iterdir()) == [
+        "notes",
+        "results.csv",
+    ]
+    assert (spool_directory / "notes" / "todo.txt").read_text() == "keep me\n"
+
+
+def test_rjc_get_job_logs_since(mocker):
+    mocker.patch.object(JobSubmissionClient, "__init__", return_value=None)
+    mocked_read_job_logs = mocker.patch(
+        "codeflare_sdk.ray.client.ray_jobs.read_job_logs",
+        return_value=("new logs\n", 9),
+    )
+    client = RayJobClient("http://cluster-a")
+
+    assert client.get_job_logs("job-a", since=0) == ("new logs\n", 9)
+    mocked_read_job_logs.assert_called_once_with(client.rayJobClient, "job-a", 0)
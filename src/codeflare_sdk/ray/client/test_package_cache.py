@@ -0,0 +1,217 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from codeflare_sdk.ray.client import package_cache
+from codeflare_sdk.ray.client.package_cache import (
+    upload_runtime_env_packages,
+    clear_package_cache,
+)
+from codeflare_sdk.ray.client.ray_jobs import RayJobClient
+from ray._private.runtime_env.packaging import get_uri_for_directory
+from ray.job_submission import JobSubmissionClient
+import os
+import pytest
+import zipfile
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_package_cache()
+    yield
+    clear_package_cache()
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "train.py").write_text("print('training')\n")
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "samples.csv").write_text("a,b\n1,2\n")
+    return tmp_path
+
+
+@pytest.fixture
+def package_requests(mocker):
+    # The package requests of every JobSubmissionClient, and the packages on each cluster
+    mocker.patch.object(JobSubmissionClient, "__init__", return_value=None)
+    existing = set()
+    package_exists = mocker.patch.object(
+        JobSubmissionClient,
+        "_package_exists",
+        autospec=True,
+        side_effect=lambda client, uri: (client._address, uri) in existing,
+    )
+    upload_package = mocker.patch.object(
+        JobSubmissionClient, "_upload_package", autospec=True
+    )
+    return package_exists, upload_package, existing
+
+
+def ray_client(address="http://cluster-a"):
+    client = JobSubmissionClient(address)
+    client._address = address
+    return client
+
+
+def uploaded_package(upload_package):
+    return upload_package.call_args.args[2]
+
+
+def test_upload_is_skipped_for_unchanged_directory(mocker, project, package_requests):
+    package_exists, upload_package, _ = package_requests
+    hash_directory = mocker.spy(package_cache, "get_uri_for_directory")
+    client = ray_client()
+
+    runtime_env = {"working_dir": str(project), "env_vars": {"A": "1"}}
+    first = upload_runtime_env_packages(client, runtime_env)
+    second = upload_runtime_env_packages(client, runtime_env)
+
+    uri = get_uri_for_directory(str(project))
+    assert first == second == {"working_dir": uri, "env_vars": {"A": "1"}}
+    assert runtime_env["working_dir"] == str(project)
+    assert hash_directory.call_count == 1
+    # The second submission follows the first closely enough to trust its answer
+    package_exists.assert_called_once_with(client, uri)
+    package = uploaded_package(upload_package)
+    upload_package.assert_called_once_with(client, uri, package, is_file=True)
+    with zipfile.ZipFile(package) as archive:
+        assert sorted(archive.namelist()) == ["data/samples.csv", "train.py"]
+
+
+def test_cluster_is_asked_again_after_ttl(mocker, project, package_requests):
+    package_exists, upload_package, existing = package_requests
+    clock = mocker.patch(
+        "codeflare_sdk.ray.client.package_cache.monotonic", return_value=100
+    )
+    create_package = mocker.spy(package_cache, "create_package")
+    client = ray_client()
+    upload_runtime_env_packages(client, {"working_dir": str(project)})
+    existing.add((client._address, get_uri_for_directory(str(project))))
+
+    clock.return_value = 100 + package_cache.PACKAGE_EXISTS_TTL_SECONDS
+    upload_runtime_env_packages(client, {"working_dir": str(project)})
+    assert package_exists.call_count == 2
+    assert upload_package.call_count == 1
+
+    # The cluster deleted the package, e.g. after its jobs finished or it was recreated
+    existing.clear()
+    clock.return_value += package_cache.PACKAGE_EXISTS_TTL_SECONDS
+    upload_runtime_env_packages(client, {"working_dir": str(project)})
+    assert package_exists.call_count == 3
+    assert upload_package.call_count == 2
+    assert create_package.call_count == 1
+
+
+def test_package_is_reused_across_clusters(mocker, project, package_requests):
+    _, upload_package, existing = package_requests
+    create_package = mocker.spy(package_cache, "create_package")
+    existing.add(("http://cluster-c", get_uri_for_directory(str(project))))
+    clusters = [ray_client(f"http://cluster-{name}") for name in "abc"]
+
+    for client in clusters:
+        upload_runtime_env_packages(client, {"working_dir": str(project)})
+
+    assert create_package.call_count == 1
+    # The package is already on the third cluster
+    assert [c.args[0] for c in upload_package.call_args_list] == clusters[:2]
+    assert len({c.args[2] for c in upload_package.call_args_list}) == 1
+
+
+def test_changed_directory_is_uploaded_again(project, package_requests):
+    _, upload_package, _ = package_requests
+    client = ray_client()
+    first = upload_runtime_env_packages(client, {"working_dir": str(project)})
+
+    (project / "train.py").write_text("print('training for longer')\n")
+    second = upload_runtime_env_packages(client, {"working_dir": str(project)})
+
+    assert first["working_dir"] != second["working_dir"]
+    assert second["working_dir"] == get_uri_for_directory(str(project))
+    assert upload_package.call_count == 2
+
+
+def test_excluded_files_are_ignored(mocker, project, package_requests):
+    _, upload_package, _ = package_requests
+    hash_directory = mocker.spy(package_cache, "get_uri_for_directory")
+    client = ray_client()
+    runtime_env = {"working_dir": str(project), "excludes": ["data/"]}
+    first = upload_runtime_env_packages(client, runtime_env)
+
+    (project / "data" / "samples.csv").write_text("a,b\n3,4\n5,6\n")
+    second = upload_runtime_env_packages(client, runtime_env)
+
+    assert first == second
+    assert hash_directory.call_count == 1
+    with zipfile.ZipFile(uploaded_package(upload_package)) as archive:
+        assert archive.namelist() == ["train.py"]
+
+
+def test_py_modules_directories_are_uploaded(project, package_requests):
+    _, upload_package, _ = package_requests
+    module = project / "data"
+
+    runtime_env = upload_runtime_env_packages(
+        ray_client(),
+        {"py_modules": [str(module), "gcs://_ray_pkg_abc.zip", "dist/lib.whl"]},
+    )
+
+    assert runtime_env["py_modules"] == [
+        get_uri_for_directory(str(module)),
+        "gcs://_ray_pkg_abc.zip",
+        "dist/lib.whl",
+    ]
+    # Modules are packaged with their parent directory, like Ray does
+    with zipfile.ZipFile(uploaded_package(upload_package)) as archive:
+        assert "data/samples.csv" in archive.namelist()
+
+
+def test_runtime_env_without_directories(package_requests):
+    package_exists, _, _ = package_requests
+    client = ray_client()
+    assert upload_runtime_env_packages(client, None) is None
+    assert upload_runtime_env_packages(
+        client, {"working_dir": "s3://bucket/a.zip"}
+    ) == {"working_dir": "s3://bucket/a.zip"}
+    package_exists.assert_not_called()
+
+
+def test_clear_package_cache(project, package_requests):
+    _, upload_package, _ = package_requests
+    client = ray_client()
+    upload_runtime_env_packages(client, {"working_dir": str(project)})
+    package = uploaded_package(upload_package)
+
+    clear_package_cache()
+
+    assert not os.path.exists(package)
+    upload_runtime_env_packages(client, {"working_dir": str(project)})
+    assert upload_package.call_count == 2
+
+
+def test_rjc_submit_job_uploads_from_cache(mocker, project):
+    mocker.patch.object(JobSubmissionClient, "__init__", return_value=None)
+    mocker.patch.object(JobSubmissionClient, "get_address", return_value="http://a")
+    mocker.patch.object(JobSubmissionClient, "_package_exists", return_value=False)
+    upload_package = mocker.patch.object(JobSubmissionClient, "_upload_package")
+    submit_job = mocker.patch.object(
+        JobSubmissionClient, "submit_job", return_value="raysubmit_1"
+    )
+    client = RayJobClient("http://a")
+
+    for _ in range(3):
+        client.submit_job("python train.py", runtime_env={"working_dir": str(project)})
+
+    assert upload_package.call_count == 1
+    assert submit_job.call_args.kwargs["runtime_env"] == {
+        "working_dir": get_uri_for_directory(str(project))
+    }
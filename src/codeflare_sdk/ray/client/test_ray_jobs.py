@@ -14,6 +14,7 @@
 
 from ray.job_submission import JobSubmissionClient
 from codeflare_sdk.ray.client.ray_jobs import RayJobClient
+from codeflare_sdk.ray.client.async_ray_jobs import AsyncRayJobClient
 from codeflare_sdk.common.utils.unit_test_support import get_package_and_version
 import pytest
 
@@ -155,6 +156,36 @@ def test_rjc_tail_job_logs(ray_job_client, mocker):
     assert job_tail_job_logs == logs_example
 
 
+def test_rjc_tail_jobs_logs(ray_job_client, mocker):
+    mocker.patch.object(
+        JobSubmissionClient, "get_address", return_value="http://dashboard"
+    )
+    ray_job_client.rayJobClient._cookies = {"session": "abc"}
+    ray_job_client.rayJobClient._headers = {"Authorization": "Bearer token"}
+    ray_job_client.rayJobClient._verify = False
+    mocked_tail_jobs_logs = mocker.patch.object(
+        AsyncRayJobClient, "tail_jobs_logs", return_value="mocked_iterator"
+    )
+    mocked_init = mocker.spy(AsyncRayJobClient, "__init__")
+
+    tail = ray_job_client.tail_jobs_logs(["job-a", "job-b"], offsets={"job-a": 10})
+
+    assert tail == "mocked_iterator"
+    mocked_init.assert_called_once_with(
+        mocker.ANY,
+        "http://dashboard",
+        cookies={"session": "abc"},
+        headers={"Authorization": "Bearer token"},
+        verify=False,
+    )
+    mocked_tail_jobs_logs.assert_called_once_with(
+        ["job-a", "job-b"],
+        offsets={"job-a": 10},
+        max_queued_lines=1000,
+        max_reconnects=5,
+    )
+
+
 def test_rjc_list_jobs(ray_job_client, mocker):
     requirements_path = "tests/e2e/mnist_pip_requirements.txt"
     pytorch_lightning = get_package_and_version("pytorch_lightning", requirements_path)
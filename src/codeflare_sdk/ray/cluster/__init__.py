@@ -10,4 +10,18 @@ from .cluster import (
     get_cluster,
     list_all_queued,
     list_all_clusters,
+    iter_clusters,
+)
+
+from .fleet import ClusterFleet, FleetResult
+
+from .render import render_manifests
+
+from .informers import start_informers, stop_informers
+
+from .async_cluster import (
+    AsyncCluster,
+    get_cluster_async,
+    list_all_clusters_async,
+    configure_async_executor,
 )
@@ -0,0 +1,417 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The async_cluster sub-module contains the definition of the AsyncCluster object, an asyncio
+counterpart of the Cluster object. Kubernetes requests run on a small shared thread pool,
+and clusters waiting to become ready share one watch per namespace, so one event loop can
+drive many concurrent cluster bring-ups without dedicating a thread to each cluster.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import Dict, List, Optional, Set, Tuple
+
+from kubernetes import client, watch
+from kubernetes.client.rest import ApiException
+
+from ...common.kubernetes_cluster.auth import get_api_client
+from .cluster import (
+    Cluster,
+    _check_namespace_arguments,
+    get_cluster,
+    list_all_clusters,
+    WATCH_TIMEOUT_SECONDS,
+    WAIT_READY_INITIAL_BACKOFF_SECONDS,
+    WAIT_READY_MAX_BACKOFF_SECONDS,
+    DASHBOARD_MAX_BACKOFF_SECONDS,
+)
+from .config import ClusterConfiguration
+from .status import CodeFlareClusterStatus, RayCluster, RayClusterStatus
+
+DEFAULT_MAX_WORKERS = 16
+
+_executor = None
+_executor_max_workers = DEFAULT_MAX_WORKERS
+_executor_lock = threading.Lock()
+
+# (group, version, namespace, plural) -> _NamespaceWatch
+_namespace_watches: Dict[Tuple[str, str, str, str], "_NamespaceWatch"] = {}
+_namespace_watches_lock = threading.Lock()
+
+
+def configure_async_executor(max_workers: int = DEFAULT_MAX_WORKERS):
+    """
+    Sets the number of threads used to run Kubernetes requests for the asyncio API.
+
+    Args:
+        max_workers (int):
+            The maximum number of concurrent Kubernetes requests. Defaults to 16.
+    """
+    global _executor
+    global _executor_max_workers
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+        _executor_max_workers = max_workers
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_executor_max_workers,
+                thread_name_prefix="codeflare-sdk-async",
+            )
+        return _executor
+
+
+async def _run(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+class _NamespaceWatch:
+    """
+    Watches the custom objects of one kind in a namespace from a single daemon thread, and
+    wakes up the event loop tasks waiting for one of the objects to change. The thread only
+    runs while tasks are waiting, so every cluster of a namespace shares one watch however
+    many of them are waited on.
+    """
+
+    def __init__(self, group: str, version: str, namespace: str, plural: str):
+        self.group = group
+        self.version = version
+        self.namespace = namespace
+        self.plural = plural
+        self.watch_permitted = True
+        # object name -> the futures of the tasks waiting for it to change
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self, name: str) -> asyncio.Future:
+        """
+        Returns a future resolved on the next change of the named object, or at once if
+        watches are not permitted.
+        """
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            if not self.watch_permitted:
+                future.set_result(None)
+                return future
+            self._waiters.setdefault(name, set()).add(future)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"codeflare-sdk-watch-{self.plural}-{self.namespace}",
+                    daemon=True,
+                )
+                self._thread.start()
+        return future
+
+    def unsubscribe(self, name: str, future: asyncio.Future):
+        with self._lock:
+            waiters = self._waiters.get(name)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[name]
+
+    def _run(self):
+        resource_version = None
+        backoff = WAIT_READY_INITIAL_BACKOFF_SECONDS
+        stopped = threading.Event()
+        while True:
+            with self._lock:
+                if not self._waiters:
+                    # Decided under the lock, so that a new waiter starts a new thread
+                    self._thread = None
+                    return
+            kwargs = {}
+            if resource_version is not None:
+                kwargs["resource_version"] = resource_version
+            try:
+                api_instance = client.CustomObjectsApi(get_api_client())
+                stream_watch = watch.Watch()
+                for event in stream_watch.stream(
+                    api_instance.list_namespaced_custom_object,
+                    group=self.group,
+                    version=self.version,
+                    namespace=self.namespace,
+                    plural=self.plural,
+                    timeout_seconds=WATCH_TIMEOUT_SECONDS,
+                    _request_timeout=WATCH_TIMEOUT_SECONDS + 5,
+                    **kwargs,
+                ):
+                    metadata = event["object"].get("metadata", {})
+                    resource_version = metadata.get("resourceVersion", resource_version)
+                    self._notify(metadata.get("name"))
+                    with self._lock:
+                        if not self._waiters:
+                            stream_watch.stop()
+                backoff = WAIT_READY_INITIAL_BACKOFF_SECONDS
+                continue
+            except ApiException as e:
+                if e.status == 410:
+                    resource_version = None
+                    continue
+                if e.status in [401, 403, 405]:
+                    # Waiters fall back to polling
+                    with self._lock:
+                        self.watch_permitted = False
+                        self._thread = None
+                    self._notify(None)
+                    return
+            except Exception:
+                pass
+            stopped.wait(backoff)
+            backoff = min(backoff * 2, WAIT_READY_MAX_BACKOFF_SECONDS)
+
+    def _notify(self, name: Optional[str]):
+        # Wakes up the waiters of an object, or every waiter if name is None
+        with self._lock:
+            if name is None:
+                futures = [f for waiters in self._waiters.values() for f in waiters]
+                self._waiters.clear()
+            else:
+                futures = list(self._waiters.pop(name, ()))
+        for future in futures:
+            try:
+                future.get_loop().call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # The event loop of the waiter was closed
+                pass
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _get_namespace_watch(
+    group: str, version: str, namespace: str, plural: str
+) -> _NamespaceWatch:
+    key = (group, version, namespace, plural)
+    with _namespace_watches_lock:
+        if key not in _namespace_watches:
+            _namespace_watches[key] = _NamespaceWatch(*key)
+        return _namespace_watches[key]
+
+
+class AsyncCluster:
+    """
+    An asyncio counterpart of the Cluster object, for requesting, bringing up and taking down
+    resources from an event loop.
+
+    Use `await AsyncCluster.create(config)` to build a new cluster request, or wrap an
+    existing Cluster object with `AsyncCluster(cluster)`.
+    """
+
+    def __init__(self, cluster: Cluster):
+        self.cluster = cluster
+
+    @classmethod
+    async def create(cls, config: ClusterConfiguration) -> "AsyncCluster":
+        """
+        Builds the Cluster object for the given ClusterConfiguration without blocking the event loop.
+        """
+        return cls(await _run(Cluster, config))
+
+    @property
+    def config(self) -> ClusterConfiguration:
+        return self.cluster.config
+
+    async def up(self):
+        """
+        Applies the Cluster yaml, pushing the resource request onto the Kueue localqueue.
+        """
+        return await _run(self.cluster.up)
+
+    async def apply(self, force=False):
+        """
+        Applies the Cluster yaml using server-side apply.
+        If 'force' is set to True, conflicts will be forced.
+        """
+        return await _run(self.cluster.apply, force=force)
+
+    async def down(self):
+        """
+        Deletes the Cluster resources, scaling-down and deleting all resources
+        associated with the cluster.
+        """
+        return await _run(self.cluster.down)
+
+    async def status(
+        self, print_to_console: bool = True
+    ) -> Tuple[CodeFlareClusterStatus, bool]:
+        """
+        Returns the requested cluster's status, as well as whether or not
+        it is ready for use.
+        """
+        return await _run(self.cluster.status, print_to_console=print_to_console)
+
+    async def details(self, print_to_console: bool = True) -> RayCluster:
+        """
+        Retrieves details about the Ray Cluster.
+        """
+        return await _run(self.cluster.details, print_to_console=print_to_console)
+
+    async def is_dashboard_ready(self) -> bool:
+        """
+        Checks if the cluster's dashboard is ready and accessible.
+        """
+        return await _run(self.cluster.is_dashboard_ready)
+
+    async def wait_ready(
+        self, timeout: Optional[int] = None, dashboard_check: bool = True
+    ):
+        """
+        Waits for the requested cluster to be ready, up to an optional timeout.
+
+        Like `Cluster.wait_ready`, the cluster status is checked again as soon as a Kubernetes
+        watch sees the cluster (or its AppWrapper) change, falling back to exponential
+        backoff if watches are not permitted. Clusters of the same namespace share one watch,
+        and the event loop is free to run other tasks between checks.
+
+        Args:
+            timeout (Optional[int]):
+                The maximum time to wait for the cluster to be ready in seconds. If None, waits indefinitely.
+            dashboard_check (bool):
+                Flag to determine if the dashboard readiness should
+                be checked. Defaults to True.
+
+        Raises:
+            TimeoutError:
+                If the timeout is reached before the cluster or dashboard is ready.
+        """
+        start = monotonic()
+        delay = WAIT_READY_INITIAL_BACKOFF_SECONDS
+        watches = [
+            _get_namespace_watch("ray.io", "v1", self.config.namespace, "rayclusters")
+        ]
+        if self.config.appwrapper:
+            # The RayCluster is only created once the AppWrapper is admitted
+            watches.append(
+                _get_namespace_watch(
+                    "workload.codeflare.dev",
+                    "v1beta2",
+                    self.config.namespace,
+                    "appwrappers",
+                )
+            )
+        while True:
+            if timeout and monotonic() - start >= timeout:
+                raise TimeoutError(
+                    f"wait() timed out after waiting {timeout}s for cluster to be ready"
+                )
+            if all(w.watch_permitted for w in watches):
+                # Subscribed before reading the status, so that no change is missed
+                changes = [(w, w.subscribe(self.config.name)) for w in watches]
+                try:
+                    _, ready = await self.status(print_to_console=False)
+                    if ready:
+                        break
+                    # The status is also read again now and then, should a change be missed
+                    await asyncio.wait(
+                        [change for _, change in changes],
+                        timeout=_bounded_delay(WATCH_TIMEOUT_SECONDS, start, timeout),
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                finally:
+                    for w, change in changes:
+                        w.unsubscribe(self.config.name, change)
+                continue
+            _, ready = await self.status(print_to_console=False)
+            if ready:
+                break
+            await asyncio.sleep(_bounded_delay(delay, start, timeout))
+            delay = min(delay * 2, WAIT_READY_MAX_BACKOFF_SECONDS)
+
+        delay = WAIT_READY_INITIAL_BACKOFF_SECONDS
+        while dashboard_check:
+            if timeout and monotonic() - start >= timeout:
+                raise TimeoutError(
+                    f"wait() timed out after waiting {timeout}s for dashboard to be ready"
+                )
+            if await self.is_dashboard_ready():
+                break
+            await asyncio.sleep(_bounded_delay(delay, start, timeout))
+            delay = min(delay * 2, DASHBOARD_MAX_BACKOFF_SECONDS)
+
+
+def _bounded_delay(delay: float, start: float, timeout: Optional[float]) -> float:
+    if not timeout:
+        return delay
+    return max(0, min(delay, timeout - (monotonic() - start)))
+
+
+async def get_cluster_async(
+    cluster_name: str,
+    namespace: str = "default",
+    verify_tls: bool = True,
+    write_to_file: bool = False,
+) -> Optional[AsyncCluster]:
+    """
+    Retrieves an existing Ray Cluster or AppWrapper as an AsyncCluster object.
+
+    See `get_cluster` for details on the arguments.
+    """
+    cluster = await _run(
+        get_cluster,
+        cluster_name,
+        namespace=namespace,
+        verify_tls=verify_tls,
+        write_to_file=write_to_file,
+    )
+    if cluster is None:
+        return None
+    return AsyncCluster(cluster)
+
+
+async def list_all_clusters_async(
+    namespace: Optional[str] = None,
+    print_to_console: bool = True,
+    filter: Optional[List[RayClusterStatus]] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    page_size: Optional[int] = None,
+    namespaces: Optional[List[str]] = None,
+    all_namespaces: bool = False,
+) -> List[RayCluster]:
+    """
+    Returns (and prints by default) a list of all clusters in a given namespace, in several
+    namespaces, or in every namespace.
+
+    See `list_all_clusters` for details on the arguments.
+    """
+    _check_namespace_arguments(namespace, namespaces, all_namespaces)
+    return await _run(
+        list_all_clusters,
+        namespace,
+        print_to_console=print_to_console,
+        filter=filter,
+        label_selector=label_selector,
+        field_selector=field_selector,
+        page_size=page_size,
+        namespaces=namespaces,
+        all_namespaces=all_namespaces,
+    )
@@ -16,34 +16,29 @@
     This sub-module exists primarily to be used internally by the Cluster object
     (in the cluster sub-module) for RayCluster/AppWrapper generation.
 """
-from typing import List, Union, Tuple, Dict
-from ...common import _kube_api_error_handling
-from ...common.kubernetes_cluster import get_api_client, config_check
-from kubernetes.client.exceptions import ApiException
+from typing import Any, List, Union, Tuple, Dict
+from ...common.utils.yaml_io import write_yaml
+from ...common.kueue.kueue import (
+    get_default_kueue_name,
+    local_queue_exists,
+    QUEUE_NAME_LABEL,
+)
 import codeflare_sdk
+import datetime
 import os
 
-from kubernetes import client
 from kubernetes.client import (
-    V1ObjectMeta,
     V1KeyToPath,
     V1ConfigMapVolumeSource,
     V1Volume,
     V1VolumeMount,
-    V1ResourceRequirements,
-    V1Container,
     V1ContainerPort,
     V1Lifecycle,
     V1ExecAction,
     V1LifecycleHandler,
-    V1EnvVar,
-    V1PodTemplateSpec,
-    V1PodSpec,
-    V1LocalObjectReference,
     V1Toleration,
 )
 
-import yaml
 import uuid
 import sys
 import warnings
@@ -92,18 +87,85 @@ VOLUMES = [
     ),
 ]
 
+RAY_LIFECYCLE = V1Lifecycle(
+    pre_stop=V1LifecycleHandler(_exec=V1ExecAction(["/bin/sh", "-c", "ray stop"]))
+)
+
+HEAD_PORTS = [
+    V1ContainerPort(name="gcs", container_port=6379),
+    V1ContainerPort(name="dashboard", container_port=8265),
+    V1ContainerPort(name="client", container_port=10001),
+]
+
 SUPPORTED_PYTHON_VERSIONS = {
     "3.9": "quay.io/modh/ray@sha256:0d715f92570a2997381b7cafc0e224cfa25323f18b9545acfd23bc2b71576d06",
     "3.11": "quay.io/modh/ray@sha256:db667df1bc437a7b0965e8031e905d3ab04b86390d764d120e05ea5a5c18d1b4",
 }
 
+_PRIMITIVE_TYPES = (float, bool, bytes, str, int)
+
+
+def serialize(obj: Any) -> Any:
+    """
+    Converts Kubernetes model objects, and any lists/dicts containing them, to the plain
+    structure sent to the API server. This produces the same output as
+    `ApiClient.sanitize_for_serialization`, without needing an ApiClient or a kube config.
+    """
+    if obj is None or isinstance(obj, _PRIMITIVE_TYPES):
+        return obj
+    if isinstance(obj, list):
+        return [serialize(sub_obj) for sub_obj in obj]
+    if isinstance(obj, tuple):
+        return tuple(serialize(sub_obj) for sub_obj in obj)
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, dict):
+        return {key: serialize(val) for key, val in obj.items()}
+    return {
+        obj.attribute_map[attr]: serialize(getattr(obj, attr))
+        for attr in obj.openapi_types
+        if getattr(obj, attr) is not None
+    }
+
+
+# The parts of the manifest that never change, serialized once. serialize() copies plain
+# dicts and lists, so each build gets its own copy of them.
+_SERIALIZED_VOLUMES = serialize(VOLUMES)
+_SERIALIZED_VOLUME_MOUNTS = serialize(VOLUME_MOUNTS)
+_HEAD_CONTAINER_BASE = {
+    "imagePullPolicy": "Always",
+    "lifecycle": serialize(RAY_LIFECYCLE),
+    "name": "ray-head",
+    "ports": serialize(HEAD_PORTS),
+}
+_WORKER_CONTAINER_BASE = {
+    "imagePullPolicy": "Always",
+    "lifecycle": serialize(RAY_LIFECYCLE),
+    "name": "machine-learning",
+}
+
 
 # RayCluster/AppWrapper builder function
 def build_ray_cluster(cluster: "codeflare_sdk.ray.cluster.Cluster"):
     """build_ray_cluster is used for creating a Ray Cluster/AppWrapper dict
 
-    The resource is a dict template which uses Kubernetes Objects for creating metadata, resource requests,
-    specs and containers. The result is sanitised and returned either as a dict or written as a yaml file.
+    The resource is assembled from pre-serialized base fragments patched with the cluster configuration,
+    so that it can be built without an API client. It is returned either as a dict or written as a yaml file.
+    """
+    resource = build_resource(cluster)
+
+    # write_to_file functionality
+    if cluster.config.write_to_file:
+        return write_to_file(cluster, resource)  # Writes the file and returns its name
+    else:
+        print(f"Yaml resources loaded for {cluster.config.name}")
+        return resource  # Returns the Resource as a dict
+
+
+def build_resource(cluster: "codeflare_sdk.ray.cluster.Cluster", offline: bool = False):
+    """
+    The build_resource() function builds and returns the Ray Cluster/AppWrapper dict of a cluster.
+    When offline is True the local queue is taken from the configuration as is, so that the API server is never contacted.
     """
     ray_version = "2.35.0"
 
@@ -121,7 +183,7 @@ def build_ray_cluster(cluster: "codeflare_sdk.ray.cluster.Cluster"):
     resource = {
         "apiVersion": "ray.io/v1",
         "kind": "RayCluster",
-        "metadata": get_metadata(cluster),
+        "metadata": get_metadata(cluster, offline),
         "spec": {
             "rayVersion": ray_version,
             "enableInTreeAutoscaling": False,
@@ -158,55 +220,47 @@ def build_ray_cluster(cluster: "codeflare_sdk.ray.cluster.Cluster"):
                         "num-gpus": str(worker_gpu_count),
                         "resources": worker_resources,
                     },
-                    "template": V1PodTemplateSpec(
-                        spec=get_pod_spec(
+                    "template": {
+                        "spec": get_pod_spec(
                             cluster,
                             [get_worker_container_spec(cluster)],
                             cluster.config.worker_tolerations,
                         )
-                    ),
+                    },
                 }
             ],
         },
     }
 
-    config_check()
-    k8s_client = get_api_client() or client.ApiClient()
-
     if cluster.config.appwrapper:
         # Wrap the Ray Cluster in an AppWrapper
         appwrapper_name, _ = gen_names(cluster.config.name)
-        resource = wrap_cluster(cluster, appwrapper_name, resource)
-
-    resource = k8s_client.sanitize_for_serialization(resource)
+        resource = wrap_cluster(cluster, appwrapper_name, resource, offline)
 
-    # write_to_file functionality
-    if cluster.config.write_to_file:
-        return write_to_file(cluster, resource)  # Writes the file and returns its name
-    else:
-        print(f"Yaml resources loaded for {cluster.config.name}")
-        return resource  # Returns the Resource as a dict
+    return resource
 
 
 # Metadata related functions
-def get_metadata(cluster: "codeflare_sdk.ray.cluster.Cluster"):
+def get_metadata(cluster: "codeflare_sdk.ray.cluster.Cluster", offline: bool = False):
     """
-    The get_metadata() function builds and returns a V1ObjectMeta Object using cluster configurtation parameters
+    The get_metadata() function builds and returns the serialized ObjectMeta using cluster configurtation parameters
     """
-    object_meta = V1ObjectMeta(
-        name=cluster.config.name,
-        namespace=cluster.config.namespace,
-        labels=get_labels(cluster),
-    )
+    object_meta = {}
 
     # Get the NB annotation if it exists - could be useful in future for a "annotations" parameter.
     annotations = with_nb_annotations(cluster.config.annotations)
     if annotations != {}:
-        object_meta.annotations = annotations  # As annotations are not a guarantee they are appended to the metadata after creation.
+        object_meta["annotations"] = serialize(annotations)
+    object_meta["labels"] = serialize(get_labels(cluster, offline))
+    # Keys are kept in the order of the ObjectMeta fields, with unset fields left out
+    if cluster.config.name is not None:
+        object_meta["name"] = cluster.config.name
+    if cluster.config.namespace is not None:
+        object_meta["namespace"] = cluster.config.namespace
     return object_meta
 
 
-def get_labels(cluster: "codeflare_sdk.ray.cluster.Cluster"):
+def get_labels(cluster: "codeflare_sdk.ray.cluster.Cluster", offline: bool = False):
     """
     The get_labels() function generates a dict "labels" which includes the base label, local queue label and user defined labels
     """
@@ -217,7 +271,7 @@ def get_labels(cluster: "codeflare_sdk.ray.cluster.Cluster"):
         labels.update(cluster.config.labels)
 
     if cluster.config.appwrapper is False:
-        add_queue_label(cluster, labels)
+        add_queue_label(cluster, labels, offline)
 
     return labels
 
@@ -256,30 +310,28 @@ def get_pod_spec(
     cluster: "codeflare_sdk.ray.cluster.Cluster",
     containers: List,
     tolerations: List[V1Toleration],
-) -> V1PodSpec:
+) -> dict:
     """
-    The get_pod_spec() function generates a V1PodSpec for the head/worker containers
+    The get_pod_spec() function generates the serialized PodSpec for the head/worker containers
     """
-
-    pod_spec = V1PodSpec(
-        containers=containers,
-        volumes=generate_custom_storage(cluster.config.volumes, VOLUMES),
-        tolerations=tolerations or None,
-    )
-
+    pod_spec = {"containers": containers}
     if cluster.config.image_pull_secrets != []:
-        pod_spec.image_pull_secrets = generate_image_pull_secrets(cluster)
-
+        pod_spec["imagePullSecrets"] = generate_image_pull_secrets(cluster)
+    if tolerations:
+        pod_spec["tolerations"] = serialize(tolerations)
+    pod_spec["volumes"] = generate_custom_storage(
+        cluster.config.volumes, _SERIALIZED_VOLUMES
+    )
     return pod_spec
 
 
 def generate_image_pull_secrets(cluster: "codeflare_sdk.ray.cluster.Cluster"):
     """
-    The generate_image_pull_secrets() methods generates a list of V1LocalObjectReference including each of the specified image pull secrets
+    The generate_image_pull_secrets() methods generates a list of serialized LocalObjectReferences including each of the specified image pull secrets
     """
     pull_secrets = []
     for pull_secret in cluster.config.image_pull_secrets:
-        pull_secrets.append(V1LocalObjectReference(name=pull_secret))
+        pull_secrets.append({"name": pull_secret} if pull_secret is not None else {})
 
     return pull_secrets
 
@@ -288,46 +340,30 @@ def get_head_container_spec(
     cluster: "codeflare_sdk.ray.cluster.Cluster",
 ):
     """
-    The get_head_container_spec() function builds and returns a V1Container object including user defined resource requests/limits
-    """
-    head_container = V1Container(
-        name="ray-head",
-        image=update_image(cluster.config.image),
-        image_pull_policy="Always",
-        ports=[
-            V1ContainerPort(name="gcs", container_port=6379),
-            V1ContainerPort(name="dashboard", container_port=8265),
-            V1ContainerPort(name="client", container_port=10001),
-        ],
-        lifecycle=V1Lifecycle(
-            pre_stop=V1LifecycleHandler(
-                _exec=V1ExecAction(["/bin/sh", "-c", "ray stop"])
-            )
-        ),
-        resources=get_resources(
+    The get_head_container_spec() function builds and returns the serialized Container including user defined resource requests/limits
+    """
+    return _container_spec(
+        cluster,
+        _HEAD_CONTAINER_BASE,
+        get_resources(
             cluster.config.head_cpu_requests,
             cluster.config.head_cpu_limits,
             cluster.config.head_memory_requests,
             cluster.config.head_memory_limits,
             cluster.config.head_extended_resource_requests,
         ),
-        volume_mounts=generate_custom_storage(
-            cluster.config.volume_mounts, VOLUME_MOUNTS
-        ),
     )
-    if cluster.config.envs != {}:
-        head_container.env = generate_env_vars(cluster)
-
-    return head_container
 
 
 def generate_env_vars(cluster: "codeflare_sdk.ray.cluster.Cluster"):
     """
-    The generate_env_vars() builds and returns a V1EnvVar object which is populated by user specified environment variables
+    The generate_env_vars() builds and returns a list of serialized EnvVars which is populated by user specified environment variables
     """
     envs = []
     for key, value in cluster.config.envs.items():
-        env_var = V1EnvVar(name=key, value=value)
+        env_var = {"name": key}
+        if value is not None:
+            env_var["value"] = serialize(value)
         envs.append(env_var)
 
     return envs
@@ -337,33 +373,37 @@ def get_worker_container_spec(
     cluster: "codeflare_sdk.ray.cluster.Cluster",
 ):
     """
-    The get_worker_container_spec() function builds and returns a V1Container object including user defined resource requests/limits
+    The get_worker_container_spec() function builds and returns the serialized Container including user defined resource requests/limits
     """
-    worker_container = V1Container(
-        name="machine-learning",
-        image=update_image(cluster.config.image),
-        image_pull_policy="Always",
-        lifecycle=V1Lifecycle(
-            pre_stop=V1LifecycleHandler(
-                _exec=V1ExecAction(["/bin/sh", "-c", "ray stop"])
-            )
-        ),
-        resources=get_resources(
+    return _container_spec(
+        cluster,
+        _WORKER_CONTAINER_BASE,
+        get_resources(
             cluster.config.worker_cpu_requests,
             cluster.config.worker_cpu_limits,
             cluster.config.worker_memory_requests,
             cluster.config.worker_memory_limits,
             cluster.config.worker_extended_resource_requests,
         ),
-        volume_mounts=generate_custom_storage(
-            cluster.config.volume_mounts, VOLUME_MOUNTS
-        ),
     )
 
-    if cluster.config.envs != {}:
-        worker_container.env = generate_env_vars(cluster)
 
-    return worker_container
+def _container_spec(
+    cluster: "codeflare_sdk.ray.cluster.Cluster", base: dict, resources: dict
+) -> dict:
+    # Keys are kept in the order of the Container fields, with unset fields left out
+    container = {}
+    if cluster.config.envs != {}:
+        container["env"] = generate_env_vars(cluster)
+    image = update_image(cluster.config.image)
+    if image is not None:
+        container["image"] = image
+    container.update(serialize(base))
+    container["resources"] = resources
+    container["volumeMounts"] = generate_custom_storage(
+        cluster.config.volume_mounts, _SERIALIZED_VOLUME_MOUNTS
+    )
+    return container
 
 
 def get_resources(
@@ -374,20 +414,18 @@ def get_resources(
     custom_extended_resource_requests: Dict[str, int] = None,
 ):
     """
-    The get_resources() function generates a V1ResourceRequirements object for cpu/memory request/limits and GPU resources
+    The get_resources() function generates the serialized ResourceRequirements for cpu/memory request/limits and GPU resources
     """
-    resource_requirements = V1ResourceRequirements(
-        requests={"cpu": cpu_requests, "memory": memory_requests},
-        limits={"cpu": cpu_limits, "memory": memory_limits},
-    )
+    limits = {"cpu": cpu_limits, "memory": memory_limits}
+    requests = {"cpu": cpu_requests, "memory": memory_requests}
 
     # Append the resource/limit requests with custom extended resources
     if custom_extended_resource_requests is not None:
         for k in custom_extended_resource_requests.keys():
-            resource_requirements.limits[k] = custom_extended_resource_requests[k]
-            resource_requirements.requests[k] = custom_extended_resource_requests[k]
+            limits[k] = custom_extended_resource_requests[k]
+            requests[k] = custom_extended_resource_requests[k]
 
-    return resource_requirements
+    return {"limits": serialize(limits), "requests": serialize(requests)}
 
 
 # GPU related functions
@@ -449,71 +487,26 @@ def head_worker_extended_resources_from_cluster(
 
 
 # Local Queue related functions
-def add_queue_label(cluster: "codeflare_sdk.ray.cluster.Cluster", labels: dict):
+def add_queue_label(
+    cluster: "codeflare_sdk.ray.cluster.Cluster", labels: dict, offline: bool = False
+):
     """
     The add_queue_label() function updates the given base labels with the local queue label if Kueue exists on the Cluster
     """
-    lq_name = cluster.config.local_queue or get_default_local_queue(cluster, labels)
+    if offline:
+        # The default local queue and the existence of the given one cannot be checked offline
+        if cluster.config.local_queue:
+            labels.update({QUEUE_NAME_LABEL: cluster.config.local_queue})
+        return
+    namespace = cluster.config.namespace
+    lq_name = cluster.config.local_queue or get_default_kueue_name(namespace)
     if lq_name == None:
         return
-    elif not local_queue_exists(cluster):
+    elif not local_queue_exists(namespace, lq_name):
         raise ValueError(
             "local_queue provided does not exist or is not in this namespace. Please provide the correct local_queue name in Cluster Configuration"
         )
-    labels.update({"kueue.x-k8s.io/queue-name": lq_name})
-
-
-def local_queue_exists(cluster: "codeflare_sdk.ray.cluster.Cluster"):
-    """
-    The local_queue_exists() checks if the user inputted local_queue exists in the given namespace and returns a bool
-    """
-    # get all local queues in the namespace
-    try:
-        config_check()
-        api_instance = client.CustomObjectsApi(get_api_client())
-        local_queues = api_instance.list_namespaced_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            namespace=cluster.config.namespace,
-            plural="localqueues",
-        )
-    except Exception as e:  # pragma: no cover
-        return _kube_api_error_handling(e)
-    # check if local queue with the name provided in cluster config exists
-    for lq in local_queues["items"]:
-        if lq["metadata"]["name"] == cluster.config.local_queue:
-            return True
-    return False
-
-
-def get_default_local_queue(cluster: "codeflare_sdk.ray.cluster.Cluster", labels: dict):
-    """
-    The get_default_local_queue() function attempts to find a local queue with the default label == true, if that is the case the labels variable is updated with that local queue
-    """
-    try:
-        # Try to get the default local queue if it exists and append the label list
-        config_check()
-        api_instance = client.CustomObjectsApi(get_api_client())
-        local_queues = api_instance.list_namespaced_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            namespace=cluster.config.namespace,
-            plural="localqueues",
-        )
-    except ApiException as e:  # pragma: no cover
-        if e.status == 404 or e.status == 403:
-            return
-        else:
-            return _kube_api_error_handling(e)
-
-    for lq in local_queues["items"]:
-        if (
-            "annotations" in lq["metadata"]
-            and "kueue.x-k8s.io/default-queue" in lq["metadata"]["annotations"]
-            and lq["metadata"]["annotations"]["kueue.x-k8s.io/default-queue"].lower()
-            == "true"
-        ):
-            labels.update({"kueue.x-k8s.io/queue-name": lq["metadata"]["name"]})
+    labels.update({QUEUE_NAME_LABEL: lq_name})
 
 
 # AppWrapper related functions
@@ -521,6 +514,7 @@ def wrap_cluster(
     cluster: "codeflare_sdk.ray.cluster.Cluster",
     appwrapper_name: str,
     ray_cluster_yaml: dict,
+    offline: bool = False,
 ):
     """
     Wraps the pre-built Ray Cluster dict in an AppWrapper
@@ -533,7 +527,7 @@ def wrap_cluster(
     }
     # Add local queue label if it is necessary
     labels = {}
-    add_queue_label(cluster, labels)
+    add_queue_label(cluster, labels, offline)
     if labels != {}:
         wrapping["metadata"]["labels"] = labels
 
@@ -543,18 +537,10 @@ def wrap_cluster(
 # Etc.
 def generate_custom_storage(provided_storage: list, default_storage: list):
     """
-    The generate_custom_storage function updates the volumes/volume mounts configs with the default volumes/volume mounts.
+    The generate_custom_storage function serializes the volumes/volume mounts configs and appends the default volumes/volume mounts.
     """
-    storage_list = provided_storage.copy()
-
-    if storage_list == []:
-        storage_list = default_storage
-    else:
-        # We append the list of volumes/volume mounts with the defaults and return the full list
-        for storage in default_storage:
-            storage_list.append(storage)
-
-    return storage_list
+    # We append the list of volumes/volume mounts with the defaults and return the full list
+    return serialize(provided_storage) + serialize(default_storage)
 
 
 def write_to_file(cluster: "codeflare_sdk.ray.cluster.Cluster", resource: dict):
@@ -563,13 +549,7 @@ def write_to_file(cluster: "codeflare_sdk.ray.cluster.Cluster", resource: dict):
     """
     directory_path = os.path.expanduser("~/.codeflare/resources/")
     output_file_name = os.path.join(directory_path, cluster.config.name + ".yaml")
-
-    directory_path = os.path.dirname(output_file_name)
-    if not os.path.exists(directory_path):
-        os.makedirs(directory_path)
-
-    with open(output_file_name, "w") as outfile:
-        yaml.dump(resource, outfile, default_flow_style=False)
+    write_yaml(output_file_name, resource)
 
     print(f"Written to: {output_file_name}")
     return output_file_name
@@ -18,19 +18,28 @@ the resources requested by the user. It also contains functions for checking the
 cluster setup queue, a list of all existing clusters, and the user's working namespace.
 """
 
-from time import sleep
-from typing import List, Optional, Tuple, Dict
-
-from ray.job_submission import JobSubmissionClient
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, sleep
+from typing import Iterator, List, Optional, Tuple, Dict, Union
 
 from ...common.kubernetes_cluster.auth import (
     config_check,
     get_api_client,
 )
+from ...common.kubernetes_cluster.api_discovery import (
+    ROUTE_API_VERSION,
+    is_api_served,
+)
+from ...common.kubernetes_cluster.selectors import (
+    field_selector_matcher,
+    label_selector_matcher,
+)
 from . import pretty_print
+from .informers import get_fresh_informer
 from .build_ray_cluster import build_ray_cluster, head_worker_gpu_count_from_cluster
 from .build_ray_cluster import write_to_file as write_cluster_to_file
 from ...common import _kube_api_error_handling
+from ...common.utils.yaml_io import load_yaml, load_yaml_all
 
 from .config import ClusterConfiguration
 from .status import (
@@ -42,25 +51,27 @@ from ..appwrapper import (
     AppWrapper,
     AppWrapperStatus,
 )
-from ...common.widgets.widgets import (
-    cluster_up_down_buttons,
-    is_notebook,
-)
 from kubernetes import client
 import yaml
 import os
 import requests
 
 from kubernetes import config
+from kubernetes import watch
 from kubernetes.dynamic import DynamicClient
 from kubernetes import client as k8s_client
-from kubernetes.client.rest import ApiException
-
 from kubernetes.client.rest import ApiException
 import warnings
 
 CF_SDK_FIELD_MANAGER = "codeflare-sdk"
 
+WAIT_READY_INITIAL_BACKOFF_SECONDS = 1
+WAIT_READY_MAX_BACKOFF_SECONDS = 10
+DASHBOARD_MAX_BACKOFF_SECONDS = 5
+WATCH_TIMEOUT_SECONDS = 60
+DEFAULT_LIST_PAGE_SIZE = 100
+MAX_LIST_WORKERS = 16
+
 
 class Cluster:
     """
@@ -87,6 +98,9 @@ class Cluster:
         else:
             self.resource_yaml = self.create_resource()
 
+        # The widgets pull in ipywidgets, IPython and pandas, so they are only imported here
+        from ...common.widgets.widgets import cluster_up_down_buttons, is_notebook
+
         if is_notebook():
             cluster_up_down_buttons(self)
 
@@ -111,6 +125,8 @@ class Cluster:
 
     @property
     def job_client(self):
+        from ray.job_submission import JobSubmissionClient
+
         k8client = get_api_client()
         if self._job_submission_client:
             return self._job_submission_client
@@ -159,15 +175,14 @@ class Cluster:
             api_instance = client.CustomObjectsApi(get_api_client())
             if self.config.appwrapper:
                 if self.config.write_to_file:
-                    with open(self.resource_yaml) as f:
-                        aw = yaml.load(f, Loader=yaml.FullLoader)
-                        api_instance.create_namespaced_custom_object(
-                            group="workload.codeflare.dev",
-                            version="v1beta2",
-                            namespace=namespace,
-                            plural="appwrappers",
-                            body=aw,
-                        )
+                    aw = load_yaml(self.resource_yaml)
+                    api_instance.create_namespaced_custom_object(
+                        group="workload.codeflare.dev",
+                        version="v1beta2",
+                        namespace=namespace,
+                        plural="appwrappers",
+                        body=aw,
+                    )
                 else:
                     api_instance.create_namespaced_custom_object(
                         group="workload.codeflare.dev",
@@ -193,46 +208,49 @@ class Cluster:
         """
         # check if RayCluster CustomResourceDefinition exists if not throw RuntimeError
         self._throw_for_no_raycluster()
-        namespace = self.config.namespace
-        name = self.config.name
         try:
-            self.config_check()
-            api_instance = client.CustomObjectsApi(get_api_client())
-            crds = self.get_dynamic_client().resources
-            if self.config.appwrapper:
-                api_version = "workload.codeflare.dev/v1beta2"
-                api_instance = crds.get(api_version=api_version, kind="AppWrapper")
-                # defaulting body to resource_yaml
-                body = self.resource_yaml
-                if self.config.write_to_file:
-                    # if write_to_file is True, load the file from AppWrapper yaml and update body
-                    with open(self.resource_yaml) as f:
-                        aw = yaml.load(f, Loader=yaml.FullLoader)
-                    body = aw
-                api_instance.server_side_apply(
-                    field_manager=CF_SDK_FIELD_MANAGER,
-                    group="workload.codeflare.dev",
-                    version="v1beta2",
-                    namespace=namespace,
-                    plural="appwrappers",
-                    body=body,
-                    force_conflicts=force,
-                )
-                print(
-                    f"AppWrapper: '{name}' configuration has successfully been applied"
-                )
-            else:
-                api_version = "ray.io/v1"
-                api_instance = crds.get(api_version=api_version, kind="RayCluster")
-                self._component_resources_apply(
-                    namespace=namespace, api_instance=api_instance
-                )
-                print(f"Ray Cluster: '{name}' has successfully been applied")
+            self._apply(force)
         except AttributeError as e:
             raise RuntimeError(f"Failed to initialize DynamicClient: {e}")
         except Exception as e:  # pragma: no cover
             return _kube_api_error_handling(e)
 
+    def _apply(self, force=False, crds=None):
+        """
+        Server-side applies the Cluster yaml, raising any API error to the caller.
+        A shared DynamicClient resource registry can be passed in with `crds`.
+        """
+        namespace = self.config.namespace
+        name = self.config.name
+        self.config_check()
+        if crds is None:
+            crds = self.get_dynamic_client().resources
+        if self.config.appwrapper:
+            api_version = "workload.codeflare.dev/v1beta2"
+            api_instance = crds.get(api_version=api_version, kind="AppWrapper")
+            # defaulting body to resource_yaml
+            body = self.resource_yaml
+            if self.config.write_to_file:
+                # if write_to_file is True, load the file from AppWrapper yaml and update body
+                body = load_yaml(self.resource_yaml)
+            api_instance.server_side_apply(
+                field_manager=CF_SDK_FIELD_MANAGER,
+                group="workload.codeflare.dev",
+                version="v1beta2",
+                namespace=namespace,
+                plural="appwrappers",
+                body=body,
+                force_conflicts=force,
+            )
+            print(f"AppWrapper: '{name}' configuration has successfully been applied")
+        else:
+            api_version = "ray.io/v1"
+            api_instance = crds.get(api_version=api_version, kind="RayCluster")
+            self._component_resources_apply(
+                namespace=namespace, api_instance=api_instance
+            )
+            print(f"Ray Cluster: '{name}' has successfully been applied")
+
     def _throw_for_no_raycluster(self):
         api_instance = client.CustomObjectsApi(get_api_client())
         try:
@@ -257,29 +275,33 @@ class Cluster:
         Deletes the AppWrapper yaml, scaling-down and deleting all resources
         associated with the cluster.
         """
-        namespace = self.config.namespace
-        resource_name = self.config.name
         self._throw_for_no_raycluster()
         try:
-            self.config_check()
-            api_instance = client.CustomObjectsApi(get_api_client())
-            if self.config.appwrapper:
-                api_instance.delete_namespaced_custom_object(
-                    group="workload.codeflare.dev",
-                    version="v1beta2",
-                    namespace=namespace,
-                    plural="appwrappers",
-                    name=resource_name,
-                )
-                print(f"AppWrapper: '{resource_name}' has successfully been deleted")
-            else:
-                _delete_resources(resource_name, namespace, api_instance)
-                print(
-                    f"Ray Cluster: '{self.config.name}' has successfully been deleted"
-                )
+            self._down()
         except Exception as e:  # pragma: no cover
             return _kube_api_error_handling(e)
 
+    def _down(self):
+        """
+        Deletes the Cluster resources, raising any API error to the caller.
+        """
+        namespace = self.config.namespace
+        resource_name = self.config.name
+        self.config_check()
+        api_instance = client.CustomObjectsApi(get_api_client())
+        if self.config.appwrapper:
+            api_instance.delete_namespaced_custom_object(
+                group="workload.codeflare.dev",
+                version="v1beta2",
+                namespace=namespace,
+                plural="appwrappers",
+                name=resource_name,
+            )
+            print(f"AppWrapper: '{resource_name}' has successfully been deleted")
+        else:
+            _delete_resources(resource_name, namespace, api_instance)
+            print(f"Ray Cluster: '{self.config.name}' has successfully been deleted")
+
     def status(
         self, print_to_console: bool = True
     ) -> Tuple[CodeFlareClusterStatus, bool]:
@@ -383,9 +405,12 @@ class Cluster:
         """
         Waits for the requested cluster to be ready, up to an optional timeout.
 
-        This method checks the status of the cluster every five seconds until it is
-        ready or the timeout is reached. If dashboard_check is enabled, it will also
-        check for the readiness of the dashboard.
+        This method opens a Kubernetes watch on the RayCluster and re-checks the cluster
+        status as soon as it changes, until it is ready or the timeout is reached. While the
+        AppWrapper of a cluster created with `appwrapper=True` is queued, the AppWrapper is
+        watched instead. If watches are not permitted, it falls back to polling with
+        exponential backoff.
+        If dashboard_check is enabled, it will also check for the readiness of the dashboard.
 
         Args:
             timeout (Optional[int]):
@@ -399,9 +424,10 @@ class Cluster:
                 If the timeout is reached before the cluster or dashboard is ready.
         """
         print("Waiting for requested resources to be set up...")
-        time = 0
+        start = monotonic()
+        watcher = _ClusterWatcher(self.config)
         while True:
-            if timeout and time >= timeout:
+            if timeout and monotonic() - start >= timeout:
                 raise TimeoutError(
                     f"wait() timed out after waiting {timeout}s for cluster to be ready"
                 )
@@ -412,20 +438,21 @@ class Cluster:
                 )
             if ready:
                 break
-            sleep(5)
-            time += 5
+            watcher.for_status(status).wait_for_change(_remaining_time(start, timeout))
         print("Requested cluster is up and running!")
 
+        delay = WAIT_READY_INITIAL_BACKOFF_SECONDS
         while dashboard_check:
-            if timeout and time >= timeout:
+            if timeout and monotonic() - start >= timeout:
                 raise TimeoutError(
                     f"wait() timed out after waiting {timeout}s for dashboard to be ready"
                 )
             if self.is_dashboard_ready():
                 print("Dashboard is ready!")
                 break
-            sleep(5)
-            time += 5
+            remaining = _remaining_time(start, timeout)
+            sleep(delay if remaining is None else min(delay, remaining))
+            delay = min(delay * 2, DASHBOARD_MAX_BACKOFF_SECONDS)
 
     def details(self, print_to_console: bool = True) -> RayCluster:
         """
@@ -459,47 +486,14 @@ class Cluster:
         Returns a string containing the cluster's dashboard URI.
         """
         config_check()
-        if _is_openshift_cluster():
-            try:
-                api_instance = client.CustomObjectsApi(get_api_client())
-                routes = api_instance.list_namespaced_custom_object(
-                    group="route.openshift.io",
-                    version="v1",
-                    namespace=self.config.namespace,
-                    plural="routes",
-                )
-            except Exception as e:  # pragma: no cover
-                return _kube_api_error_handling(e)
-
-            for route in routes["items"]:
-                if route["metadata"][
-                    "name"
-                ] == f"ray-dashboard-{self.config.name}" or route["metadata"][
-                    "name"
-                ].startswith(
-                    f"{self.config.name}-ingress"
-                ):
-                    protocol = "https" if route["spec"].get("tls") else "http"
-                    return f"{protocol}://{route['spec']['host']}"
-        else:
-            try:
-                api_instance = client.NetworkingV1Api(get_api_client())
-                ingresses = api_instance.list_namespaced_ingress(self.config.namespace)
-            except Exception as e:  # pragma no cover
-                return _kube_api_error_handling(e)
-
-            for ingress in ingresses.items:
-                annotations = ingress.metadata.annotations
-                protocol = "http"
-                if (
-                    ingress.metadata.name == f"ray-dashboard-{self.config.name}"
-                    or ingress.metadata.name.startswith(f"{self.config.name}-ingress")
-                ):
-                    if annotations == None:
-                        protocol = "http"
-                    elif "route.openshift.io/termination" in annotations:
-                        protocol = "https"
-                return f"{protocol}://{ingress.spec.rules[0].host}"
+        try:
+            dashboard_urls = _get_dashboard_urls(self.config.namespace)
+        except Exception as e:  # pragma: no cover
+            return _kube_api_error_handling(e)
+
+        dashboard_url = _dashboard_url_for(self.config.name, dashboard_urls)
+        if dashboard_url is not None:
+            return dashboard_url
         return "Dashboard not available yet, have you run cluster.up()?"
 
     def list_jobs(self) -> List:
@@ -514,10 +508,20 @@ class Cluster:
         """
         return self.job_client.get_job_status(job_id)
 
-    def job_logs(self, job_id: str) -> str:
+    def job_logs(
+        self, job_id: str, since: Optional[int] = None
+    ) -> Union[str, Tuple[str, int]]:
         """
         This method accesses the head ray node in your cluster and returns the logs for the provided job id.
+
+        When a cursor is passed as `since` (0 for the first call), only the logs written since
+        the cursor are returned, together with the cursor for the next call. These logs are
+        spooled on disk, and those of finished jobs are then read from the spool.
         """
+        if since is not None:
+            from ..client.log_spool import read_job_logs
+
+            return read_job_logs(self.job_client, job_id, since)
         return self.job_client.get_job_logs(job_id)
 
     @staticmethod
@@ -558,9 +562,8 @@ class Cluster:
         self, namespace: str, api_instance: client.CustomObjectsApi
     ):
         if self.config.write_to_file:
-            with open(self.resource_yaml) as f:
-                ray_cluster = yaml.safe_load(f)
-                _create_resources(ray_cluster, namespace, api_instance)
+            ray_cluster = load_yaml(self.resource_yaml)
+            _create_resources(ray_cluster, namespace, api_instance)
         else:
             _create_resources(self.resource_yaml, namespace, api_instance)
 
@@ -568,9 +571,8 @@ class Cluster:
         self, namespace: str, api_instance: client.CustomObjectsApi
     ):
         if self.config.write_to_file:
-            with open(self.resource_yaml) as f:
-                ray_cluster = yaml.safe_load(f)
-                _apply_ray_cluster(ray_cluster, namespace, api_instance)
+            ray_cluster = load_yaml(self.resource_yaml)
+            _apply_ray_cluster(ray_cluster, namespace, api_instance)
         else:
             _apply_ray_cluster(self.resource_yaml, namespace, api_instance)
 
@@ -579,38 +581,305 @@ class Cluster:
     ):
         cluster_name = self.config.name
         if self.config.write_to_file:
-            with open(self.resource_yaml) as f:
-                yamls = yaml.load_all(f, Loader=yaml.FullLoader)
-                _delete_resources(yamls, namespace, api_instance, cluster_name)
+            yamls = load_yaml_all(self.resource_yaml)
+            _delete_resources(yamls, namespace, api_instance, cluster_name)
         else:
             yamls = yaml.safe_load_all(self.resource_yaml)
             _delete_resources(yamls, namespace, api_instance, cluster_name)
 
 
-def list_all_clusters(namespace: str, print_to_console: bool = True):
+class _ResourceWatcher:
     """
-    Returns (and prints by default) a list of all clusters in a given namespace.
+    Blocks until a single namespaced custom object changes, using a Kubernetes watch
+    that resumes from the last seen resourceVersion. If watches are forbidden (or the
+    watch connection fails), it falls back to sleeping with exponential backoff.
     """
-    clusters = _get_ray_clusters(namespace)
+
+    def __init__(
+        self, group: str, version: str, namespace: str, plural: str, name: str
+    ):
+        self.group = group
+        self.version = version
+        self.namespace = namespace
+        self.plural = plural
+        self.name = name
+        self.resource_version = None
+        self.watch_permitted = True
+        self._backoff = WAIT_READY_INITIAL_BACKOFF_SECONDS
+
+    def wait_for_change(self, timeout: Optional[float] = None):
+        """
+        Returns as soon as the watched object changes, or once `timeout` seconds have passed.
+        """
+        if self.watch_permitted:
+            try:
+                self._watch(timeout)
+                self._backoff = WAIT_READY_INITIAL_BACKOFF_SECONDS
+                return
+            except ApiException as e:
+                if e.status == 410:
+                    # The resourceVersion is too old, restart the watch from the current state
+                    self.resource_version = None
+                    return
+                if e.status in [401, 403, 405]:
+                    self.watch_permitted = False
+            except Exception:
+                pass
+        self._sleep(timeout)
+
+    def _watch(self, timeout: Optional[float]):
+        watch_timeout = WATCH_TIMEOUT_SECONDS
+        if timeout is not None:
+            watch_timeout = max(1, min(watch_timeout, int(timeout)))
+        kwargs = {}
+        if self.resource_version is not None:
+            kwargs["resource_version"] = self.resource_version
+
+        api_instance = client.CustomObjectsApi(get_api_client())
+        stream_watch = watch.Watch()
+        for event in stream_watch.stream(
+            api_instance.list_namespaced_custom_object,
+            group=self.group,
+            version=self.version,
+            namespace=self.namespace,
+            plural=self.plural,
+            field_selector=f"metadata.name={self.name}",
+            timeout_seconds=watch_timeout,
+            _request_timeout=watch_timeout + 5,
+            **kwargs,
+        ):
+            resource_version = (
+                event["object"].get("metadata", {}).get("resourceVersion")
+            )
+            if resource_version:
+                self.resource_version = resource_version
+            stream_watch.stop()
+            return
+
+    def _sleep(self, timeout: Optional[float]):
+        delay = self._backoff
+        if timeout is not None:
+            delay = min(delay, timeout)
+        sleep(delay)
+        self._backoff = min(self._backoff * 2, WAIT_READY_MAX_BACKOFF_SECONDS)
+
+
+class _ClusterWatcher:
+    """
+    Picks the resource to watch for changes while waiting for a cluster to be ready: its
+    AppWrapper while an AppWrapper cluster is queued, and its RayCluster otherwise.
+    """
+
+    def __init__(self, config: ClusterConfiguration):
+        self.appwrapper = config.appwrapper
+        self.ray_cluster = _ResourceWatcher(
+            group="ray.io",
+            version="v1",
+            namespace=config.namespace,
+            plural="rayclusters",
+            name=config.name,
+        )
+        self.app_wrapper = _ResourceWatcher(
+            group="workload.codeflare.dev",
+            version="v1beta2",
+            namespace=config.namespace,
+            plural="appwrappers",
+            name=config.name,
+        )
+
+    def for_status(self, status: CodeFlareClusterStatus) -> _ResourceWatcher:
+        if self.appwrapper and status in [
+            CodeFlareClusterStatus.QUEUED,
+            CodeFlareClusterStatus.QUEUEING,
+            CodeFlareClusterStatus.UNKNOWN,
+        ]:
+            # The RayCluster is only created once the AppWrapper is admitted
+            return self.app_wrapper
+        return self.ray_cluster
+
+
+def _remaining_time(start: float, timeout: Optional[float]) -> Optional[float]:
+    if not timeout:
+        return None
+    return max(0, timeout - (monotonic() - start))
+
+
+def list_all_clusters(
+    namespace: Optional[str] = None,
+    print_to_console: bool = True,
+    filter: Optional[List[RayClusterStatus]] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    page_size: Optional[int] = None,
+    namespaces: Optional[List[str]] = None,
+    all_namespaces: bool = False,
+):
+    """
+    Returns (and prints by default) a list of all clusters in a given namespace, in several
+    namespaces, or in every namespace.
+
+    Args:
+        namespace (Optional[str]):
+            The namespace to list clusters from.
+        print_to_console (bool):
+            Whether to print the clusters. Defaults to True.
+        filter (Optional[List[RayClusterStatus]]):
+            Only return clusters in one of these states.
+        label_selector (Optional[str]):
+            Only return clusters whose labels match this selector, e.g. `team=a,experiment in (x, y)`.
+        field_selector (Optional[str]):
+            Only return clusters matching this field selector, e.g. `metadata.name=my-cluster`.
+        page_size (Optional[int]):
+            If set, clusters are fetched this many at a time instead of in a single response.
+        namespaces (Optional[List[str]]):
+            The namespaces to list clusters from, instead of `namespace`. They are listed concurrently.
+        all_namespaces (bool):
+            Whether to list the clusters of every namespace. Uses a single cluster-wide list if
+            permitted, otherwise lists each OpenShift project the user can access concurrently.
+
+    Raises:
+        ValueError:
+            If none of `namespace`, `namespaces` or `all_namespaces` is given.
+    """
+    _check_namespace_arguments(namespace, namespaces, all_namespaces)
+    if namespaces is None and not all_namespaces:
+        clusters = _get_ray_clusters(
+            namespace,
+            filter=filter,
+            label_selector=label_selector,
+            field_selector=field_selector,
+            page_size=page_size,
+        )
+    else:
+        try:
+            config_check()
+            clusters = list(
+                _iter_ray_clusters_across_namespaces(
+                    None if all_namespaces else namespaces,
+                    filter,
+                    label_selector,
+                    field_selector,
+                    page_size,
+                )
+            )
+        except Exception as e:  # pragma: no cover
+            return _kube_api_error_handling(e)
     if print_to_console:
         pretty_print.print_clusters(clusters)
     return clusters
 
 
+def iter_clusters(
+    namespace: Optional[str] = None,
+    page_size: int = DEFAULT_LIST_PAGE_SIZE,
+    filter: Optional[List[RayClusterStatus]] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    namespaces: Optional[List[str]] = None,
+    all_namespaces: bool = False,
+) -> Iterator[RayCluster]:
+    """
+    Yields the clusters in a given namespace, in several namespaces, or in every namespace,
+    one at a time.
+
+    Clusters are listed `page_size` at a time using the Kubernetes `limit`/`continue`
+    tokens, and the next page is only requested once the previous one has been consumed,
+    so memory use does not grow with the number of clusters.
+
+    Args:
+        namespace (Optional[str]):
+            The namespace to list clusters from.
+        page_size (int):
+            The number of clusters requested per page. Defaults to 100.
+        filter (Optional[List[RayClusterStatus]]):
+            Only yield clusters in one of these states.
+        label_selector (Optional[str]):
+            Only yield clusters whose labels match this selector.
+        field_selector (Optional[str]):
+            Only yield clusters matching this field selector.
+        namespaces (Optional[List[str]]):
+            The namespaces to list clusters from, instead of `namespace`. They are listed
+            concurrently and yielded in the given order.
+        all_namespaces (bool):
+            Whether to yield the clusters of every namespace.
+
+    Returns:
+        Iterator[RayCluster]:
+            The details of each cluster.
+
+    Raises:
+        ValueError:
+            If none of `namespace`, `namespaces` or `all_namespaces` is given.
+        ApiException:
+            If a page of clusters can't be listed. A page whose continue token has expired
+            is listed again instead.
+    """
+    # Checked here rather than in the generator, so that a missing namespace fails at the call
+    _check_namespace_arguments(namespace, namespaces, all_namespaces)
+    return _iter_clusters(
+        namespace,
+        page_size,
+        filter,
+        label_selector,
+        field_selector,
+        None if all_namespaces else namespaces,
+        all_namespaces,
+    )
+
+
+def _iter_clusters(
+    namespace: Optional[str],
+    page_size: int,
+    filter: Optional[List[RayClusterStatus]],
+    label_selector: Optional[str],
+    field_selector: Optional[str],
+    namespaces: Optional[List[str]],
+    all_namespaces: bool,
+) -> Iterator[RayCluster]:
+    # Errors are raised rather than printed, so that a failed page doesn't look like the end
+    config_check()
+    if namespaces is None and not all_namespaces:
+        yield from _iter_ray_clusters(
+            namespace, filter, label_selector, field_selector, page_size
+        )
+    else:
+        yield from _iter_ray_clusters_across_namespaces(
+            namespaces, filter, label_selector, field_selector, page_size
+        )
+
+
 def list_all_queued(
-    namespace: str, print_to_console: bool = True, appwrapper: bool = False
+    namespace: str,
+    print_to_console: bool = True,
+    appwrapper: bool = False,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    page_size: Optional[int] = None,
 ):
     """
     Returns (and prints by default) a list of all currently queued-up Ray Clusters
     in a given namespace.
+
+    The selectors are sent to the API server, and `page_size` fetches the resources that
+    many at a time. See `list_all_clusters` for details on the arguments.
     """
     if appwrapper:
-        resources = _get_app_wrappers(namespace, filter=[AppWrapperStatus.SUSPENDED])
+        resources = _get_app_wrappers(
+            namespace,
+            filter=[AppWrapperStatus.SUSPENDED],
+            label_selector=label_selector,
+            field_selector=field_selector,
+            page_size=page_size,
+        )
         if print_to_console:
             pretty_print.print_app_wrappers_status(resources)
     else:
         resources = _get_ray_clusters(
-            namespace, filter=[RayClusterStatus.READY, RayClusterStatus.SUSPENDED]
+            namespace,
+            filter=[RayClusterStatus.READY, RayClusterStatus.SUSPENDED],
+            label_selector=label_selector,
+            field_selector=field_selector,
+            page_size=page_size,
         )
         if print_to_console:
             pretty_print.print_ray_clusters_status(resources)
@@ -828,19 +1097,109 @@ def _apply_ray_cluster(
 def _check_aw_exists(name: str, namespace: str) -> bool:
     try:
         config_check()
-        api_instance = client.CustomObjectsApi(get_api_client())
-        aws = api_instance.list_namespaced_custom_object(
+        aw = _get_custom_object(
             group="workload.codeflare.dev",
             version="v1beta2",
             namespace=namespace,
             plural="appwrappers",
+            name=name,
         )
     except Exception as e:  # pragma: no cover
         return _kube_api_error_handling(e, print_error=False)
-    for aw in aws["items"]:
-        if aw["metadata"]["name"] == name:
-            return True
-    return False
+    return aw is not None
+
+
+def _get_custom_object(
+    group: str, version: str, namespace: str, plural: str, name: str
+) -> Optional[dict]:
+    """
+    Gets a single namespaced custom object by name, returning None if it does not exist.
+    """
+    informer = get_fresh_informer(namespace, plural)
+    if informer is not None:
+        return informer.get(name)
+    api_instance = client.CustomObjectsApi(get_api_client())
+    try:
+        return api_instance.get_namespaced_custom_object(
+            group=group,
+            version=version,
+            namespace=namespace,
+            plural=plural,
+            name=name,
+        )
+    except ApiException as e:
+        if e.status == 404:
+            return None
+        raise
+
+
+def _iter_custom_objects(
+    group: str,
+    version: str,
+    namespace: Optional[str],
+    plural: str,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    page_size: Optional[int] = None,
+) -> Iterator[dict]:
+    """
+    Yields the custom objects of a kind matching the given selectors, in a namespace or in
+    every namespace if `namespace` is None.
+
+    Objects come from memory if an informer is running and the selectors can be evaluated
+    locally. Otherwise the selectors are sent to the API server and, if `page_size` is set,
+    the objects are fetched `page_size` at a time using `limit`/`continue`.
+    """
+    informer = get_fresh_informer(namespace, plural) if namespace else None
+    if informer is not None:
+        matchers = []
+        if label_selector:
+            matchers.append(label_selector_matcher(label_selector))
+        if field_selector:
+            matchers.append(field_selector_matcher(field_selector))
+        if None not in matchers:
+            for obj in informer.list():
+                if all(matches(obj) for matches in matchers):
+                    yield obj
+            return
+
+    api_instance = client.CustomObjectsApi(get_api_client())
+    kwargs = {}
+    if label_selector:
+        kwargs["label_selector"] = label_selector
+    if field_selector:
+        kwargs["field_selector"] = field_selector
+    if page_size:
+        kwargs["limit"] = page_size
+    if namespace is not None:
+        kwargs["namespace"] = namespace
+        list_func = api_instance.list_namespaced_custom_object
+    else:
+        list_func = api_instance.list_cluster_custom_object
+    # Lists are ordered by namespace and name, so after a relist the objects already
+    # yielded are the ones up to the last yielded key
+    last_key = None
+    relisted = False
+    while True:
+        try:
+            page = list_func(group=group, version=version, plural=plural, **kwargs)
+        except ApiException as e:
+            if e.status != 410 or "_continue" not in kwargs:
+                raise
+            # The continue token expired, list again and skip the objects already yielded
+            del kwargs["_continue"]
+            relisted = True
+            continue
+        for obj in page["items"]:
+            key = (obj["metadata"].get("namespace") or "", obj["metadata"]["name"])
+            if relisted and last_key is not None and key <= last_key:
+                continue
+            last_key = key
+            yield obj
+        continue_token = (page.get("metadata") or {}).get("continue")
+        if not page_size or not continue_token:
+            return
+        kwargs["_continue"] = continue_token
 
 
 # Cant test this until get_current_namespace is fixed and placed in this function over using `self`
@@ -888,142 +1247,206 @@ def _get_ingress_domain(self):  # pragma: no cover
 def _app_wrapper_status(name, namespace="default") -> Optional[AppWrapper]:
     try:
         config_check()
-        api_instance = client.CustomObjectsApi(get_api_client())
-        aws = api_instance.list_namespaced_custom_object(
+        aw = _get_custom_object(
             group="workload.codeflare.dev",
             version="v1beta2",
             namespace=namespace,
             plural="appwrappers",
+            name=name,
         )
     except Exception as e:  # pragma: no cover
         return _kube_api_error_handling(e)
 
-    for aw in aws["items"]:
-        if aw["metadata"]["name"] == name:
-            return _map_to_app_wrapper(aw)
+    if aw is not None:
+        return _map_to_app_wrapper(aw)
     return None
 
 
 def _ray_cluster_status(name, namespace="default") -> Optional[RayCluster]:
     try:
         config_check()
-        api_instance = client.CustomObjectsApi(get_api_client())
-        rcs = api_instance.list_namespaced_custom_object(
+        rc = _get_custom_object(
             group="ray.io",
             version="v1",
             namespace=namespace,
             plural="rayclusters",
+            name=name,
         )
     except Exception as e:  # pragma: no cover
         return _kube_api_error_handling(e)
 
-    for rc in rcs["items"]:
-        if rc["metadata"]["name"] == name:
-            return _map_to_ray_cluster(rc)
+    if rc is not None:
+        return _map_to_ray_cluster(rc)
     return None
 
 
 def _get_ray_clusters(
-    namespace="default", filter: Optional[List[RayClusterStatus]] = None
+    namespace="default",
+    filter: Optional[List[RayClusterStatus]] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    page_size: Optional[int] = None,
 ) -> List[RayCluster]:
-    list_of_clusters = []
     try:
         config_check()
-        api_instance = client.CustomObjectsApi(get_api_client())
-        rcs = api_instance.list_namespaced_custom_object(
-            group="ray.io",
-            version="v1",
-            namespace=namespace,
-            plural="rayclusters",
+        return list(
+            _iter_ray_clusters(
+                namespace, filter, label_selector, field_selector, page_size
+            )
         )
     except Exception as e:  # pragma: no cover
         return _kube_api_error_handling(e)
 
-    # Get a list of RCs with the filter if it is passed to the function
-    if filter is not None:
-        for rc in rcs["items"]:
-            ray_cluster = _map_to_ray_cluster(rc)
-            if filter and ray_cluster.status in filter:
-                list_of_clusters.append(ray_cluster)
-    else:
-        for rc in rcs["items"]:
-            list_of_clusters.append(_map_to_ray_cluster(rc))
-    return list_of_clusters
+
+def _iter_ray_clusters(
+    namespace: Optional[str],
+    filter: Optional[List[RayClusterStatus]] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    page_size: Optional[int] = None,
+) -> Iterator[RayCluster]:
+    # With namespace None, the clusters of every namespace are listed in a single request
+    dashboard_urls = None
+    for rc in _iter_custom_objects(
+        group="ray.io",
+        version="v1",
+        namespace=namespace,
+        plural="rayclusters",
+        label_selector=label_selector,
+        field_selector=field_selector,
+        page_size=page_size,
+    ):
+        if dashboard_urls is None:
+            # Fetch the routes/ingresses once and join them against the clusters in memory
+            dashboard_urls = _get_dashboard_urls_by_namespace(namespace)
+        ray_cluster = _map_to_ray_cluster(
+            rc, dashboard_urls.get(rc["metadata"]["namespace"], {})
+        )
+        # Status is not a selectable field, so the status filter is applied here
+        if filter is None or ray_cluster.status in filter:
+            yield ray_cluster
+
+
+def _iter_ray_clusters_across_namespaces(
+    namespaces: Optional[List[str]],
+    filter: Optional[List[RayClusterStatus]] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    page_size: Optional[int] = None,
+) -> Iterator[RayCluster]:
+    """
+    Yields the clusters of several namespaces, or of every namespace if `namespaces` is None.
+
+    Every namespace is listed with one cluster-wide request when RBAC permits it. Otherwise
+    the namespaces are listed concurrently on a bounded pool, skipping namespaces the user
+    cannot access, and their clusters are yielded in namespace order.
+    """
+    skip_forbidden = False
+    if namespaces is None:
+        yielded = False
+        try:
+            for ray_cluster in _iter_ray_clusters(
+                None, filter, label_selector, field_selector, page_size
+            ):
+                yielded = True
+                yield ray_cluster
+            return
+        except ApiException as e:
+            if e.status != 403 or yielded:
+                raise
+        namespaces = _list_accessible_namespaces()
+        skip_forbidden = True
+
+    def list_namespace(namespace: str) -> List[RayCluster]:
+        try:
+            return list(
+                _iter_ray_clusters(
+                    namespace, filter, label_selector, field_selector, page_size
+                )
+            )
+        except ApiException as e:
+            if skip_forbidden and e.status == 403:
+                return []
+            raise
+
+    if not namespaces:
+        return
+    pool = ThreadPoolExecutor(max_workers=min(MAX_LIST_WORKERS, len(namespaces)))
+    try:
+        futures = [pool.submit(list_namespace, ns) for ns in namespaces]
+        for future in futures:
+            yield from future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _list_accessible_namespaces() -> List[str]:
+    # Listing namespaces needs the same cluster-wide permission that was just denied, whereas
+    # OpenShift lists the projects a user can access to any user
+    try:
+        projects = client.CustomObjectsApi(get_api_client()).list_cluster_custom_object(
+            group="project.openshift.io", version="v1", plural="projects"
+        )
+    except ApiException as e:
+        if e.status not in [403, 404]:
+            raise
+        raise PermissionError(
+            "Listing the clusters of every namespace is forbidden, pass the namespaces to "
+            "list with `namespaces=` instead."
+        ) from e
+    return [project["metadata"]["name"] for project in projects["items"]]
+
+
+def _check_namespace_arguments(
+    namespace: Optional[str], namespaces: Optional[List[str]], all_namespaces: bool
+):
+    if namespace is None and namespaces is None and not all_namespaces:
+        raise ValueError(
+            "One of `namespace`, `namespaces` or `all_namespaces=True` must be given."
+        )
 
 
 def _get_app_wrappers(
-    namespace="default", filter=List[AppWrapperStatus]
+    namespace="default",
+    filter: Optional[List[AppWrapperStatus]] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    page_size: Optional[int] = None,
 ) -> List[AppWrapper]:
     list_of_app_wrappers = []
-
     try:
         config_check()
-        api_instance = client.CustomObjectsApi(get_api_client())
-        aws = api_instance.list_namespaced_custom_object(
+        for item in _iter_custom_objects(
             group="workload.codeflare.dev",
             version="v1beta2",
             namespace=namespace,
             plural="appwrappers",
-        )
+            label_selector=label_selector,
+            field_selector=field_selector,
+            page_size=page_size,
+        ):
+            app_wrapper = _map_to_app_wrapper(item)
+            if filter is None or app_wrapper.status in filter:
+                list_of_app_wrappers.append(app_wrapper)
     except Exception as e:  # pragma: no cover
         return _kube_api_error_handling(e)
-
-    for item in aws["items"]:
-        app_wrapper = _map_to_app_wrapper(item)
-        if filter and app_wrapper.status in filter:
-            list_of_app_wrappers.append(app_wrapper)
-        else:
-            # Unsure what the purpose of the filter is
-            list_of_app_wrappers.append(app_wrapper)
     return list_of_app_wrappers
 
 
-def _map_to_ray_cluster(rc) -> Optional[RayCluster]:
+def _map_to_ray_cluster(
+    rc, dashboard_urls: Optional[Dict[str, str]] = None
+) -> Optional[RayCluster]:
     if "status" in rc and "state" in rc["status"]:
         status = RayClusterStatus(rc["status"]["state"].lower())
     else:
         status = RayClusterStatus.UNKNOWN
-    config_check()
-    dashboard_url = None
-    if _is_openshift_cluster():
+    if dashboard_urls is None:
+        config_check()
         try:
-            api_instance = client.CustomObjectsApi(get_api_client())
-            routes = api_instance.list_namespaced_custom_object(
-                group="route.openshift.io",
-                version="v1",
-                namespace=rc["metadata"]["namespace"],
-                plural="routes",
-            )
+            dashboard_urls = _get_dashboard_urls(rc["metadata"]["namespace"])
         except Exception as e:  # pragma: no cover
             return _kube_api_error_handling(e)
-
-        for route in routes["items"]:
-            rc_name = rc["metadata"]["name"]
-            if route["metadata"]["name"] == f"ray-dashboard-{rc_name}" or route[
-                "metadata"
-            ]["name"].startswith(f"{rc_name}-ingress"):
-                protocol = "https" if route["spec"].get("tls") else "http"
-                dashboard_url = f"{protocol}://{route['spec']['host']}"
-    else:
-        try:
-            api_instance = client.NetworkingV1Api(get_api_client())
-            ingresses = api_instance.list_namespaced_ingress(
-                rc["metadata"]["namespace"]
-            )
-        except Exception as e:  # pragma no cover
-            return _kube_api_error_handling(e)
-        for ingress in ingresses.items:
-            annotations = ingress.metadata.annotations
-            protocol = "http"
-            if (
-                ingress.metadata.name == f"ray-dashboard-{rc['metadata']['name']}"
-                or ingress.metadata.name.startswith(f"{rc['metadata']['name']}-ingress")
-            ):
-                if annotations == None:
-                    protocol = "http"
-                elif "route.openshift.io/termination" in annotations:
-                    protocol = "https"
-            dashboard_url = f"{protocol}://{ingress.spec.rules[0].host}"
+    dashboard_url = _dashboard_url_for(rc["metadata"]["name"], dashboard_urls)
 
     (
         head_extended_resources,
@@ -1066,6 +1489,77 @@ def _map_to_ray_cluster(rc) -> Optional[RayCluster]:
     )
 
 
+def _get_dashboard_urls(namespace: str) -> Dict[str, str]:
+    """
+    Lists the routes (on OpenShift) or ingresses in a namespace once and returns the
+    URL each of them exposes, keyed by route/ingress name.
+    """
+    return _get_dashboard_urls_by_namespace(namespace).get(namespace, {})
+
+
+def _get_dashboard_urls_by_namespace(
+    namespace: Optional[str],
+) -> Dict[str, Dict[str, str]]:
+    """
+    Lists the routes (on OpenShift) or ingresses in a namespace, or in every namespace if
+    `namespace` is None, and returns the URL each of them exposes, keyed by namespace and
+    then by route/ingress name.
+    """
+    dashboard_urls = {}
+    if _is_openshift_cluster():
+        routes = _iter_custom_objects(
+            group="route.openshift.io",
+            version="v1",
+            namespace=namespace,
+            plural="routes",
+        )
+        for route in routes:
+            host = route["spec"].get("host")
+            if host is None:
+                continue
+            protocol = "https" if route["spec"].get("tls") else "http"
+            route_namespace = route["metadata"].get("namespace") or namespace
+            dashboard_urls.setdefault(route_namespace, {})[
+                route["metadata"]["name"]
+            ] = f"{protocol}://{host}"
+    else:
+        informer = get_fresh_informer(namespace, "ingresses") if namespace else None
+        if informer is not None:
+            ingresses = informer.list()
+        else:
+            api_instance = client.NetworkingV1Api(get_api_client())
+            if namespace is not None:
+                ingress_list = api_instance.list_namespaced_ingress(namespace)
+            else:
+                ingress_list = api_instance.list_ingress_for_all_namespaces()
+            ingresses = [ingress.to_dict() for ingress in ingress_list.items]
+        for ingress in ingresses:
+            if not ingress["spec"].get("rules"):
+                continue
+            annotations = ingress["metadata"].get("annotations")
+            protocol = "http"
+            if annotations != None and "route.openshift.io/termination" in annotations:
+                protocol = "https"
+            ingress_namespace = ingress["metadata"].get("namespace") or namespace
+            dashboard_urls.setdefault(ingress_namespace, {})[
+                ingress["metadata"]["name"]
+            ] = f"{protocol}://{ingress['spec']['rules'][0]['host']}"
+    return dashboard_urls
+
+
+def _dashboard_url_for(cluster_name: str, dashboard_urls: Dict[str, str]):
+    """
+    Picks the dashboard URL of a cluster out of the URLs returned by `_get_dashboard_urls`.
+    """
+    dashboard_url = dashboard_urls.get(f"ray-dashboard-{cluster_name}")
+    if dashboard_url is not None:
+        return dashboard_url
+    for name, url in dashboard_urls.items():
+        if name.startswith(f"{cluster_name}-ingress"):
+            return url
+    return None
+
+
 def _map_to_app_wrapper(aw) -> AppWrapper:
     if "status" in aw:
         return AppWrapper(
@@ -1105,11 +1599,6 @@ def _copy_to_ray(cluster: Cluster) -> RayCluster:
 def _is_openshift_cluster():
     try:
         config_check()
-        for api in client.ApisApi(get_api_client()).get_api_versions().groups:
-            for v in api.versions:
-                if "route.openshift.io/v1" in v.group_version:
-                    return True
-        else:
-            return False
+        return is_api_served(ROUTE_API_VERSION)
     except Exception as e:  # pragma: no cover
         return _kube_api_error_handling(e)
@@ -0,0 +1,211 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The fleet sub-module contains the definition of the ClusterFleet object, which builds,
+applies, waits for and deletes many Ray Clusters concurrently, e.g. for hyperparameter sweeps.
+"""
+
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import monotonic, sleep
+from typing import Dict, List, Optional, Tuple
+
+from .cluster import (
+    Cluster,
+    get_current_namespace,
+    WAIT_READY_INITIAL_BACKOFF_SECONDS,
+    WAIT_READY_MAX_BACKOFF_SECONDS,
+)
+from .config import ClusterConfiguration
+
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass
+class FleetResult:
+    """
+    For storing the outcome of a fleet operation on a single cluster.
+    """
+
+    name: str
+    namespace: str
+    succeeded: bool
+    error: Optional[Exception] = None
+
+
+class ClusterFleet:
+    """
+    An object for requesting, bringing up and taking down many clusters at once.
+
+    The resources of every ClusterConfiguration are built in parallel when the fleet is
+    created, and `apply()`/`down()` act on all clusters with a bounded pool of workers,
+    returning one FleetResult per cluster. A configuration that fails to build doesn't stop
+    the rest of the fleet: it is left out of `clusters` and reported in `build_errors`.
+    """
+
+    def __init__(
+        self,
+        configs: List[ClusterConfiguration],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        """
+        Create the fleet by passing in a list of ClusterConfigurations. Namespaces that are
+        not set are resolved once for the whole fleet.
+        """
+        self.max_workers = max_workers
+        current_namespace = None
+        for config in configs:
+            if config.namespace is None:
+                if current_namespace is None:
+                    current_namespace = get_current_namespace()
+                config.namespace = current_namespace
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            builds = list(pool.map(_try_build_cluster, configs))
+        self.clusters: List[Cluster] = [c for c, _ in builds if c is not None]
+        self.build_errors: List[FleetResult] = [r for _, r in builds if r is not None]
+
+    def apply(self, force: bool = False) -> List[FleetResult]:
+        """
+        Applies every cluster using server-side apply.
+        If 'force' is set to True, conflicts will be forced.
+
+        The configurations that failed to build are reported first, as failed results.
+        """
+        # The dynamic client is shared by the whole fleet, and created by the first cluster
+        # applied; should that fail, only that cluster fails and the next one tries again
+        crds = []
+        crds_lock = threading.Lock()
+
+        def apply_cluster(cluster: Cluster):
+            with crds_lock:
+                if not crds:
+                    crds.append(cluster.get_dynamic_client().resources)
+            cluster._apply(force, crds=crds[0])
+
+        return list(self.build_errors) + self._run_for_each(apply_cluster)
+
+    def down(self) -> List[FleetResult]:
+        """
+        Deletes every cluster, scaling-down and deleting all resources associated with them.
+        """
+        return self._run_for_each(lambda cluster: cluster._down())
+
+    def wait_all_ready(
+        self, timeout: Optional[int] = None, dashboard_check: bool = True
+    ):
+        """
+        Waits for every cluster in the fleet to be ready, up to an optional timeout.
+
+        All clusters that are not ready yet are checked together on each round, with
+        exponential backoff between rounds.
+
+        Args:
+            timeout (Optional[int]):
+                The maximum time to wait for the clusters to be ready in seconds. If None, waits indefinitely.
+            dashboard_check (bool):
+                Flag to determine if the dashboard readiness should
+                be checked. Defaults to True.
+
+        Raises:
+            TimeoutError:
+                If the timeout is reached before all clusters are ready.
+        """
+        print(f"Waiting for {len(self.clusters)} clusters to be set up...")
+        start = monotonic()
+        delay = WAIT_READY_INITIAL_BACKOFF_SECONDS
+        pending = list(self.clusters)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                ready = pool.map(
+                    lambda cluster: _is_ready(cluster, dashboard_check), pending
+                )
+                pending = [c for c, is_ready in zip(pending, ready) if not is_ready]
+                if not pending:
+                    break
+                elapsed = monotonic() - start
+                if timeout and elapsed >= timeout:
+                    names = ", ".join(c.config.name for c in pending)
+                    raise TimeoutError(
+                        f"wait_all_ready() timed out after waiting {timeout}s, clusters not ready: {names}"
+                    )
+                if timeout:
+                    delay = min(delay, timeout - elapsed)
+                sleep(delay)
+                delay = min(delay * 2, WAIT_READY_MAX_BACKOFF_SECONDS)
+        print("All requested clusters are up and running!")
+
+    def _run_for_each(self, operation) -> List[FleetResult]:
+        # The RayCluster CRD only needs to be checked once per namespace
+        crd_errors: Dict[str, Exception] = {}
+        for namespace, cluster in {
+            c.config.namespace: c for c in self.clusters
+        }.items():
+            try:
+                cluster._throw_for_no_raycluster()
+            except RuntimeError as e:
+                crd_errors[namespace] = e
+
+        def run(cluster: Cluster) -> FleetResult:
+            result = FleetResult(
+                name=cluster.config.name,
+                namespace=cluster.config.namespace,
+                succeeded=False,
+                error=crd_errors.get(cluster.config.namespace),
+            )
+            if result.error is not None:
+                return result
+            try:
+                operation(cluster)
+                result.succeeded = True
+            except Exception as e:
+                result.error = e
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(run, self.clusters))
+
+
+def _try_build_cluster(
+    config: ClusterConfiguration,
+) -> Tuple[Optional[Cluster], Optional[FleetResult]]:
+    try:
+        return _build_cluster(config), None
+    except Exception as e:
+        return None, FleetResult(
+            name=config.name, namespace=config.namespace, succeeded=False, error=e
+        )
+
+
+def _build_cluster(config: ClusterConfiguration) -> Cluster:
+    # Built like get_cluster() does, so that notebooks don't render widgets for every cluster
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore",
+            message="Please provide a ClusterConfiguration to initialise the Cluster object",
+        )
+        cluster = Cluster(None)
+    cluster.config = config
+    cluster.resource_yaml = cluster.create_resource()
+    return cluster
+
+
+def _is_ready(cluster: Cluster, dashboard_check: bool) -> bool:
+    _, ready = cluster.status(print_to_console=False)
+    if ready and dashboard_check:
+        return cluster.is_dashboard_ready()
+    return ready
@@ -0,0 +1,165 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The informers sub-module keeps opt-in, in-memory copies of the RayClusters, AppWrappers,
+dashboard routes/ingresses and Kueue local queues of a namespace. Once started, the read-side
+functions of the cluster sub-module (listing, status and dashboard lookups) and the local
+queue lookups of cluster builds are answered from memory for as long as the copies are no
+staler than the configured bound.
+"""
+
+import functools
+import threading
+from time import monotonic
+from typing import Dict, Optional, Tuple
+
+from kubernetes import client
+
+from ...common.kubernetes_cluster.auth import config_check, get_api_client
+from ...common.kubernetes_cluster.api_discovery import (
+    APPWRAPPER_API_GROUP,
+    KUEUE_API_GROUP,
+    ROUTE_API_VERSION,
+    is_api_served,
+)
+from ...common.kueue.kueue import KUEUE_API_VERSION
+from ...common.kubernetes_cluster.informer import (
+    INFORMER_WATCH_TIMEOUT_SECONDS,
+    Informer,
+)
+
+DEFAULT_MAX_STALENESS_SECONDS = 30
+DEFAULT_SYNC_TIMEOUT_SECONDS = 30
+
+# (namespace, plural) -> Informer
+_informers: Dict[Tuple[str, str], Informer] = {}
+# namespace -> the maximum staleness readers accept
+_max_staleness: Dict[str, float] = {}
+_informers_lock = threading.Lock()
+
+
+def start_informers(
+    namespace: str,
+    max_staleness_seconds: float = DEFAULT_MAX_STALENESS_SECONDS,
+    sync_timeout: Optional[float] = DEFAULT_SYNC_TIMEOUT_SECONDS,
+) -> bool:
+    """
+    Starts keeping the RayClusters, AppWrappers, dashboard routes (on OpenShift) or
+    ingresses, and local queues of a namespace in memory, so that listing clusters, checking
+    their status, looking up their dashboards and finding their local queue no longer query
+    the API server.
+
+    Each resource is listed once and then watched from a background thread. If nothing is
+    received from a watch for longer than `max_staleness_seconds`, e.g. because it was
+    disconnected, reads go to the API server again until it reconnects. A resource that can't
+    be listed (e.g. forbidden) is not kept in memory, and doesn't hold up the wait.
+
+    Args:
+        namespace (str):
+            The namespace to keep in memory.
+        max_staleness_seconds (float):
+            How far behind the API server the in-memory copy may be before it is ignored. Defaults to 30.
+        sync_timeout (Optional[float]):
+            The maximum time in seconds to wait for the initial lists. If None, waits indefinitely.
+
+    Returns:
+        bool:
+            True if every resource was listed within `sync_timeout`, False otherwise.
+    """
+    config_check()
+    api_client = get_api_client()
+    custom_api = client.CustomObjectsApi(api_client)
+
+    def custom_objects(group: str, version: str, plural: str):
+        return functools.partial(
+            custom_api.list_namespaced_custom_object,
+            group=group,
+            version=version,
+            namespace=namespace,
+            plural=plural,
+        )
+
+    list_funcs = {"rayclusters": custom_objects("ray.io", "v1", "rayclusters")}
+    if is_api_served(APPWRAPPER_API_GROUP):
+        list_funcs["appwrappers"] = custom_objects(
+            APPWRAPPER_API_GROUP, "v1beta2", "appwrappers"
+        )
+    if is_api_served(KUEUE_API_GROUP):
+        list_funcs["localqueues"] = custom_objects(
+            KUEUE_API_GROUP, KUEUE_API_VERSION, "localqueues"
+        )
+    if is_api_served(ROUTE_API_VERSION):
+        list_funcs["routes"] = custom_objects("route.openshift.io", "v1", "routes")
+    else:
+        list_funcs["ingresses"] = functools.partial(
+            client.NetworkingV1Api(api_client).list_namespaced_ingress, namespace
+        )
+
+    stop_informers(namespace)
+    # Watches are renewed often enough that a store whose objects don't change stays fresh
+    watch_timeout = min(
+        INFORMER_WATCH_TIMEOUT_SECONDS, max(1, max_staleness_seconds / 2)
+    )
+    informers = {
+        plural: Informer(
+            list_func, name=f"{plural}-{namespace}", watch_timeout_seconds=watch_timeout
+        )
+        for plural, list_func in list_funcs.items()
+    }
+    with _informers_lock:
+        _max_staleness[namespace] = max_staleness_seconds
+        for plural, informer in informers.items():
+            _informers[(namespace, plural)] = informer
+    for informer in informers.values():
+        informer.start()
+
+    start = monotonic()
+    synced = True
+    for informer in informers.values():
+        remaining = None
+        if sync_timeout is not None:
+            remaining = max(0, sync_timeout - (monotonic() - start))
+        synced = informer.wait_for_sync(remaining) and synced
+    return synced
+
+
+def stop_informers(namespace: Optional[str] = None):
+    """
+    Stops keeping a namespace in memory, so that reads query the API server again.
+
+    Args:
+        namespace (Optional[str]):
+            The namespace to stop. Stops every namespace when None.
+    """
+    with _informers_lock:
+        keys = [k for k in _informers if namespace is None or k[0] == namespace]
+        stopped = [_informers.pop(k) for k in keys]
+        for k in keys:
+            _max_staleness.pop(k[0], None)
+    for informer in stopped:
+        informer.stop()
+
+
+def get_fresh_informer(namespace: str, plural: str) -> Optional[Informer]:
+    """
+    Returns the informer of a resource in a namespace if one is running and within its
+    staleness bound, otherwise None.
+    """
+    with _informers_lock:
+        informer = _informers.get((namespace, plural))
+        max_staleness = _max_staleness.get(namespace)
+    if informer is None or not informer.is_fresh(max_staleness):
+        return None
+    return informer
@@ -0,0 +1,96 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The render sub-module renders the RayCluster/AppWrapper manifests of ClusterConfigurations
+entirely locally, without kube config, credentials or any API server contact, e.g. for CI or
+GitOps pipelines.
+"""
+
+import copy
+import os
+from collections import namedtuple
+from typing import List, Optional
+
+from ...common.utils.yaml_io import write_yaml, write_yaml_files
+from .build_ray_cluster import build_resource
+from .config import ClusterConfiguration
+
+# build_resource() only reads the configuration of the cluster it is given
+_OfflineCluster = namedtuple("_OfflineCluster", ["config"])
+
+
+def render_manifests(
+    configs: List[ClusterConfiguration],
+    namespace: Optional[str] = None,
+    local_queue: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    output_file: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> List[dict]:
+    """
+    Renders the RayCluster, or AppWrapper when `appwrapper=True`, of each configuration
+    without contacting the API server. The configurations themselves are not modified.
+
+    As Kueue cannot be queried offline, the local queue label is only set when a local queue
+    is given, and its existence is not checked.
+
+    Args:
+        configs (List[ClusterConfiguration]):
+            The configurations to render.
+        namespace (Optional[str]):
+            The namespace for configurations that don't set one.
+        local_queue (Optional[str]):
+            The local queue for configurations that don't set one.
+        output_dir (Optional[str]):
+            If set, each manifest is also written to `<output_dir>/<name>.yaml`.
+        output_file (Optional[str]):
+            If set, all manifests are also written to this file as a multi-document bundle.
+        max_workers (Optional[int]):
+            The maximum number of processes writing to `output_dir`. Defaults to the number of CPUs.
+
+    Returns:
+        List[dict]:
+            The rendered manifests, in the order of `configs`.
+
+    Raises:
+        ValueError:
+            If a configuration has no name, or no namespace is set for it.
+    """
+    manifests = []
+    for config in configs:
+        if not config.name:
+            raise ValueError("A name is required to render a ClusterConfiguration")
+        config = copy.copy(config)
+        config.namespace = config.namespace or namespace
+        config.local_queue = config.local_queue or local_queue
+        # Notebook annotations are added in place, so the user's dict is copied
+        config.annotations = dict(config.annotations)
+        if config.namespace is None:
+            raise ValueError(
+                f"No namespace set for {config.name}, please pass namespace=<namespace>"
+            )
+        manifests.append(build_resource(_OfflineCluster(config), offline=True))
+
+    if output_dir is not None:
+        write_yaml_files(
+            {
+                os.path.join(output_dir, config.name + ".yaml"): manifest
+                for config, manifest in zip(configs, manifests)
+            },
+            max_workers=max_workers,
+        )
+    if output_file is not None:
+        write_yaml(output_file, manifests)
+    return manifests
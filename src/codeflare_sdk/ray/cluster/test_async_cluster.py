@@ -0,0 +1,236 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from codeflare_sdk.ray.cluster import async_cluster as async_cluster_module
+from codeflare_sdk.ray.cluster.async_cluster import (
+    AsyncCluster,
+    get_cluster_async,
+    list_all_clusters_async,
+)
+from codeflare_sdk.ray.cluster.status import CodeFlareClusterStatus
+from kubernetes.client.rest import ApiException
+import asyncio
+import pytest
+import threading
+import time
+
+
+class FakeWatch:
+    """
+    Stands in for kubernetes.watch.Watch, sending a change of each name in `changes` every
+    few milliseconds until stopped, or raising `error`.
+    """
+
+    streams = []
+
+    def __init__(self, changes=(), error=None):
+        self.changes = changes
+        self.error = error
+        self.stopped = threading.Event()
+
+    def __call__(self):
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def stream(self, func, **kwargs):
+        FakeWatch.streams.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        deadline = time.monotonic() + 0.1
+        while not self.stopped.is_set() and time.monotonic() < deadline:
+            time.sleep(0.01)
+            for name in self.changes:
+                yield {
+                    "type": "MODIFIED",
+                    "object": {"metadata": {"name": name, "resourceVersion": "1"}},
+                }
+        self.stopped.clear()
+
+
+@pytest.fixture
+def fake_watch(mocker):
+    mocker.patch("codeflare_sdk.ray.cluster.async_cluster.get_api_client")
+    mocker.patch("kubernetes.client.CustomObjectsApi")
+    async_cluster_module._namespace_watches.clear()
+    FakeWatch.streams = []
+
+    def install(changes=(), error=None):
+        fake = FakeWatch(changes, error)
+        mocker.patch("codeflare_sdk.ray.cluster.async_cluster.watch.Watch", new=fake)
+        return fake
+
+    yield install
+    async_cluster_module._namespace_watches.clear()
+
+
+def mock_cluster(mocker, name="test", appwrapper=False):
+    cluster = mocker.Mock()
+    cluster.config.name = name
+    cluster.config.namespace = "ns"
+    cluster.config.appwrapper = appwrapper
+    return cluster
+
+
+def test_async_cluster_lifecycle(mocker, fake_watch):
+    fake_watch(changes=["test"])
+    cluster = mock_cluster(mocker)
+    cluster.status.side_effect = [
+        (CodeFlareClusterStatus.STARTING, False),
+        (CodeFlareClusterStatus.READY, True),
+    ]
+    cluster.is_dashboard_ready.side_effect = [False, True]
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.async_cluster.Cluster", return_value=cluster
+    )
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    mocker.patch("asyncio.sleep", side_effect=fake_sleep)
+
+    async def lifecycle():
+        async_cluster = await AsyncCluster.create(mocker.Mock(name="config"))
+        assert async_cluster.config == cluster.config
+        await async_cluster.apply(force=True)
+        await async_cluster.up()
+        await async_cluster.wait_ready(timeout=10)
+        await async_cluster.details(print_to_console=False)
+        await async_cluster.down()
+
+    asyncio.run(lifecycle())
+    cluster.apply.assert_called_once_with(force=True)
+    cluster.up.assert_called_once()
+    cluster.details.assert_called_once_with(print_to_console=False)
+    cluster.down.assert_called_once()
+    # The cluster status is watched, only the dashboard is polled
+    assert FakeWatch.streams[0]["plural"] == "rayclusters"
+    assert FakeWatch.streams[0]["namespace"] == "ns"
+    assert sleeps == [1]
+
+
+def test_async_cluster_wait_ready_without_watches(mocker, fake_watch):
+    fake_watch(error=ApiException(status=403))
+    cluster = mock_cluster(mocker)
+    cluster.status.side_effect = [
+        (CodeFlareClusterStatus.STARTING, False),
+        (CodeFlareClusterStatus.STARTING, False),
+        (CodeFlareClusterStatus.STARTING, False),
+        (CodeFlareClusterStatus.READY, True),
+    ]
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    mocker.patch("asyncio.sleep", side_effect=fake_sleep)
+    asyncio.run(AsyncCluster(cluster).wait_ready(dashboard_check=False, timeout=10))
+    # Once watches are forbidden, the event loop backs off instead
+    assert len(FakeWatch.streams) == 1
+    assert sleeps == [1, 2]
+
+
+def test_async_cluster_wait_ready_timeout(mocker, fake_watch):
+    fake_watch(changes=["other"])
+    clusters = [mock_cluster(mocker, name=f"test-{i}") for i in range(3)]
+    for cluster in clusters:
+        cluster.status.return_value = (CodeFlareClusterStatus.STARTING, False)
+
+    async def wait_all():
+        return await asyncio.gather(
+            *[AsyncCluster(c).wait_ready(timeout=0.2) for c in clusters],
+            return_exceptions=True,
+        )
+
+    start = time.monotonic()
+    results = asyncio.run(wait_all())
+    # Concurrent waits time out together, not one after the other
+    assert time.monotonic() - start < 1
+    assert all(isinstance(r, TimeoutError) for r in results)
+    namespace_watch = async_cluster_module._namespace_watches[
+        ("ray.io", "v1", "ns", "rayclusters")
+    ]
+    assert not namespace_watch._waiters
+
+
+def test_async_cluster_wait_ready_cancelled(mocker, fake_watch):
+    fake_watch()
+    cluster = mock_cluster(mocker, appwrapper=True)
+    cluster.status.return_value = (CodeFlareClusterStatus.QUEUED, False)
+
+    async def cancel_wait():
+        task = asyncio.create_task(AsyncCluster(cluster).wait_ready())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_wait())
+    # The cancelled task no longer waits on either watch
+    assert len(async_cluster_module._namespace_watches) == 2
+    for namespace_watch in async_cluster_module._namespace_watches.values():
+        assert not namespace_watch._waiters
+
+
+def test_many_clusters_share_the_executor(mocker, fake_watch):
+    fake_watch()
+    clusters = [mocker.Mock() for _ in range(20)]
+    for cluster in clusters:
+        cluster.status.return_value = (CodeFlareClusterStatus.READY, True)
+
+    async def wait_all():
+        await asyncio.gather(
+            *[
+                AsyncCluster(c).wait_ready(dashboard_check=False, timeout=10)
+                for c in clusters
+            ]
+        )
+
+    asyncio.run(wait_all())
+    assert all(c.status.call_count == 1 for c in clusters)
+
+
+def test_get_and_list_clusters_async(mocker):
+    cluster = mocker.Mock()
+    get_cluster = mocker.patch(
+        "codeflare_sdk.ray.cluster.async_cluster.get_cluster",
+        side_effect=[cluster, None],
+    )
+    list_all_clusters = mocker.patch(
+        "codeflare_sdk.ray.cluster.async_cluster.list_all_clusters",
+        return_value=["rc"],
+    )
+
+    async_cluster = asyncio.run(get_cluster_async("test", "ns"))
+    assert async_cluster.cluster is cluster
+    get_cluster.assert_called_with(
+        "test", namespace="ns", verify_tls=True, write_to_file=False
+    )
+    assert asyncio.run(get_cluster_async("missing", "ns")) is None
+
+    assert asyncio.run(
+        list_all_clusters_async("ns", print_to_console=False, label_selector="a=b")
+    ) == ["rc"]
+    list_all_clusters.assert_called_once_with(
+        "ns",
+        print_to_console=False,
+        filter=None,
+        label_selector="a=b",
+        field_selector=None,
+        page_size=None,
+        namespaces=None,
+        all_namespaces=False,
+    )
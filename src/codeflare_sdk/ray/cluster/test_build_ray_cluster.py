@@ -13,7 +13,18 @@
 # limitations under the License.
 from collections import namedtuple
 import sys
-from .build_ray_cluster import gen_names, update_image
+from .build_ray_cluster import (
+    build_ray_cluster,
+    gen_names,
+    serialize,
+    update_image,
+    VOLUMES,
+    VOLUME_MOUNTS,
+)
+from ...common.utils.unit_test_support import get_example_extended_storage_opts
+from .config import ClusterConfiguration
+from kubernetes import client
+from kubernetes.client import V1Toleration
 import uuid
 
 
@@ -65,3 +76,48 @@ def test_update_image_without_supported_python_version(mocker):
 
     # Assert that no image was set since the Python version is not supported
     assert image is None
+
+
+def test_serialize_matches_api_client():
+    volumes, volume_mounts = get_example_extended_storage_opts()
+    objects = {
+        "volumes": volumes + VOLUMES,
+        "volume_mounts": volume_mounts + VOLUME_MOUNTS,
+        "tolerations": [V1Toleration(key="key1", operator="Exists")],
+        "plain": {"a": [1, "b", None], "c": (2.5, True)},
+    }
+    expected = client.ApiClient().sanitize_for_serialization(objects)
+    assert serialize(objects) == expected
+
+
+def test_build_ray_cluster_without_api_client(mocker):
+    # Patched where build_ray_cluster's Kueue helpers look them up
+    config_check = mocker.patch("codeflare_sdk.common.kueue.kueue.config_check")
+    get_api_client = mocker.patch("codeflare_sdk.common.kueue.kueue.get_api_client")
+    new_api_client = mocker.spy(client.ApiClient, "__init__")
+    cluster = namedtuple("Cluster", ["config"])(
+        ClusterConfiguration(
+            name="unit-test-cluster",
+            namespace="ns",
+            appwrapper=True,
+            image="example/ray:tag",
+        )
+    )
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.build_ray_cluster.get_default_kueue_name",
+        return_value=None,
+    )
+
+    first = build_ray_cluster(cluster)
+    second = build_ray_cluster(cluster)
+    config_check.assert_not_called()
+    get_api_client.assert_not_called()
+    new_api_client.assert_not_called()
+
+    # Each build gets its own copy of the cached base manifest
+    assert first == second
+    ray_cluster = first["spec"]["components"][0]["template"]
+    head = ray_cluster["spec"]["headGroupSpec"]["template"]["spec"]
+    head["containers"][0]["ports"].clear()
+    head["volumes"].clear()
+    assert first != second
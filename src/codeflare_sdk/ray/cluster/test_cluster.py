@@ -33,12 +33,16 @@ from codeflare_sdk.common.utils.unit_test_support import (
     route_list_retrieval,
 )
 from codeflare_sdk.ray.cluster.cluster import _is_openshift_cluster
+from codeflare_sdk.ray.cluster.status import RayClusterStatus
 from pathlib import Path
 from unittest.mock import MagicMock
 from kubernetes import client
+from kubernetes.client.rest import ApiException
 import yaml
 import filecmp
 import os
+import asyncio
+import pytest
 
 parent = Path(__file__).resolve().parents[4]  # project directory
 expected_clusters_dir = f"{parent}/tests/test_cluster_yamls"
@@ -416,6 +420,13 @@ def test_ray_job_wrapping(mocker):
     mock_res.side_effect = ray_addr
     assert cluster.job_logs("fake_id") == cluster.cluster_dashboard_uri()
 
+    mock_res = mocker.patch(
+        "codeflare_sdk.ray.client.log_spool.read_job_logs",
+        return_value=("new logs\n", 9),
+    )
+    assert cluster.job_logs("fake_id", since=0) == ("new logs\n", 9)
+    mock_res.assert_called_once_with(cluster.job_client, "fake_id", 0)
+
 
 def test_local_client_url(mocker):
     mocker.patch(
@@ -561,6 +572,91 @@ def test_wait_ready(mocker, capsys):
     )
 
 
+def test_wait_ready_watches_app_wrapper(mocker):
+    from codeflare_sdk.ray.cluster.cluster import _ResourceWatcher
+    from codeflare_sdk.ray.cluster.status import CodeFlareClusterStatus
+
+    mocker.patch("kubernetes.client.ApisApi.get_api_versions")
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
+        return_value={"items": []},
+    )
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster.Cluster.status",
+        side_effect=[
+            (CodeFlareClusterStatus.QUEUED, False),
+            (CodeFlareClusterStatus.STARTING, False),
+            (CodeFlareClusterStatus.READY, True),
+        ],
+    )
+    watched = []
+    mocker.patch.object(
+        _ResourceWatcher,
+        "wait_for_change",
+        autospec=True,
+        side_effect=lambda watcher, timeout: watched.append(watcher.plural),
+    )
+    cf = Cluster(
+        ClusterConfiguration(
+            name="test", namespace="ns", write_to_file=False, appwrapper=True
+        )
+    )
+    cf.wait_ready(dashboard_check=False)
+    # The AppWrapper is watched while queued, then the RayCluster it creates
+    assert watched == ["appwrappers", "rayclusters"]
+
+
+def test_resource_watcher(mocker):
+    from codeflare_sdk.ray.cluster.cluster import _ResourceWatcher
+    from kubernetes.client.rest import ApiException
+
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mock_sleep = mocker.patch("codeflare_sdk.ray.cluster.cluster.sleep")
+    stream = mocker.patch(
+        "kubernetes.watch.Watch.stream",
+        return_value=iter(
+            [
+                {
+                    "type": "MODIFIED",
+                    "object": {"metadata": {"name": "test", "resourceVersion": "42"}},
+                }
+            ]
+        ),
+    )
+    watcher = _ResourceWatcher("ray.io", "v1", "ns", "rayclusters", "test")
+
+    # The first change is seen through the watch and its resourceVersion is kept
+    watcher.wait_for_change(timeout=30)
+    assert watcher.resource_version == "42"
+    _, kwargs = stream.call_args
+    assert kwargs["field_selector"] == "metadata.name=test"
+    assert kwargs["timeout_seconds"] == 30
+    assert "resource_version" not in kwargs
+
+    # The next watch resumes from the last seen resourceVersion
+    stream.return_value = iter([])
+    watcher.wait_for_change()
+    _, kwargs = stream.call_args
+    assert kwargs["resource_version"] == "42"
+    assert kwargs["timeout_seconds"] == 60
+
+    # 410 Gone restarts the watch from the current state
+    stream.side_effect = ApiException(status=410, reason="Gone")
+    watcher.wait_for_change()
+    assert watcher.resource_version == None
+    mock_sleep.assert_not_called()
+
+    # Forbidden watches fall back to exponential backoff polling
+    stream.side_effect = ApiException(status=403, reason="Forbidden")
+    watcher.wait_for_change()
+    assert watcher.watch_permitted == False
+    watcher.wait_for_change()
+    watcher.wait_for_change(timeout=1.5)
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2, 1.5]
+    assert stream.call_count == 4
+
+
 def test_list_queue_appwrappers(mocker, capsys):
     mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
     mocker.patch(
@@ -591,8 +687,6 @@ def test_list_queue_appwrappers(mocker, capsys):
         "│ +----------------+-----------+ │\n"
         "│ | Name           | Status    | │\n"
         "│ +================+===========+ │\n"
-        "│ | test-cluster-a | running   | │\n"
-        "│ |                |           | │\n"
         "│ | test-cluster-b | suspended | │\n"
         "│ |                |           | │\n"
         "│ +----------------+-----------+ │\n"
@@ -758,6 +852,281 @@ def test_map_to_ray_cluster(mocker):
     assert result.dashboard == rc_dashboard
 
 
+def test_list_clusters_fetches_routes_once(mocker):
+    from codeflare_sdk.ray.cluster.cluster import list_all_clusters
+
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster._is_openshift_cluster", return_value=True
+    )
+    routes = {
+        "items": [
+            {
+                "metadata": {"name": "ray-dashboard-test-cluster-a"},
+                "spec": {"host": "dashboard-a", "tls": {"termination": "edge"}},
+            },
+            {
+                "metadata": {"name": "test-rc-b-ingress-abcde"},
+                "spec": {"host": "dashboard-b"},
+            },
+        ]
+    }
+    calls = []
+
+    def custom_side_effect(group, version, namespace, plural, **kwargs):
+        calls.append(plural)
+        if plural == "routes":
+            return routes
+        return get_ray_obj(group, version, namespace, plural)
+
+    mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
+        side_effect=custom_side_effect,
+    )
+    clusters = list_all_clusters("ns", print_to_console=False)
+    assert [c.dashboard for c in clusters] == [
+        "https://dashboard-a",
+        "http://dashboard-b",
+    ]
+    assert calls == ["rayclusters", "routes"]
+
+
+def test_list_clusters_selectors_and_pagination(mocker):
+    from codeflare_sdk.ray.cluster.cluster import list_all_clusters
+
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster._get_dashboard_urls_by_namespace",
+        return_value={},
+    )
+    rc_a, rc_b = get_ray_obj_with_status("ray.io", "v1", "ns", "rayclusters")["items"]
+    pages = [
+        {"items": [rc_a], "metadata": {"continue": "token-1"}},
+        {"items": [rc_b], "metadata": {"continue": ""}},
+    ]
+    list_rcs = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
+        side_effect=pages,
+    )
+    clusters = list_all_clusters(
+        "ns",
+        print_to_console=False,
+        filter=[RayClusterStatus.SUSPENDED],
+        label_selector="team=a",
+        field_selector="metadata.namespace=ns",
+        page_size=1,
+    )
+    assert [c.name for c in clusters] == ["test-rc-b"]
+    assert [c.kwargs for c in list_rcs.call_args_list] == [
+        {
+            "group": "ray.io",
+            "version": "v1",
+            "namespace": "ns",
+            "plural": "rayclusters",
+            "label_selector": "team=a",
+            "field_selector": "metadata.namespace=ns",
+            "limit": 1,
+        },
+        {
+            "group": "ray.io",
+            "version": "v1",
+            "namespace": "ns",
+            "plural": "rayclusters",
+            "label_selector": "team=a",
+            "field_selector": "metadata.namespace=ns",
+            "limit": 1,
+            "_continue": "token-1",
+        },
+    ]
+
+
+def test_iter_clusters(mocker):
+    from codeflare_sdk.ray.cluster.cluster import iter_clusters
+
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    get_dashboard_urls = mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster._get_dashboard_urls_by_namespace",
+        return_value={},
+    )
+    rc_a, rc_b = get_ray_obj_with_status("ray.io", "v1", "ns", "rayclusters")["items"]
+    list_rcs = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
+        side_effect=[
+            {"items": [rc_a], "metadata": {"continue": "token-1"}},
+            {"items": [rc_b], "metadata": {}},
+        ],
+    )
+    clusters = iter_clusters("ns", page_size=1)
+    assert list_rcs.call_count == 0
+
+    # The second page is only requested once the first one has been consumed
+    assert next(clusters).name == "test-cluster-a"
+    assert list_rcs.call_count == 1
+    assert [c.name for c in clusters] == ["test-rc-b"]
+    assert list_rcs.call_count == 2
+    assert list_rcs.call_args.kwargs["_continue"] == "token-1"
+    assert list_rcs.call_args.kwargs["limit"] == 1
+    get_dashboard_urls.assert_called_once_with("ns")
+
+
+def test_iter_clusters_errors(mocker):
+    from codeflare_sdk.ray.cluster.cluster import iter_clusters
+
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster._get_dashboard_urls_by_namespace",
+        return_value={},
+    )
+    rc_a, rc_b = get_ray_obj_with_status("ray.io", "v1", "ns", "rayclusters")["items"]
+    list_rcs = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
+        side_effect=[
+            {"items": [rc_a], "metadata": {"continue": "token-1"}},
+            ApiException(status=410, reason="Expired"),
+            {"items": [rc_a], "metadata": {"continue": "token-2"}},
+            {"items": [rc_b], "metadata": {}},
+        ],
+    )
+    # An expired continue token lists again, without yielding a cluster twice
+    assert [c.name for c in iter_clusters("ns", page_size=1)] == [
+        "test-cluster-a",
+        "test-rc-b",
+    ]
+    assert "_continue" not in list_rcs.call_args_list[2].kwargs
+
+    list_rcs.side_effect = [
+        {"items": [rc_a], "metadata": {"continue": "token-1"}},
+        ApiException(status=500, reason="Internal Server Error"),
+    ]
+    clusters = iter_clusters("ns", page_size=1)
+    assert next(clusters).name == "test-cluster-a"
+    # A failed page is raised instead of ending the iteration early
+    with pytest.raises(ApiException):
+        next(clusters)
+
+
+def test_list_clusters_all_namespaces(mocker):
+    from codeflare_sdk.ray.cluster.cluster import list_all_clusters
+
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster._is_openshift_cluster", return_value=True
+    )
+    routes = {
+        "items": [
+            {
+                "metadata": {"name": "ray-dashboard-test-cluster-a", "namespace": "ns"},
+                "spec": {"host": "dashboard-a"},
+            },
+        ]
+    }
+
+    def cluster_side_effect(group, version, plural, **kwargs):
+        if plural == "routes":
+            return routes
+        return get_ray_obj(group, version, "ns", plural)
+
+    list_cluster = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_cluster_custom_object",
+        side_effect=cluster_side_effect,
+    )
+    list_namespaced = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object"
+    )
+    clusters = list_all_clusters(print_to_console=False, all_namespaces=True)
+    assert [(c.name, c.dashboard) for c in clusters] == [
+        ("test-cluster-a", "http://dashboard-a"),
+        ("test-rc-b", None),
+    ]
+    # One cluster-wide list for the clusters and one for the routes
+    assert list_cluster.call_count == 2
+    list_namespaced.assert_not_called()
+
+
+def test_list_clusters_all_namespaces_forbidden(mocker):
+    from codeflare_sdk.ray.cluster.cluster import list_all_clusters
+
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster._is_openshift_cluster", return_value=False
+    )
+
+    def cluster_side_effect(group, version, plural, **kwargs):
+        if plural == "projects":
+            # Only the projects the user can access are listed
+            return {
+                "items": [
+                    {"metadata": {"name": "ns"}},
+                    {"metadata": {"name": "private"}},
+                ]
+            }
+        raise ApiException(status=403, reason="Forbidden")
+
+    mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_cluster_custom_object",
+        side_effect=cluster_side_effect,
+    )
+
+    def namespaced_side_effect(group, version, namespace, plural, **kwargs):
+        if namespace == "private":
+            raise ApiException(status=403, reason="Forbidden")
+        return get_ray_obj(group, version, namespace, plural)
+
+    list_namespaced = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
+        side_effect=namespaced_side_effect,
+    )
+    mocker.patch(
+        "kubernetes.client.NetworkingV1Api.list_namespaced_ingress",
+        return_value=ingress_retrieval(cluster_name="test-cluster-a"),
+    )
+    clusters = list_all_clusters(print_to_console=False, all_namespaces=True)
+    # Namespaces the user cannot list are skipped
+    assert [c.name for c in clusters] == ["test-cluster-a", "test-rc-b"]
+    assert (
+        clusters[0].dashboard
+        == "http://ray-dashboard-test-cluster-a-ns.apps.cluster.awsroute.org"
+    )
+    assert sorted(c.kwargs["namespace"] for c in list_namespaced.call_args_list) == [
+        "ns",
+        "private",
+    ]
+
+    # Explicitly requested namespaces must be accessible
+    list_namespaced.reset_mock()
+    clusters = list_all_clusters(print_to_console=False, namespaces=["ns", "ns2"])
+    assert len(clusters) == 4
+    assert list_namespaced.call_count == 2
+
+
+def test_list_clusters_all_namespaces_without_projects(mocker):
+    from codeflare_sdk.ray.cluster.cluster import iter_clusters
+
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_cluster_custom_object",
+        side_effect=[
+            ApiException(status=403, reason="Forbidden"),
+            ApiException(status=404, reason="Not Found"),
+        ],
+    )
+    # Without OpenShift projects, the namespaces must be given explicitly
+    with pytest.raises(PermissionError, match="namespaces="):
+        list(iter_clusters(all_namespaces=True))
+
+
+def test_list_clusters_requires_namespace():
+    from codeflare_sdk.ray.cluster.cluster import iter_clusters, list_all_clusters
+    from codeflare_sdk.ray.cluster.async_cluster import list_all_clusters_async
+
+    with pytest.raises(ValueError, match="namespace"):
+        list_all_clusters()
+    with pytest.raises(ValueError, match="namespace"):
+        iter_clusters()
+    with pytest.raises(ValueError, match="namespace"):
+        asyncio.run(list_all_clusters_async())
+
+
 # Make sure to always keep this function last
 def test_cleanup():
     os.remove(f"{aw_dir}test-all-params.yaml")
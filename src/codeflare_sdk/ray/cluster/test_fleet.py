@@ -0,0 +1,144 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from codeflare_sdk.ray.cluster.fleet import ClusterFleet
+from codeflare_sdk.ray.cluster.config import ClusterConfiguration
+from codeflare_sdk.ray.cluster.status import CodeFlareClusterStatus
+from codeflare_sdk.common.utils.unit_test_support import get_local_queue
+from kubernetes.client.rest import ApiException
+import pytest
+
+
+def create_fleet(mocker, size=3):
+    mocker.patch("kubernetes.client.ApisApi.get_api_versions")
+    mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
+        return_value=get_local_queue("kueue.x-k8s.io", "v1beta1", "ns", "localqueues"),
+    )
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.fleet.get_current_namespace", return_value="ns"
+    )
+    configs = [
+        ClusterConfiguration(name=f"sweep-{i}", appwrapper=i % 2 == 0)
+        for i in range(size)
+    ]
+    return ClusterFleet(configs, max_workers=2)
+
+
+def test_fleet_build(mocker):
+    fleet = create_fleet(mocker)
+    assert [c.config.name for c in fleet.clusters] == ["sweep-0", "sweep-1", "sweep-2"]
+    assert all(c.config.namespace == "ns" for c in fleet.clusters)
+    assert fleet.clusters[0].resource_yaml["kind"] == "AppWrapper"
+    assert fleet.clusters[1].resource_yaml["kind"] == "RayCluster"
+
+
+def test_fleet_apply_and_down(mocker):
+    fleet = create_fleet(mocker)
+    throw_for_no_raycluster = mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster.Cluster._throw_for_no_raycluster"
+    )
+    mocker.patch("codeflare_sdk.ray.cluster.cluster.Cluster.config_check")
+    dynamic_client = mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster.Cluster.get_dynamic_client"
+    )
+    server_side_apply = dynamic_client.return_value.resources.get.return_value
+    server_side_apply.server_side_apply.side_effect = [
+        None,
+        ApiException(status=409, reason="Conflict"),
+        None,
+    ]
+
+    results = fleet.apply()
+    assert sorted(r.succeeded for r in results) == [False, True, True]
+    failed = [r for r in results if not r.succeeded][0]
+    assert isinstance(failed.error, ApiException)
+    # The CRD check and the dynamic client are shared by the whole fleet
+    assert throw_for_no_raycluster.call_count == 1
+    assert dynamic_client.call_count == 1
+
+    mocker.patch(
+        "kubernetes.client.CustomObjectsApi.delete_namespaced_custom_object",
+    )
+    results = fleet.down()
+    assert [r.succeeded for r in results] == [True, True, True]
+
+
+def test_fleet_build_and_dynamic_client_errors(mocker):
+    def build_cluster(config):
+        if config.name == "sweep-1":
+            raise ValueError("invalid image")
+        return mocker.Mock(config=config)
+
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.fleet._build_cluster", side_effect=build_cluster
+    )
+    fleet = create_fleet(mocker)
+    # A configuration that fails to build doesn't stop the rest of the fleet
+    assert [c.config.name for c in fleet.clusters] == ["sweep-0", "sweep-2"]
+    [build_error] = fleet.build_errors
+    assert (build_error.name, build_error.succeeded) == ("sweep-1", False)
+    assert isinstance(build_error.error, ValueError)
+
+    first, second = fleet.clusters
+    first.get_dynamic_client.side_effect = ApiException(status=503)
+    fleet.max_workers = 1
+    results = fleet.apply()
+    assert [(r.name, r.succeeded) for r in results] == [
+        ("sweep-1", False),
+        ("sweep-0", False),
+        ("sweep-2", True),
+    ]
+    assert isinstance(results[1].error, ApiException)
+    # The next cluster creates the dynamic client again
+    crds = second.get_dynamic_client.return_value.resources
+    second._apply.assert_called_once_with(False, crds=crds)
+
+
+def test_fleet_missing_crd(mocker):
+    fleet = create_fleet(mocker, size=2)
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster.Cluster._throw_for_no_raycluster",
+        side_effect=RuntimeError("RayCluster CustomResourceDefinition unavailable"),
+    )
+    results = fleet.down()
+    assert [r.succeeded for r in results] == [False, False]
+    assert all(isinstance(r.error, RuntimeError) for r in results)
+
+
+def test_fleet_wait_all_ready(mocker, capsys):
+    fleet = create_fleet(mocker, size=2)
+    mock_sleep = mocker.patch("codeflare_sdk.ray.cluster.fleet.sleep")
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster.Cluster.status",
+        side_effect=[
+            (CodeFlareClusterStatus.READY, True),
+            (CodeFlareClusterStatus.STARTING, False),
+            (CodeFlareClusterStatus.READY, True),
+        ],
+    )
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster.Cluster.is_dashboard_ready",
+        return_value=True,
+    )
+    fleet.wait_all_ready()
+    assert mock_sleep.call_count == 1
+    assert "All requested clusters are up and running!" in capsys.readouterr().out
+
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.cluster.Cluster.status",
+        return_value=(CodeFlareClusterStatus.STARTING, False),
+    )
+    with pytest.raises(TimeoutError, match="sweep-0, sweep-1"):
+        fleet.wait_all_ready(timeout=0.01, dashboard_check=False)
@@ -0,0 +1,166 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+import time
+
+from codeflare_sdk.common.utils.unit_test_support import (
+    get_ray_obj,
+    ingress_retrieval,
+)
+from codeflare_sdk.ray.cluster.cluster import (
+    _get_ray_clusters,
+    _ray_cluster_status,
+    _check_aw_exists,
+)
+from codeflare_sdk.ray.cluster.informers import (
+    get_fresh_informer,
+    start_informers,
+    stop_informers,
+)
+
+
+def raw_response(body):
+    response = type("Response", (), {})()
+    response.data = json.dumps(body).encode()
+    return response
+
+
+def test_informers_serve_reads(mocker):
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mocker.patch("kubernetes.client.ApisApi.get_api_versions")
+    rayclusters = get_ray_obj("ray.io", "v1", "ns", "rayclusters")
+    rayclusters["metadata"] = {"resourceVersion": "1"}
+    ingresses = {
+        "items": [
+            i.to_dict() for i in ingress_retrieval(cluster_name="test-cluster-a").items
+        ],
+        "metadata": {"resourceVersion": "1"},
+    }
+    list_rcs = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
+        return_value=raw_response(rayclusters),
+    )
+    list_ingresses = mocker.patch(
+        "kubernetes.client.NetworkingV1Api.list_namespaced_ingress",
+        return_value=raw_response(ingresses),
+    )
+    stopped = threading.Event()
+
+    def stream(func, **kwargs):
+        stopped.wait(5)
+        return iter([])
+
+    mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.informer.watch.Watch"
+    ).return_value.stream.side_effect = stream
+
+    # Neither the AppWrapper nor the Route APIs are served
+    assert start_informers("ns", sync_timeout=5)
+    assert get_fresh_informer("ns", "appwrappers") is None
+    assert get_fresh_informer("other-ns", "rayclusters") is None
+    list_rcs.reset_mock()
+    list_ingresses.reset_mock()
+    get_object = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.get_namespaced_custom_object"
+    )
+
+    clusters = _get_ray_clusters("ns")
+    assert [c.name for c in clusters] == ["test-cluster-a", "test-rc-b"]
+    assert (
+        clusters[0].dashboard
+        == "http://ray-dashboard-test-cluster-a-ns.apps.cluster.awsroute.org"
+    )
+    assert _ray_cluster_status("test-rc-b", "ns").name == "test-rc-b"
+    assert _ray_cluster_status("missing", "ns") is None
+    assert [
+        c.name
+        for c in _get_ray_clusters("ns", field_selector="metadata.name=test-rc-b")
+    ] == ["test-rc-b"]
+    list_rcs.assert_not_called()
+    list_ingresses.assert_not_called()
+    get_object.assert_not_called()
+
+    # AppWrappers are not kept in memory here, so they are still read from the API server
+    _check_aw_exists("test-cluster-a", "ns")
+    get_object.assert_called_once()
+
+    stop_informers("ns")
+    stopped.set()
+    assert get_fresh_informer("ns", "rayclusters") is None
+
+
+def test_informers_serve_local_queues(mocker):
+    from codeflare_sdk.common.kueue.kueue import get_local_queue_index
+    from codeflare_sdk.common.utils.unit_test_support import get_local_queue
+
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mocker.patch(
+        "codeflare_sdk.ray.cluster.informers.is_api_served",
+        side_effect=lambda api: api == "kueue.x-k8s.io",
+    )
+    local_queues = get_local_queue("kueue.x-k8s.io", "v1beta1", "ns", "localqueues")
+    local_queues["metadata"] = {"resourceVersion": "1"}
+
+    def list_side_effect(group, version, namespace, plural, **kwargs):
+        if plural == "localqueues":
+            return raw_response(local_queues)
+        return raw_response({"items": [], "metadata": {"resourceVersion": "1"}})
+
+    list_objects = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
+        side_effect=list_side_effect,
+    )
+    mocker.patch(
+        "kubernetes.client.NetworkingV1Api.list_namespaced_ingress",
+        return_value=raw_response({"items": [], "metadata": {"resourceVersion": "1"}}),
+    )
+    stopped = threading.Event()
+    events = iter(
+        [
+            {
+                "type": "DELETED",
+                "raw_object": {
+                    "metadata": {"name": "local-queue-default", "resourceVersion": "2"}
+                },
+            }
+        ]
+    )
+
+    def stream(func, **kwargs):
+        if func.keywords["plural"] == "localqueues":
+            yield from events
+        stopped.wait(5)
+
+    mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.informer.watch.Watch"
+    ).return_value.stream.side_effect = stream
+
+    assert start_informers("ns", sync_timeout=5)
+    list_objects.reset_mock()
+    informer = get_fresh_informer("ns", "localqueues")
+    for _ in range(500):
+        if informer.get("local-queue-default") is None:
+            break
+        time.sleep(0.01)
+
+    # A deleted local queue is gone at once, without waiting for a cache to expire
+    index = get_local_queue_index("ns")
+    assert sorted(index.queues) == ["team-a-queue"]
+    assert index.default_queue is None
+    list_objects.assert_not_called()
+
+    stop_informers("ns")
+    stopped.set()
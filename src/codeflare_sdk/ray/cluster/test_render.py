@@ -0,0 +1,83 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from codeflare_sdk.ray.cluster.render import render_manifests
+from codeflare_sdk.ray.cluster.config import ClusterConfiguration
+import pytest
+import yaml
+
+
+def test_render_manifests_offline(mocker, tmp_path):
+    config_check = mocker.patch(
+        "codeflare_sdk.common.kubernetes_cluster.auth.config_check"
+    )
+    get_default_kueue_name = mocker.patch(
+        "codeflare_sdk.ray.cluster.build_ray_cluster.get_default_kueue_name"
+    )
+    local_queue_exists = mocker.patch(
+        "codeflare_sdk.ray.cluster.build_ray_cluster.local_queue_exists"
+    )
+    configs = [
+        ClusterConfiguration(name="rc", image="example/ray:tag"),
+        ClusterConfiguration(
+            name="aw",
+            namespace="other",
+            local_queue="team-queue",
+            appwrapper=True,
+            image="example/ray:tag",
+        ),
+    ]
+
+    manifests = render_manifests(
+        configs,
+        namespace="ns",
+        local_queue="default-queue",
+        output_dir=tmp_path,
+        output_file=tmp_path / "bundle.yaml",
+    )
+    config_check.assert_not_called()
+    get_default_kueue_name.assert_not_called()
+    local_queue_exists.assert_not_called()
+
+    rc, aw = manifests
+    assert rc["kind"] == "RayCluster"
+    assert rc["metadata"]["namespace"] == "ns"
+    assert rc["metadata"]["labels"]["kueue.x-k8s.io/queue-name"] == "default-queue"
+    assert aw["kind"] == "AppWrapper"
+    assert aw["metadata"]["namespace"] == "other"
+    assert aw["metadata"]["labels"]["kueue.x-k8s.io/queue-name"] == "team-queue"
+
+    # The configurations are left untouched
+    assert configs[0].namespace is None
+    assert configs[0].local_queue is None
+
+    for manifest, name in zip(manifests, ["rc", "aw"]):
+        with open(tmp_path / f"{name}.yaml") as f:
+            assert yaml.safe_load(f) == manifest
+    with open(tmp_path / "bundle.yaml") as f:
+        assert list(yaml.safe_load_all(f)) == manifests
+
+
+def test_render_manifests_without_local_queue():
+    (manifest,) = render_manifests(
+        [ClusterConfiguration(name="rc", image="example/ray:tag")], namespace="ns"
+    )
+    assert "kueue.x-k8s.io/queue-name" not in manifest["metadata"]["labels"]
+
+
+def test_render_manifests_requires_namespace_and_name():
+    with pytest.raises(ValueError, match="No namespace set for rc"):
+        render_manifests([ClusterConfiguration(name="rc")])
+    with pytest.raises(ValueError, match="A name is required"):
+        render_manifests([ClusterConfiguration(name="")], namespace="ns")
@@ -24,6 +24,7 @@ from codeflare_sdk.ray.cluster.status import (
 )
 import os
 from ...common.utils.unit_test_support import get_local_queue
+from kubernetes.client.rest import ApiException
 
 aw_dir = os.path.expanduser("~/.codeflare/resources/")
 
@@ -93,23 +94,44 @@ def test_cluster_status(mocker):
     assert ready == True
 
 
-def rc_status_fields(group, version, namespace, plural, *args):
+def rc_status_fields(group, version, namespace, plural, name, *args):
     assert group == "ray.io"
     assert version == "v1"
     assert namespace == "test-ns"
     assert plural == "rayclusters"
+    assert name == "test-rc"
     assert args == tuple()
-    return {"items": []}
+    raise ApiException(status=404, reason="Not Found")
 
 
 def test_rc_status(mocker):
     mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
     mocker.patch(
-        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
+        "kubernetes.client.CustomObjectsApi.get_namespaced_custom_object",
         side_effect=rc_status_fields,
     )
+    list_rcs = mocker.patch(
+        "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object"
+    )
     rc = _ray_cluster_status("test-rc", "test-ns")
     assert rc == None
+    list_rcs.assert_not_called()
+
+
+def test_check_aw_exists(mocker):
+    from codeflare_sdk.ray.cluster.cluster import _check_aw_exists
+
+    mocker.patch("kubernetes.config.load_kube_config", return_value="ignore")
+    mocker.patch(
+        "kubernetes.client.CustomObjectsApi.get_namespaced_custom_object",
+        side_effect=ApiException(status=404, reason="Not Found"),
+    )
+    assert _check_aw_exists("test-aw", "test-ns") == False
+    mocker.patch(
+        "kubernetes.client.CustomObjectsApi.get_namespaced_custom_object",
+        return_value={"metadata": {"name": "test-aw"}},
+    )
+    assert _check_aw_exists("test-aw", "test-ns") == True
 
 
 # Make sure to always keep this function last
@@ -0,0 +1,65 @@
+# Copyright 2024 IBM, Red Hat
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import codeflare_sdk
+
+HEAVY_MODULES = ["ray", "pandas", "ipywidgets", "IPython", "kubernetes"]
+
+
+def imported_modules(statement: str) -> list:
+    # Run in a fresh interpreter, as the test session has already imported everything
+    script = (
+        f"import sys, json; {statement}; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.dirname(codeflare_sdk.__path__[0]), env.get("PYTHONPATH", "")]
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_is_lazy():
+    assert imported_modules("import codeflare_sdk") == []
+
+
+def test_cluster_import_skips_ray_and_widgets():
+    assert imported_modules("from codeflare_sdk import get_cluster") == ["kubernetes"]
+
+
+def test_lazy_attributes():
+    assert codeflare_sdk.Cluster is codeflare_sdk.ray.cluster.cluster.Cluster
+    assert (
+        codeflare_sdk.generate_cert.__name__
+        == "codeflare_sdk.common.utils.generate_cert"
+    )
+    assert "TokenAuthentication" in dir(codeflare_sdk)
+    with pytest.raises(AttributeError):
+        codeflare_sdk.not_a_real_attribute
+    with pytest.raises(AttributeError):
+        codeflare_sdk.ray.not_a_real_attribute